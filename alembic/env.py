@@ -13,7 +13,7 @@ from alembic import context
 
 # Import models and config
 from app.db.base import Base
-from app.models import user  # noqa
+from app.models import rate_limit, row_count, user  # noqa
 from app.core.config import get_settings
 
 settings = get_settings()
@@ -45,6 +45,7 @@ def run_migrations_offline() -> None:
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
+        transaction_per_migration=True,
     )
 
     with context.begin_transaction():
@@ -62,6 +63,10 @@ def do_run_migrations(connection: Connection) -> None:
         connection=connection,
         target_metadata=target_metadata,
         compare_type=True,
+        # One transaction per revision, so an autocommit block (needed for
+        # CREATE INDEX CONCURRENTLY, see app.db.migrations) only commits
+        # the revision it belongs to
+        transaction_per_migration=True,
     )
 
     with context.begin_transaction():
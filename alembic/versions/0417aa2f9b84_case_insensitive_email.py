@@ -0,0 +1,36 @@
+"""case-insensitive email
+
+Stores emails in lower case and replaces the unique index on ``email`` with
+a unique functional index on ``lower(email)``. Fails (and rolls back) if
+existing emails differ only by case; resolve those accounts first.
+
+Revision ID: 0417aa2f9b84
+Revises: ef5c4c8a3ab2
+Create Date: 2026-10-19 09:31:47.560214
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0417aa2f9b84"
+down_revision: Union[str, None] = "ef5c4c8a3ab2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_users_email_lower", "users", [sa.text("lower(email)")], unique=True
+    )
+    op.execute("UPDATE users SET email = lower(email) WHERE email <> lower(email)")
+    op.drop_index("ix_users_email", table_name="users")
+
+
+def downgrade() -> None:
+    op.create_index("ix_users_email", "users", ["email"], unique=True)
+    op.drop_index("ix_users_email_lower", table_name="users")
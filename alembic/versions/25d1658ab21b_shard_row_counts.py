@@ -0,0 +1,102 @@
+"""shard row counts
+
+Spreads each table's counter over up to 16 ``row_counts`` rows, keyed by
+``(table_name, slot)``. The counting trigger adds to a random slot, so
+concurrent writers to ``users`` no longer serialize on a single counter
+row until they commit; the exact count is the sum of the slots. Existing
+counts stay in slot 0.
+
+Revision ID: 25d1658ab21b
+Revises: c3d1a7e5f024
+Create Date: 2026-10-19 18:12:46.905317
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "25d1658ab21b"
+down_revision: Union[str, None] = "c3d1a7e5f024"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Holding row_counts exclusively blocks the triggers of concurrent
+    # writes until the new function is in place
+    op.add_column(
+        "row_counts",
+        sa.Column("slot", sa.SmallInteger(), nullable=False, server_default="0"),
+    )
+    op.alter_column("row_counts", "slot", server_default=None)
+    op.drop_constraint("row_counts_pkey", "row_counts", type_="primary")
+    op.create_primary_key("row_counts_pkey", "row_counts", ["table_name", "slot"])
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION maintain_row_count() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        DECLARE
+            delta bigint;
+        BEGIN
+            IF TG_OP = 'TRUNCATE' THEN
+                UPDATE row_counts SET row_count = 0
+                WHERE table_name = TG_TABLE_NAME;
+                RETURN NULL;
+            END IF;
+            SELECT count(*) INTO delta FROM changed_rows;
+            IF delta <> 0 THEN
+                IF TG_OP = 'DELETE' THEN
+                    delta := -delta;
+                END IF;
+                INSERT INTO row_counts AS r (table_name, slot, row_count)
+                VALUES (TG_TABLE_NAME, floor(random() * 16), delta)
+                ON CONFLICT (table_name, slot)
+                DO UPDATE SET row_count = r.row_count + EXCLUDED.row_count;
+            END IF;
+            RETURN NULL;
+        END
+        $$
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("LOCK TABLE row_counts IN ACCESS EXCLUSIVE MODE")
+    op.execute(
+        "INSERT INTO row_counts (table_name, slot, row_count)"
+        " SELECT table_name, 0, sum(row_count) FROM row_counts GROUP BY table_name"
+        " ON CONFLICT (table_name, slot) DO UPDATE SET row_count = EXCLUDED.row_count"
+    )
+    op.execute("DELETE FROM row_counts WHERE slot <> 0")
+    op.drop_constraint("row_counts_pkey", "row_counts", type_="primary")
+    op.drop_column("row_counts", "slot")
+    op.create_primary_key("row_counts_pkey", "row_counts", ["table_name"])
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION maintain_row_count() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        DECLARE
+            delta bigint;
+        BEGIN
+            IF TG_OP = 'TRUNCATE' THEN
+                UPDATE row_counts SET row_count = 0
+                WHERE table_name = TG_TABLE_NAME;
+                RETURN NULL;
+            END IF;
+            SELECT count(*) INTO delta FROM changed_rows;
+            IF delta <> 0 THEN
+                IF TG_OP = 'DELETE' THEN
+                    delta := -delta;
+                END IF;
+                UPDATE row_counts SET row_count = row_count + delta
+                WHERE table_name = TG_TABLE_NAME;
+            END IF;
+            RETURN NULL;
+        END
+        $$
+        """
+    )
@@ -0,0 +1,45 @@
+"""trigram search indexes
+
+Enables pg_trgm and adds GIN trigram indexes on ``full_name`` and ``email``
+so substring searches (``ILIKE '%...%'``) use a bitmap index scan instead
+of a sequential scan.
+
+Revision ID: 29e30aca9819
+Revises: 0417aa2f9b84
+Create Date: 2026-10-19 10:48:13.902657
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "29e30aca9819"
+down_revision: Union[str, None] = "0417aa2f9b84"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.create_index(
+        "ix_users_full_name_trgm",
+        "users",
+        ["full_name"],
+        postgresql_using="gin",
+        postgresql_ops={"full_name": "gin_trgm_ops"},
+    )
+    op.create_index(
+        "ix_users_email_trgm",
+        "users",
+        ["email"],
+        postgresql_using="gin",
+        postgresql_ops={"email": "gin_trgm_ops"},
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_users_email_trgm", table_name="users")
+    op.drop_index("ix_users_full_name_trgm", table_name="users")
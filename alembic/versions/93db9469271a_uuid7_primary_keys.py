@@ -0,0 +1,74 @@
+"""uuid7 primary keys
+
+Adds ``uuid_generate_v7()`` and makes it the default for ``users.id``, so
+new rows get time-ordered keys that append to the primary key index
+instead of splitting random pages.
+
+Existing rows are deliberately not re-keyed. Their ids are the ``sub`` of
+issued access tokens and the identifiers clients and registrar syncs
+store, so rewriting them would log every user out and break those
+references, and updating every row would rewrite the table and all of
+its indexes under an exclusive lock.
+
+Leaving them costs little: locality is about where inserts land, not
+about the keys already present. v7 ids issued from now on sort after one
+another, so new rows fill the pages of one narrow key range (the pages
+holding v4 ids with the same leading bytes) instead of random pages
+across the index. Pre-migration v4 ids stay scattered, as they are now;
+pages split by past random inserts can be compacted with
+``REINDEX INDEX CONCURRENTLY users_pkey`` if index size matters.
+
+Revision ID: 93db9469271a
+Revises: b80cb91bd2fc
+Create Date: 2026-10-19 14:02:19.753418
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "93db9469271a"
+down_revision: Union[str, None] = "b80cb91bd2fc"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION uuid_generate_v7() RETURNS uuid
+        LANGUAGE sql VOLATILE PARALLEL SAFE AS $$
+            SELECT encode(
+                set_bit(
+                    set_bit(
+                        overlay(
+                            uuid_send(gen_random_uuid())
+                            PLACING substring(
+                                int8send(
+                                    floor(
+                                        extract(epoch FROM clock_timestamp()) * 1000
+                                    )::bigint
+                                )
+                                FROM 3
+                            )
+                            FROM 1 FOR 6
+                        ),
+                        52, 1
+                    ),
+                    53, 1
+                ),
+                'hex'
+            )::uuid
+        $$
+        """
+    )
+    op.alter_column("users", "id", server_default=sa.text("uuid_generate_v7()"))
+
+
+def downgrade() -> None:
+    op.alter_column("users", "id", server_default=sa.text("gen_random_uuid()"))
+    op.execute("DROP FUNCTION uuid_generate_v7()")
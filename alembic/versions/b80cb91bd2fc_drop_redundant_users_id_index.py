@@ -0,0 +1,30 @@
+"""drop redundant users id index
+
+``ix_users_id`` duplicates the primary key index ``users_pkey`` and only
+adds write amplification. It is dropped concurrently so the table stays
+available.
+
+Revision ID: b80cb91bd2fc
+Revises: bb48705e8308
+Create Date: 2026-10-19 13:20:51.447905
+
+"""
+
+from typing import Sequence, Union
+
+from app.db.migrations import create_index_concurrently, drop_index_concurrently
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b80cb91bd2fc"
+down_revision: Union[str, None] = "bb48705e8308"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    drop_index_concurrently("ix_users_id", "users")
+
+
+def downgrade() -> None:
+    create_index_concurrently("ix_users_id", "users", ["id"])
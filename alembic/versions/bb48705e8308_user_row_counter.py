@@ -0,0 +1,84 @@
+"""user row counter
+
+Adds the ``row_counts`` table and statement-level triggers on ``users``
+that keep its exact row count up to date. ``users`` is locked against
+writes while the counter is seeded, so the seed and the triggers agree.
+
+Revision ID: bb48705e8308
+Revises: 29e30aca9819
+Create Date: 2026-10-19 12:05:37.284113
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "bb48705e8308"
+down_revision: Union[str, None] = "29e30aca9819"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "row_counts",
+        sa.Column("table_name", sa.String(length=63), nullable=False),
+        sa.Column("row_count", sa.BigInteger(), nullable=False),
+        sa.PrimaryKeyConstraint("table_name"),
+    )
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION maintain_row_count() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        DECLARE
+            delta bigint;
+        BEGIN
+            IF TG_OP = 'TRUNCATE' THEN
+                UPDATE row_counts SET row_count = 0
+                WHERE table_name = TG_TABLE_NAME;
+                RETURN NULL;
+            END IF;
+            SELECT count(*) INTO delta FROM changed_rows;
+            IF delta <> 0 THEN
+                IF TG_OP = 'DELETE' THEN
+                    delta := -delta;
+                END IF;
+                UPDATE row_counts SET row_count = row_count + delta
+                WHERE table_name = TG_TABLE_NAME;
+            END IF;
+            RETURN NULL;
+        END
+        $$
+        """
+    )
+    op.execute("LOCK TABLE users IN SHARE ROW EXCLUSIVE MODE")
+    op.execute(
+        "CREATE TRIGGER users_count_insert AFTER INSERT ON users"
+        " REFERENCING NEW TABLE AS changed_rows"
+        " FOR EACH STATEMENT EXECUTE FUNCTION maintain_row_count()"
+    )
+    op.execute(
+        "CREATE TRIGGER users_count_delete AFTER DELETE ON users"
+        " REFERENCING OLD TABLE AS changed_rows"
+        " FOR EACH STATEMENT EXECUTE FUNCTION maintain_row_count()"
+    )
+    op.execute(
+        "CREATE TRIGGER users_count_truncate AFTER TRUNCATE ON users"
+        " FOR EACH STATEMENT EXECUTE FUNCTION maintain_row_count()"
+    )
+    op.execute(
+        "INSERT INTO row_counts (table_name, row_count)"
+        " SELECT 'users', count(*) FROM users"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER users_count_truncate ON users")
+    op.execute("DROP TRIGGER users_count_delete ON users")
+    op.execute("DROP TRIGGER users_count_insert ON users")
+    op.execute("DROP FUNCTION maintain_row_count()")
+    op.drop_table("row_counts")
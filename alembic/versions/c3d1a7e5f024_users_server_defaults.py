@@ -0,0 +1,41 @@
+"""users server defaults
+
+The baseline migration only creates ``users`` if it does not exist, so
+databases whose table was created from the models before migrations were
+introduced never got the server defaults for ``created_at`` and
+``updated_at`` (``id`` gets its default from the uuid7 migration). Core
+inserts that leave those columns to the database, such as the bulk import
+merge, need them. Setting a default is a catalog-only change.
+
+Revision ID: c3d1a7e5f024
+Revises: f89442df90b9
+Create Date: 2026-10-19 16:40:27.530116
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c3d1a7e5f024"
+down_revision: Union[str, None] = "f89442df90b9"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.alter_column(
+        "users", "created_at", server_default=sa.text("timezone('utc', now())")
+    )
+    op.alter_column(
+        "users", "updated_at", server_default=sa.text("timezone('utc', now())")
+    )
+
+
+def downgrade() -> None:
+    # The defaults are the ones the baseline creates on a new database;
+    # removing them would break databases created that way
+    pass
@@ -0,0 +1,36 @@
+"""rate limit buckets
+
+Adds the unlogged ``rate_limit_buckets`` table used by the postgres rate
+limiting backend to share token buckets across hosts.
+
+Revision ID: f89442df90b9
+Revises: 93db9469271a
+Create Date: 2026-10-19 15:21:08.412907
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "f89442df90b9"
+down_revision: Union[str, None] = "93db9469271a"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "rate_limit_buckets",
+        sa.Column("key", sa.String(length=255), nullable=False),
+        sa.Column("full_at", sa.Double(), nullable=False),
+        sa.PrimaryKeyConstraint("key"),
+        prefixes=["UNLOGGED"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("rate_limit_buckets")
@@ -9,7 +9,7 @@ from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 
 from app.core.security import verify_token
 from app.db.base import get_db
-from app.repositories.user import SQLAlchemyUserRepository
+from app.repositories.user import get_user_repository
 from app.schemas.auth import (
     TokenResponse,
     LoginRequest,
@@ -56,7 +56,7 @@ async def login(
     Raises:
         HTTPException: If authentication fails or credentials are invalid
     """
-    user_repo = SQLAlchemyUserRepository(db)
+    user_repo = get_user_repository(db)
     auth_service = AuthService(user_repo)
     try:
         token = await auth_service.authenticate_user(
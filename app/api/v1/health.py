@@ -5,8 +5,11 @@ Health check endpoints for monitoring API status.
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core import metrics
+from app.core.deadline import request_deadline
+from app.core.security import get_current_admin
 from app.db.base import get_db
-from app.schemas import HealthResponse, HTTPError
+from app.schemas import AppMetricsResponse, HealthResponse, HTTPError
 from app.services.health import HealthService
 
 router = APIRouter(prefix="/health", tags=["Health"])
@@ -15,6 +18,7 @@ router = APIRouter(prefix="/health", tags=["Health"])
 @router.get(
     "",
     response_model=HealthResponse,
+    dependencies=[Depends(request_deadline(5))],
     summary="Health Check",
     description="Comprehensive health check endpoint that monitors system metrics, database connectivity, and service status",
     responses={
@@ -44,3 +48,29 @@ async def health_check(db: AsyncSession = Depends(get_db)) -> HealthResponse:
         )
 
     return health_status
+
+
+@router.get(
+    "/metrics",
+    response_model=AppMetricsResponse,
+    dependencies=[Depends(get_current_admin)],
+    summary="Application Metrics",
+    description="Counters and gauges of the worker that answers "
+    "(administrators only)",
+    responses={
+        401: {"model": HTTPError, "description": "Not authenticated"},
+        403: {"model": HTTPError, "description": "Not an administrator"},
+    },
+)
+async def app_metrics() -> AppMetricsResponse:
+    """
+    Report the answering worker's application metrics.
+
+    Kept out of the public health check, which load balancers poll
+    unauthenticated, because the rate limiter's gauges describe its
+    internals.
+
+    Returns:
+        AppMetricsResponse: Counter values and current gauge readings
+    """
+    return AppMetricsResponse(metrics=metrics.snapshot())
@@ -2,24 +2,48 @@
 User management endpoints for registration and profile management.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import Annotated
+from typing import Annotated, AsyncIterator
 
-from app.core.security import get_current_user
-from app.db.base import get_db
-from app.repositories.user import SQLAlchemyUserRepository
+from app.core.deadline import request_deadline
+from app.core.security import get_current_admin, get_current_user
+from app.db.base import AsyncSessionLocal, get_db
+from app.repositories.user import get_user_repository
 from app.schemas.user import (
+    UserCount,
+    UserFileFormat,
     UserCreate,
+    UserImportResult,
+    UserLookupRequest,
+    UserLookupResult,
+    UserPage,
     UserResponse,
     UserUpdate,
 )
 from app.schemas.base import HTTPError
 from app.services.user import UserService
-from app.services.exceptions import EmailAlreadyExistsError, UserNotFoundError
+from app.services.user_import import UserImportService
+from app.services.exceptions import (
+    EmailAlreadyExistsError,
+    ImportRecordTooLargeError,
+    UserNotFoundError,
+)
 
 router = APIRouter(prefix="/users", tags=["Users"])
 
+# Bulk exports stream for much longer than the default request deadline
+EXPORT_DEADLINE_SECONDS = 600
+
+# Imports of a full term's onboarding file can take several minutes
+IMPORT_DEADLINE_SECONDS = 1800
+
+EXPORT_MEDIA_TYPES = {
+    UserFileFormat.NDJSON: "application/x-ndjson",
+    UserFileFormat.CSV: "text/csv",
+}
+
 
 @router.post(
     "",
@@ -49,7 +73,7 @@ async def register_user(
     Raises:
         HTTPException: If email is already registered or input is invalid
     """
-    user_repo = SQLAlchemyUserRepository(db)
+    user_repo = get_user_repository(db)
     user_service = UserService(user_repo)
     try:
         user = await user_service.create_user(user_data)
@@ -66,6 +90,294 @@ async def register_user(
         )
 
 
+@router.get(
+    "",
+    response_model=UserPage,
+    summary="List Users",
+    description="List users oldest first using cursor-based pagination "
+    "(administrators only)",
+    responses={
+        400: {"model": HTTPError, "description": "Invalid cursor"},
+        401: {"model": HTTPError, "description": "Not authenticated"},
+        403: {"model": HTTPError, "description": "Not an administrator"},
+        500: {"model": HTTPError, "description": "Internal server error"},
+    },
+)
+async def list_users(
+    current_admin: Annotated[UserResponse, Depends(get_current_admin)],
+    db: Annotated[AsyncSession, Depends(get_db)],
+    limit: Annotated[
+        int, Query(ge=1, le=100, description="Maximum number of users to return")
+    ] = 50,
+    cursor: Annotated[
+        str | None,
+        Query(description="Cursor from the previous page's next_cursor"),
+    ] = None,
+) -> UserPage:
+    """
+    List users one page at a time.
+
+    Args:
+        current_admin: Current authenticated administrator
+        db: Database session dependency
+        limit: Maximum number of users to return
+        cursor: Opaque cursor from the previous page
+
+    Returns:
+        UserPage: Users on the page and the cursor for the next one
+
+    Raises:
+        HTTPException: If the cursor is invalid
+    """
+    user_repo = get_user_repository(db)
+    user_service = UserService(user_repo)
+    try:
+        return await user_service.list_users(limit, cursor)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
+
+
+@router.get(
+    "/count",
+    response_model=UserCount,
+    summary="Count Users",
+    description="Count users, approximately by default (administrators only)",
+    responses={
+        401: {"model": HTTPError, "description": "Not authenticated"},
+        403: {"model": HTTPError, "description": "Not an administrator"},
+        500: {"model": HTTPError, "description": "Internal server error"},
+    },
+)
+async def count_users(
+    current_admin: Annotated[UserResponse, Depends(get_current_admin)],
+    db: Annotated[AsyncSession, Depends(get_db)],
+    exact: Annotated[
+        bool,
+        Query(description="Return the exact count instead of a fast estimate"),
+    ] = False,
+) -> UserCount:
+    """
+    Count registered users.
+
+    The default estimate comes from table statistics and costs the same
+    whatever the table size; the exact count reads a trigger-maintained
+    counter. Neither scans ``users``.
+
+    Args:
+        current_admin: Current authenticated administrator
+        db: Database session dependency
+        exact: Return the exact count instead of an estimate
+
+    Returns:
+        UserCount: Number of users and whether it is exact
+    """
+    user_repo = get_user_repository(db)
+    user_service = UserService(user_repo)
+    return await user_service.count_users(exact)
+
+
+@router.get(
+    "/search",
+    response_model=list[UserResponse],
+    summary="Search Users",
+    description="Find users by partial name or email (administrators only)",
+    responses={
+        401: {"model": HTTPError, "description": "Not authenticated"},
+        403: {"model": HTTPError, "description": "Not an administrator"},
+        500: {"model": HTTPError, "description": "Internal server error"},
+    },
+)
+async def search_users(
+    current_admin: Annotated[UserResponse, Depends(get_current_admin)],
+    db: Annotated[AsyncSession, Depends(get_db)],
+    q: Annotated[
+        str,
+        Query(
+            min_length=3,
+            max_length=100,
+            description="Text to find within the full name or email",
+        ),
+    ],
+    limit: Annotated[
+        int, Query(ge=1, le=50, description="Maximum number of users to return")
+    ] = 20,
+) -> list[UserResponse]:
+    """
+    Search users by partial name or email.
+
+    Queries need at least three characters, the length of a trigram, so
+    the search is always served by the trigram indexes.
+
+    Args:
+        current_admin: Current authenticated administrator
+        db: Database session dependency
+        q: Text to search for (case-insensitive)
+        limit: Maximum number of users to return
+
+    Returns:
+        list[UserResponse]: Matching users, best match first
+    """
+    user_repo = get_user_repository(db)
+    user_service = UserService(user_repo)
+    return await user_service.search_users(q, limit)
+
+
+@router.post(
+    "/lookup",
+    response_model=UserLookupResult,
+    summary="Look Up Users",
+    description="Resolve up to 100 user IDs and emails to profiles in one request "
+    "(administrators only)",
+    responses={
+        401: {"model": HTTPError, "description": "Not authenticated"},
+        403: {"model": HTTPError, "description": "Not an administrator"},
+        422: {"model": HTTPError, "description": "Too many or no keys"},
+        500: {"model": HTTPError, "description": "Internal server error"},
+    },
+)
+async def lookup_users(
+    lookup: UserLookupRequest,
+    current_admin: Annotated[UserResponse, Depends(get_current_admin)],
+    db: Annotated[AsyncSession, Depends(get_db)],
+) -> UserLookupResult:
+    """
+    Resolve many users by ID and/or email.
+
+    Restricted to administrators: it reports which emails are registered,
+    so it would otherwise let any user enumerate accounts.
+
+    Args:
+        lookup: IDs and emails to resolve
+        current_admin: Current authenticated administrator
+        db: Database session dependency
+
+    Returns:
+        UserLookupResult: Users found and the keys that matched no user
+    """
+    user_repo = get_user_repository(db)
+    user_service = UserService(user_repo)
+    return await user_service.lookup_users(lookup)
+
+
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    dependencies=[Depends(request_deadline(EXPORT_DEADLINE_SECONDS))],
+    summary="Export Users",
+    description="Stream every user profile as NDJSON or CSV (administrators only)",
+    responses={
+        200: {
+            "content": {media_type: {} for media_type in EXPORT_MEDIA_TYPES.values()},
+            "description": "User profiles, one per line",
+        },
+        401: {"model": HTTPError, "description": "Not authenticated"},
+        403: {"model": HTTPError, "description": "Not an administrator"},
+        500: {"model": HTTPError, "description": "Internal server error"},
+    },
+)
+async def export_users(
+    request: Request,
+    current_admin: Annotated[UserResponse, Depends(get_current_admin)],
+    export_format: Annotated[
+        UserFileFormat, Query(alias="format", description="Output format")
+    ] = UserFileFormat.NDJSON,
+) -> StreamingResponse:
+    """
+    Stream every user profile for registrar synchronisation.
+
+    The body is read through a server-side cursor and encoded batch by
+    batch, so memory stays flat regardless of the number of users. The
+    stream uses its own database session because request-scoped sessions
+    are closed before the response body is sent.
+
+    Args:
+        request: Incoming request, used for its deadline
+        current_admin: Current authenticated administrator
+        export_format: Output format (ndjson or csv)
+
+    Returns:
+        StreamingResponse: Streamed export
+    """
+    deadline = getattr(request.state, "deadline", None)
+
+    async def body() -> AsyncIterator[bytes]:
+        async with AsyncSessionLocal() as session:
+            session.info["deadline"] = deadline
+            user_service = UserService(get_user_repository(session))
+            async for chunk in user_service.export_users(export_format):
+                yield chunk
+
+    return StreamingResponse(
+        body(),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={
+            "Content-Disposition": f"attachment; filename=users.{export_format.value}"
+        },
+    )
+
+
+@router.post(
+    "/import",
+    response_model=UserImportResult,
+    dependencies=[Depends(request_deadline(IMPORT_DEADLINE_SECONDS))],
+    summary="Import Users",
+    description="Bulk-create users from a CSV or NDJSON upload (administrators only)",
+    responses={
+        400: {"model": HTTPError, "description": "Malformed upload"},
+        401: {"model": HTTPError, "description": "Not authenticated"},
+        403: {"model": HTTPError, "description": "Not an administrator"},
+        413: {"model": HTTPError, "description": "Record too large"},
+        500: {"model": HTTPError, "description": "Internal server error"},
+    },
+)
+async def import_users(
+    request: Request,
+    current_admin: Annotated[UserResponse, Depends(get_current_admin)],
+    db: Annotated[AsyncSession, Depends(get_db)],
+    import_format: Annotated[
+        UserFileFormat, Query(alias="format", description="Upload format")
+    ] = UserFileFormat.NDJSON,
+) -> UserImportResult:
+    """
+    Bulk-create users from a streamed upload.
+
+    The request body is the raw file: CSV with an ``email,full_name,password``
+    header, or NDJSON with one ``UserCreate`` object per line. It is read
+    incrementally and loaded in batches, so rows that fail validation or
+    collide with existing users are reported without aborting the import.
+
+    Args:
+        request: Incoming request, whose body is the upload
+        current_admin: Current authenticated administrator
+        db: Database session dependency
+        import_format: Upload format (ndjson or csv)
+
+    Returns:
+        UserImportResult: Counts, throughput and rejected rows
+
+    Raises:
+        HTTPException: If the upload is malformed or holds an oversized
+            record (rows before it have been imported)
+    """
+    user_repo = get_user_repository(db)
+    import_service = UserImportService(user_repo)
+    try:
+        return await import_service.import_users(request.stream(), import_format)
+    except ImportRecordTooLargeError as e:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=str(e),
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
+
+
 @router.get(
     "/me",
     response_model=UserResponse,
@@ -127,7 +439,7 @@ async def update_current_user(
     Raises:
         HTTPException: If user is not authenticated or update fails
     """
-    user_repo = SQLAlchemyUserRepository(db)
+    user_repo = get_user_repository(db)
     user_service = UserService(user_repo)
     try:
         updated_user = await user_service.update_user(current_user.id, user_data)
@@ -1,13 +1,90 @@
 from functools import lru_cache
+from ipaddress import ip_network
+from typing import Literal
+from uuid import UUID
 from pydantic import (
+    BaseModel,
     PostgresDsn,
     SecretStr,
     Field,
     field_validator,
+    model_validator,
 )
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
+class RateLimitPolicy(BaseModel):
+    """
+    Rate limit cost of the routes under a path prefix.
+
+    Prefixes match whole path segments (``/api/v1/users`` matches
+    ``/api/v1/users/me`` but not ``/api/v1/usersettings``); the longest
+    matching prefix wins, and a policy naming the request method wins over
+    one that applies to every method. An ``exact`` policy only matches its
+    own path (ignoring a trailing slash), not the paths below it.
+
+    Attributes:
+        path (str): Path prefix the policy applies to
+        methods (list[str]): HTTP methods it applies to (empty for all)
+        exact (bool): Whether the policy applies to ``path`` only
+        cost (int): Tokens a request spends (0 exempts it from limiting)
+    """
+
+    path: str = Field(pattern=r"^/", description="Path prefix, e.g. /api/v1/auth")
+    methods: list[str] = Field(
+        default=[], description="HTTP methods the policy applies to; empty for all"
+    )
+    exact: bool = Field(
+        default=False,
+        description="Apply to this path only, not to the paths below it",
+    )
+    cost: int = Field(
+        default=1,
+        ge=0,
+        description="Tokens spent per request (capped at a full bucket); "
+        "0 is not limited",
+    )
+
+    @field_validator("methods")
+    @classmethod
+    def normalize_methods(cls, v: list[str]) -> list[str]:
+        """
+        Upper-cases method names so they compare equal to ASGI scope methods.
+
+        Args:
+            v: HTTP method names
+
+        Returns:
+            list[str]: Upper-cased method names
+        """
+        return [method.upper() for method in v]
+
+
+def default_rate_limit_policies(api_v1_path: str) -> list[RateLimitPolicy]:
+    """
+    Default rate limit policies.
+
+    Probes and static files are not limited, and endpoints that hash a
+    password with bcrypt (login and registration) cost several tokens.
+    Registration is matched exactly, so other ``POST`` routes under
+    ``/users`` keep the default cost.
+
+    Args:
+        api_v1_path: Path prefix of the version 1 API (e.g. /api/v1)
+
+    Returns:
+        list[RateLimitPolicy]: Default policies
+    """
+    return [
+        RateLimitPolicy(path="/static", cost=0),
+        RateLimitPolicy(path=f"{api_v1_path}/health", cost=0),
+        RateLimitPolicy(path=f"{api_v1_path}/auth/login", methods=["POST"], cost=5),
+        RateLimitPolicy(
+            path=f"{api_v1_path}/users", methods=["POST"], exact=True, cost=5
+        ),
+    ]
+
+
 class Settings(BaseSettings):
     """
     Application settings management using pydantic v2.
@@ -23,12 +100,25 @@ class Settings(BaseSettings):
         ACCESS_TOKEN_EXPIRE_MINUTES (int): JWT token expiration time in minutes
         JWT_ALGORITHM (str): Algorithm used for JWT token signing
         BACKEND_CORS_ORIGINS (list[str]): List of allowed CORS origins
+        ADMIN_USER_IDS (list[UUID]): IDs of users allowed to use admin endpoints
+        TRUSTED_PROXIES (list[str]): Networks of the reverse proxies whose
+            X-Forwarded-For and X-Forwarded-Proto headers are believed
+        HTTPS_REDIRECT (bool): Redirect plain HTTP requests to HTTPS
         POSTGRES_SERVER (str): PostgreSQL server hostname
         POSTGRES_USER (str): PostgreSQL username
         POSTGRES_PASSWORD (SecretStr): PostgreSQL password
         POSTGRES_DB (str): PostgreSQL database name
         SQLALCHEMY_DATABASE_URI (PostgresDsn): Constructed database URI
         DEBUG (bool): Enable debug mode (should be False in production)
+        REQUEST_TIMEOUT_SECONDS (float): Default time budget for a request
+        ASYNCPG_FAST_READS (bool): Serve single-user reads with raw asyncpg
+            prepared statements instead of the ORM
+        SERVER_TIMING_SAMPLE_RATE (float): Fraction of responses carrying a
+            Server-Timing latency breakdown
+        RATE_LIMIT_BACKEND (str): Where rate limit buckets are kept (memory,
+            shared_memory or postgres)
+        RATE_LIMIT_POLICIES (list[RateLimitPolicy]): Per-route rate limit
+            costs by path prefix and method
     """
 
     # Application
@@ -69,11 +159,103 @@ class Settings(BaseSettings):
         ],
     )
 
+    # Administration
+    # Users are identified by ID, which they cannot change (unlike their
+    # email, which any user can set to an unclaimed address)
+    ADMIN_USER_IDS: str | list[UUID] = Field(
+        default=[],
+        description="IDs of users allowed to use admin endpoints. Can be a comma-separated string or a list.",
+        examples=[
+            ["0192a4e2-7c1b-7d3e-9f4a-2b6c8d0e1f23"],
+            "0192a4e2-7c1b-7d3e-9f4a-2b6c8d0e1f23,0192a4e2-8a5d-7f01-b2c3-d4e5f6a7b8c9",
+        ],
+    )
+
+    # Reverse proxies
+    TRUSTED_PROXIES: str | list[str] = Field(
+        default=[],
+        description="CIDR networks of reverse proxies (e.g. Traefik) allowed to "
+        "report the client address and scheme in X-Forwarded-For and "
+        "X-Forwarded-Proto. Can be a comma-separated string or a list.",
+        examples=[["172.16.0.0/12"], "10.0.0.0/8,127.0.0.1"],
+    )
+    HTTPS_REDIRECT: bool = Field(
+        default=False,
+        description="Redirect plain HTTP requests to HTTPS. Leave off when a "
+        "proxy that is not trusted terminates TLS, or when health checks "
+        "reach the app over plain HTTP.",
+    )
+
     # Rate Limiting
     RATE_LIMIT_PER_MINUTE: int = Field(
         default=60, ge=1, description="Number of requests allowed per minute per client"
     )
 
+    RATE_LIMIT_MAX_CLIENTS: int = Field(
+        default=100_000,
+        ge=1,
+        description="Maximum number of client buckets each worker keeps in memory; "
+        "idle clients are evicted first, then the least recently seen",
+    )
+
+    RATE_LIMIT_BACKEND: Literal["memory", "shared_memory", "postgres"] = Field(
+        default="memory",
+        description="Where token buckets are kept: per worker (memory), shared "
+        "by the workers of a host (shared_memory) or by all hosts (postgres)",
+    )
+
+    RATE_LIMIT_SHARED_MEMORY_PATH: str = Field(
+        default="/dev/shm/user-management-rate-limit",
+        description="File backing the shared_memory bucket table (use tmpfs)",
+    )
+
+    RATE_LIMIT_LEASE_SIZE: int = Field(
+        default=5,
+        ge=1,
+        description="Tokens a worker takes from the postgres backend per "
+        "round-trip and spends locally",
+    )
+
+    RATE_LIMIT_POOL_SIZE: int = Field(
+        default=2,
+        ge=1,
+        description="Connections each worker keeps for the postgres backend, "
+        "apart from the main pool",
+    )
+
+    RATE_LIMIT_POLICIES: list[RateLimitPolicy] = Field(
+        # Built from the API prefix fields, which are validated first
+        default_factory=lambda data: default_rate_limit_policies(
+            f"{data.get('API_PREFIX', '/api')}/{data.get('API_V1_STR', 'v1')}"
+        ),
+        description="Token cost of requests by path prefix and method; "
+        "unmatched requests cost 1 token",
+    )
+
+    # Requests
+    REQUEST_TIMEOUT_SECONDS: float = Field(
+        default=30.0,
+        gt=0,
+        description="Default per-request deadline in seconds; database statements "
+        "are cancelled once it is exceeded (routes may override it)",
+    )
+
+    SERVER_TIMING_SAMPLE_RATE: float | None = Field(
+        default=None,
+        ge=0,
+        le=1,
+        description="Fraction of requests whose response carries a per-phase "
+        "Server-Timing header (0 disables it); defaults to 1 in debug mode "
+        "and 0 otherwise",
+    )
+
+    # Repositories
+    ASYNCPG_FAST_READS: bool = Field(
+        default=False,
+        description="Serve get-user-by-id/email with raw asyncpg prepared "
+        "statements instead of SQLAlchemy ORM queries",
+    )
+
     # PostgreSQL
     POSTGRES_SERVER: str = Field(
         default="localhost",
@@ -151,6 +333,69 @@ class Settings(BaseSettings):
             "BACKEND_CORS_ORIGINS should be a comma separated string or a list of strings"
         )
 
+    @field_validator("ADMIN_USER_IDS", mode="before")
+    @classmethod
+    def assemble_admin_user_ids(cls, v: str | list[str | UUID]) -> list[UUID]:
+        """
+        Validates and parses the administrator user ID list.
+
+        Args:
+            v: Comma-separated string or list of user IDs
+
+        Returns:
+            list[UUID]: Administrator user IDs
+
+        Raises:
+            ValueError: If the value is not a string or list of user IDs
+        """
+        if isinstance(v, str):
+            v = [user_id for user_id in v.split(",") if user_id.strip()]
+        if not isinstance(v, (list, tuple)):
+            raise ValueError(
+                "ADMIN_USER_IDS should be a comma separated string or a list of UUIDs"
+            )
+        return [
+            user_id if isinstance(user_id, UUID) else UUID(str(user_id).strip())
+            for user_id in v
+        ]
+
+    @field_validator("TRUSTED_PROXIES", mode="before")
+    @classmethod
+    def assemble_trusted_proxies(cls, v: str | list[str]) -> list[str]:
+        """
+        Validates and normalizes the trusted proxy networks.
+
+        Args:
+            v: Comma-separated string or list of addresses or CIDR networks
+
+        Returns:
+            list[str]: Networks in canonical CIDR notation
+
+        Raises:
+            ValueError: If an entry is not an IP address or network
+        """
+        if isinstance(v, str):
+            v = v.split(",")
+        if not isinstance(v, (list, tuple)) or not all(isinstance(x, str) for x in v):
+            raise ValueError(
+                "TRUSTED_PROXIES should be a comma separated string or a list of strings"
+            )
+        return [
+            str(ip_network(cidr.strip(), strict=False)) for cidr in v if cidr.strip()
+        ]
+
+    @model_validator(mode="after")
+    def default_server_timing(self) -> "Settings":
+        """
+        Enables Server-Timing on every request in debug mode unless configured.
+
+        Returns:
+            Settings: Settings with SERVER_TIMING_SAMPLE_RATE resolved
+        """
+        if self.SERVER_TIMING_SAMPLE_RATE is None:
+            self.SERVER_TIMING_SAMPLE_RATE = 1.0 if self.DEBUG else 0.0
+        return self
+
     @field_validator("SECRET_KEY", mode="before")
     @classmethod
     def validate_secret_key(cls, v: str | SecretStr) -> str | SecretStr:
@@ -195,7 +440,17 @@ class Settings(BaseSettings):
                         "http://localhost:8000",
                         "http://localhost:3000",
                     ],
+                    "ADMIN_USER_IDS": ["0192a4e2-7c1b-7d3e-9f4a-2b6c8d0e1f23"],
+                    "TRUSTED_PROXIES": ["172.16.0.0/12"],
                     "RATE_LIMIT_PER_MINUTE": 60,
+                    "RATE_LIMIT_MAX_CLIENTS": 100000,
+                    "RATE_LIMIT_BACKEND": "memory",
+                    "RATE_LIMIT_POLICIES": [
+                        {"path": "/api/v1/health", "cost": 0},
+                        {"path": "/api/v1/auth/login", "methods": ["POST"], "cost": 5},
+                    ],
+                    "REQUEST_TIMEOUT_SECONDS": 30.0,
+                    "SERVER_TIMING_SAMPLE_RATE": 0.01,
                     "POSTGRES_SERVER": "localhost",
                     "POSTGRES_USER": "postgres",
                     "POSTGRES_PASSWORD": "your-secure-password",
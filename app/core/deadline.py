@@ -0,0 +1,68 @@
+"""
+Per-request deadlines.
+
+Every HTTP request gets a deadline (``settings.REQUEST_TIMEOUT_SECONDS`` by
+default) stored on ``request.state.deadline`` as a ``time.monotonic()``
+timestamp. Routes can override it with the ``request_deadline`` dependency.
+Database sessions pick the deadline up and bound each transaction's
+statements with a transaction-local ``statement_timeout`` derived from the
+budget remaining when the transaction starts.
+"""
+
+import asyncio
+import time
+from typing import Awaitable, Callable
+
+from fastapi import Request
+
+
+class DeadlineExceededError(TimeoutError):
+    """Raised when a request has no time budget left."""
+
+    def __init__(self) -> None:
+        """Initialize deadline exceeded error."""
+        super().__init__("Request deadline exceeded")
+
+
+def remaining_seconds(deadline: float) -> float:
+    """
+    Get the time left before a deadline.
+
+    Args:
+        deadline: Deadline as a ``time.monotonic()`` timestamp
+
+    Returns:
+        float: Seconds remaining (negative if the deadline has passed)
+    """
+    return deadline - time.monotonic()
+
+
+def request_deadline(seconds: float) -> Callable[[Request], Awaitable[None]]:
+    """
+    Create a dependency that overrides the request deadline for a route.
+
+    The new deadline is measured from when the dependency runs and may be
+    shorter or longer than the global default.
+
+    Example:
+        ```python
+        @router.get("", dependencies=[Depends(request_deadline(5))])
+        async def health_check(): ...
+        ```
+
+    Args:
+        seconds: Time budget for the route
+
+    Returns:
+        Callable: Dependency that updates the request deadline
+    """
+
+    async def set_request_deadline(request: Request) -> None:
+        request.state.deadline = time.monotonic() + seconds
+        timeout: asyncio.Timeout | None = getattr(
+            request.state, "deadline_timeout", None
+        )
+        if timeout is not None:
+            timeout.reschedule(asyncio.get_running_loop().time() + seconds)
+
+    return set_request_deadline
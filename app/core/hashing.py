@@ -4,6 +4,8 @@ Password hashing utilities.
 
 from passlib.context import CryptContext
 
+from app.core.timing import timed
+
 # Password hashing context
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
@@ -19,7 +21,8 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     Returns:
         bool: True if the password matches, False otherwise
     """
-    return pwd_context.verify(plain_password, hashed_password)
+    with timed("hash"):
+        return pwd_context.verify(plain_password, hashed_password)
 
 
 def get_password_hash(password: str) -> str:
@@ -32,4 +35,5 @@ def get_password_hash(password: str) -> str:
     Returns:
         str: The hashed password
     """
-    return pwd_context.hash(password)
+    with timed("hash"):
+        return pwd_context.hash(password)
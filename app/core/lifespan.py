@@ -0,0 +1,89 @@
+"""
+Application lifespan management and graceful shutdown.
+
+Draining in-flight requests is left to the server: on SIGTERM uvicorn
+stops accepting connections and waits for the requests in progress
+(bounded by gunicorn's ``--graceful-timeout``, or uvicorn's
+``--timeout-graceful-shutdown`` when it runs on its own) before it sends
+the lifespan shutdown event. By then no request is running, so shutdown
+only releases what the application holds.
+"""
+
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Awaitable, Callable
+
+from fastapi import FastAPI
+
+from app.core import metrics
+from app.db.base import engine
+
+logger = logging.getLogger(__name__)
+
+ShutdownHook = Callable[[], Awaitable[None]]
+
+
+class ShutdownHooks:
+    """
+    Coroutine functions run at shutdown, before the engine is disposed.
+
+    Components holding resources outside the main connection pool (such
+    as the rate limit backend) register a hook to release them.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty hook list."""
+        self._hooks: list[ShutdownHook] = []
+
+    def add(self, hook: ShutdownHook) -> None:
+        """
+        Register a coroutine function to run at shutdown.
+
+        Args:
+            hook: Callable returning an awaitable that releases resources
+        """
+        self._hooks.append(hook)
+
+    async def run(self) -> None:
+        """Run every registered hook, logging (not raising) failures."""
+        for hook in self._hooks:
+            try:
+                await hook()
+            except Exception:
+                logger.exception("Shutdown hook %r failed", hook)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """
+    Application lifespan handler.
+
+    On shutdown, logs the worker's final metrics (they are kept in memory
+    and would otherwise be lost), runs the hooks in
+    ``app.state.shutdown_hooks`` and disposes the database engine so
+    pooled connections are closed cleanly instead of being left for the
+    server to time out.
+
+    Args:
+        app: The FastAPI application instance
+    """
+    yield
+
+    logger.info("Final metrics: %s", metrics.snapshot())
+
+    started = time.perf_counter()
+    shutdown_hooks: ShutdownHooks = app.state.shutdown_hooks
+    await shutdown_hooks.run()
+    hooks_time = time.perf_counter() - started
+
+    dispose_started = time.perf_counter()
+    await engine.dispose()
+    dispose_time = time.perf_counter() - dispose_started
+
+    logger.info(
+        "Shutdown complete: hooks=%.3fs dispose=%.3fs total=%.3fs",
+        hooks_time,
+        dispose_time,
+        time.perf_counter() - started,
+    )
@@ -0,0 +1,45 @@
+"""
+Logging configuration with request correlation.
+
+``RequestIDMiddleware`` stores the current request ID in
+``request_id_context``; every log record created while the request is
+handled carries it as ``record.request_id`` (``-`` outside requests), so
+application logs can be joined with access logs and database activity.
+"""
+
+import logging
+from contextvars import ContextVar
+
+request_id_context: ContextVar[str] = ContextVar("request_id", default="-")
+
+LOG_FORMAT = "%(asctime)s %(levelname)s [%(request_id)s] %(name)s: %(message)s"
+
+_base_record_factory = logging.getLogRecordFactory()
+
+
+def _record_factory(*args: object, **kwargs: object) -> logging.LogRecord:
+    """Create a log record tagged with the current request ID."""
+    record = _base_record_factory(*args, **kwargs)
+    record.request_id = request_id_context.get()
+    return record
+
+
+def configure_logging(level: int = logging.INFO) -> None:
+    """
+    Tag log records with the request ID and give application logs a handler.
+
+    Safe to call more than once. The ``app`` logger only gets its own
+    handler if none is configured, so deployments can still route it
+    elsewhere.
+
+    Args:
+        level: Level of the ``app`` logger
+    """
+    logging.setLogRecordFactory(_record_factory)
+
+    app_logger = logging.getLogger("app")
+    app_logger.setLevel(level)
+    if not app_logger.handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter(LOG_FORMAT))
+        app_logger.addHandler(handler)
@@ -0,0 +1,62 @@
+"""
+Lightweight in-process metrics counters and gauges.
+
+Snapshots are served to administrators by the health metrics endpoint and
+logged when a worker shuts down. Gauges are read on every snapshot, so
+they must be cheap to read.
+"""
+
+import logging
+from collections import Counter
+from typing import Callable
+
+logger = logging.getLogger(__name__)
+
+# Per-worker event counters, keyed by metric name
+counters: Counter[str] = Counter()
+
+# Per-worker gauges, keyed by metric name; read only when a snapshot is taken
+gauges: dict[str, Callable[[], float]] = {}
+
+
+def increment(name: str, amount: int = 1) -> None:
+    """
+    Increment a named counter.
+
+    Args:
+        name: Metric name (e.g. "deadline_exceeded")
+        amount: Amount to add to the counter
+    """
+    counters[name] += amount
+
+
+def register_gauge(name: str, read: Callable[[], float]) -> None:
+    """
+    Register a gauge whose value is read when a snapshot is taken.
+
+    Registering a name again replaces the previous gauge.
+
+    Args:
+        name: Metric name (e.g. "rate_limit_clients")
+        read: Callable returning the current value
+    """
+    gauges[name] = read
+
+
+def snapshot() -> dict[str, float]:
+    """
+    Get a copy of all counter values and current gauge readings.
+
+    A gauge that fails to read is logged and left out, so one broken gauge
+    does not fail the metrics endpoint.
+
+    Returns:
+        dict[str, float]: Metric values keyed by metric name
+    """
+    values: dict[str, float] = dict(counters)
+    for name, read in gauges.items():
+        try:
+            values[name] = read()
+        except Exception:
+            logger.exception("Failed to read gauge %s", name)
+    return values
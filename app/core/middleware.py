@@ -2,190 +2,521 @@
 Middleware configuration for the FastAPI application.
 """
 
-from typing import DefaultDict
-from fastapi import FastAPI, Request, Response
+import logging
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
-from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
-from starlette.types import ASGIApp
+from fastapi.responses import JSONResponse
+from sqlalchemy.exc import DBAPIError
+from starlette.datastructures import URL, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.core import metrics
 from app.core.config import get_settings
+from app.core.deadline import DeadlineExceededError
+from app.core.ids import new_request_id
+from app.core.logging import request_id_context
+from app.core.proxy import ProxyHeadersMiddleware, TrustedProxies
+from app.core.rate_limit import (
+    PolicyTrie,
+    RateLimitBackend,
+    TokenBucketLimiter,
+    create_rate_limit_backend,
+)
+from app.core.security import token_subject
+from app.core.timing import RequestTimings, timed, timings_context
 import time
-from datetime import datetime
 import asyncio
-from collections import defaultdict
-import uuid
+import math
+import random
+import re
 
 settings = get_settings()
+logger = logging.getLogger(__name__)
 
+# SQLSTATE raised by PostgreSQL when statement_timeout cancels a query
+QUERY_CANCELED = "57014"
 
-class RateLimitMiddleware(BaseHTTPMiddleware):
-    """Rate limiting middleware using a token bucket algorithm."""
+# Inbound request IDs kept as-is: UUIDs, ULIDs and similar tokens. Anything
+# else is replaced, so logs and headers never carry arbitrary client input.
+# The length fits PostgreSQL's application_name (see app.db.base).
+REQUEST_ID_PATTERN = re.compile(rb"[A-Za-z0-9._:-]{1,63}")
 
-    def __init__(self, app: ASGIApp, rate_limit: int = 60):
-        super().__init__(app)
-        self.rate_limit = rate_limit
-        self.tokens: DefaultDict[str, float] = defaultdict(lambda: self.rate_limit)
-        self.last_update: DefaultDict[str, datetime] = defaultdict(datetime.now)
-        self.lock = asyncio.Lock()
 
-    async def dispatch(
-        self, request: Request, call_next: RequestResponseEndpoint
-    ) -> Response:
-        client_ip = request.client.host if request.client else "unknown"
+class DeadlineMiddleware:
+    """
+    Middleware that enforces a per-request deadline.
+
+    Stores the deadline on ``request.state.deadline`` (and the running
+    ``asyncio.Timeout`` on ``request.state.deadline_timeout`` so routes can
+    reschedule it) and cancels the request once it expires. Overruns, whether
+    caught here, by ``DeadlineExceededError`` or by PostgreSQL's
+    statement_timeout, are answered with a 504 and counted in the
+    ``deadline_exceeded`` metric; any other ``TimeoutError`` is re-raised.
+    """
 
-        async with self.lock:
-            now = datetime.now()
-            time_passed = (now - self.last_update[client_ip]).total_seconds()
-            self.tokens[client_ip] = min(
-                self.rate_limit,
-                self.tokens[client_ip] + time_passed * (self.rate_limit / 60),
+    def __init__(self, app: ASGIApp, timeout: float) -> None:
+        self.app = app
+        self.timeout = timeout
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        state = scope.setdefault("state", {})
+        state["deadline"] = time.monotonic() + self.timeout
+        response_started = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        deadline_timeout = asyncio.timeout(self.timeout)
+        try:
+            async with deadline_timeout:
+                state["deadline_timeout"] = deadline_timeout
+                await self.app(scope, receive, send_wrapper)
+        except (TimeoutError, DBAPIError) as e:
+            # Other timeouts (e.g. an HTTP client's in a handler) are not
+            # the request's deadline and propagate as errors
+            if not (
+                deadline_timeout.expired()
+                or isinstance(e, DeadlineExceededError)
+                or getattr(getattr(e, "orig", None), "sqlstate", None) == QUERY_CANCELED
+            ):
+                raise
+            metrics.increment("deadline_exceeded")
+            logger.warning(
+                "Deadline exceeded for %s %s", scope["method"], scope["path"]
+            )
+            if response_started:
+                # Too late to change the status; abort the response instead
+                raise
+            response = JSONResponse(
+                status_code=504, content={"detail": "Request deadline exceeded"}
             )
+            await response(scope, receive, send)
 
-            if self.tokens[client_ip] >= 1:
-                self.tokens[client_ip] -= 1
-                self.last_update[client_ip] = now
-                return await call_next(request)
 
-        return Response(
-            content="Rate limit exceeded",
-            status_code=429,
-            headers={"Retry-After": "60"},
-        )
+class RateLimitMiddleware:
+    """
+    Rate limiting middleware using a token bucket per client.
+
+    Requests bearing a valid access token are limited per user (the
+    token's ``sub``), so users sharing a NAT address do not share a
+    budget; other requests are limited per client IP, as resolved from
+    trusted proxies' headers by ``ProxyHeadersMiddleware``.
+    Limited responses carry ``X-RateLimit-Limit``, ``X-RateLimit-Remaining``
+    and ``X-RateLimit-Reset`` (seconds until the bucket is full).
+
+    The admission decision is made before the request is forwarded;
+    nothing is held while the downstream app runs, so admitted requests
+    proceed concurrently. Buckets are kept by ``backend`` (see
+    ``app.core.rate_limit``), or in this worker's memory if none is given.
+    ``policies`` sets how many tokens each route costs; without it every
+    request costs one.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        rate_limit: int = 60,
+        backend: RateLimitBackend | None = None,
+        policies: PolicyTrie | None = None,
+    ) -> None:
+        self.app = app
+        self.backend = backend or TokenBucketLimiter(rate_limit)
+        self.backend.register_metrics()
+        self.policies = policies or PolicyTrie([], self.backend.rate_limit)
+
+    def client_key(self, scope: Scope) -> str:
+        """
+        Identify the client a request is charged to.
+
+        Args:
+            scope: ASGI scope of the incoming request
+
+        Returns:
+            str: ``user:<sub>`` for a valid bearer token, else ``ip:<address>``
+        """
+        for name, value in scope["headers"]:
+            if name == b"authorization":
+                scheme, _, token = value.decode("latin-1").partition(" ")
+                if token and scheme.lower() == "bearer":
+                    subject = token_subject(token.strip())
+                    if subject is not None:
+                        return f"user:{subject}"
+                break
+
+        client = scope.get("client")
+        return f"ip:{client[0] if client else 'unknown'}"
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        cost = self.policies.cost(scope["method"], scope["path"])
+        if cost == 0:
+            await self.app(scope, receive, send)
+            return
+
+        key = self.client_key(scope)
+        with timed("rate_limit"):
+            decision = await self.backend.acquire(key, cost)
+        headers = {
+            "X-RateLimit-Limit": str(decision.limit),
+            "X-RateLimit-Remaining": str(decision.remaining),
+            "X-RateLimit-Reset": str(math.ceil(decision.reset_after)),
+        }
+        if not decision.admitted:
+            headers["Retry-After"] = str(math.ceil(decision.retry_after))
+            response = Response(
+                content="Rate limit exceeded",
+                status_code=429,
+                headers=headers,
+            )
+            await response(scope, receive, send)
+            return
+
+        async def send_with_limits(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message).update(headers)
+            await send(message)
+
+        await self.app(scope, receive, send_with_limits)
+
+
+class HTTPSRedirectMiddleware:
+    """
+    Middleware to redirect plain HTTP requests to HTTPS in production.
+
+    Only the scope's ``scheme`` is checked: behind a reverse proxy it must
+    sit inside ``ProxyHeadersMiddleware``, which sets the scheme the proxy
+    received the request on.
+    """
+
+    def __init__(self, app: ASGIApp, enabled: bool | None = None) -> None:
+        """
+        Initialize the middleware.
+
+        Args:
+            app: The downstream ASGI application
+            enabled: Whether to redirect; defaults to ``not settings.DEBUG``
+                (development mode allows both HTTP and HTTPS)
+        """
+        self.app = app
+        self.enabled = not settings.DEBUG if enabled is None else enabled
 
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if not self.enabled or scope["type"] != "http" or scope["scheme"] == "https":
+            await self.app(scope, receive, send)
+            return
 
-class HTTPSRedirectMiddleware(BaseHTTPMiddleware):
-    """Middleware to handle scheme setting and HTTPS redirection."""
+        # Production mode: ensure HTTPS
+        url = URL(scope=scope).replace(scheme="https")
+        response = Response(status_code=301, headers={"Location": str(url)})
+        await response(scope, receive, send)
+
+
+class RequestIDMiddleware:
+    """
+    Middleware to add request ID to all requests.
+
+    An ``X-Request-ID`` sent by the proxy or client is kept if it is a
+    plausible identifier (``REQUEST_ID_PATTERN``), so one ID follows the
+    request end to end; otherwise a new ULID-style ID is generated. The ID
+    is stored on ``request.state.request_id``, set as the logging context
+    for the rest of the request (see ``app.core.logging``) and echoed in
+    the response.
+    """
 
     def __init__(self, app: ASGIApp) -> None:
-        super().__init__(app)
-
-    async def dispatch(
-        self, request: Request, call_next: RequestResponseEndpoint
-    ) -> Response:
-        if settings.DEBUG:
-            # Development mode: allow both HTTP and HTTPS
-            return await call_next(request)
-        else:
-            # Production mode: ensure HTTPS
-            if request.url.scheme != "https":
-                return Response(
-                    status_code=301,
-                    headers={"Location": str(request.url.replace(scheme="https"))},
-                )
-            return await call_next(request)
-
-
-class RequestIDMiddleware(BaseHTTPMiddleware):
-    """Middleware to add request ID to all requests."""
-
-    async def dispatch(
-        self, request: Request, call_next: RequestResponseEndpoint
-    ) -> Response:
-        request_id = str(uuid.uuid4())
-        request.state.request_id = request_id
-        response = await call_next(request)
-        response.headers["X-Request-ID"] = request_id
-        return response
-
-
-class TimingMiddleware(BaseHTTPMiddleware):
-    """Middleware to track request timing."""
-
-    async def dispatch(
-        self, request: Request, call_next: RequestResponseEndpoint
-    ) -> Response:
-        start_time = time.time()
-        response = await call_next(request)
-        process_time = time.time() - start_time
-        response.headers["X-Process-Time"] = str(process_time)
-        return response
-
-
-class SecurityHeadersMiddleware(BaseHTTPMiddleware):
-    """Middleware to add security headers to all responses."""
-
-    async def dispatch(
-        self, request: Request, call_next: RequestResponseEndpoint
-    ) -> Response:
-        response = await call_next(request)
-
-        # Basic security headers
-        security_headers = {
-            "X-Content-Type-Options": "nosniff",
-            "X-XSS-Protection": "1; mode=block",
-            "Referrer-Policy": "strict-origin-when-cross-origin",
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = None
+        for name, value in scope["headers"]:
+            if name == b"x-request-id":
+                if REQUEST_ID_PATTERN.fullmatch(value):
+                    request_id = value.decode("ascii")
+                break
+        if request_id is None:
+            request_id = new_request_id()
+        scope.setdefault("state", {})["request_id"] = request_id
+        encoded_id = request_id.encode("ascii")
+
+        async def send_with_request_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = [
+                    header
+                    for header in message.get("headers", ())
+                    if header[0] != b"x-request-id"
+                ] + [(b"x-request-id", encoded_id)]
+            await send(message)
+
+        token = request_id_context.set(request_id)
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            request_id_context.reset(token)
+
+
+class TimingMiddleware:
+    """
+    Middleware to track request timing.
+
+    Every response carries the time to its first byte in
+    ``X-Process-Time`` (seconds). A ``sample_rate`` fraction of requests
+    is also timed phase by phase (see ``app.core.timing``) and the
+    breakdown is sent as a ``Server-Timing`` header, which browser
+    devtools and load tests can display.
+    """
+
+    def __init__(self, app: ASGIApp, sample_rate: float | None = None) -> None:
+        """
+        Initialize the middleware.
+
+        Args:
+            app: The downstream ASGI application
+            sample_rate: Fraction of requests to break down; defaults to
+                ``settings.SERVER_TIMING_SAMPLE_RATE``
+        """
+        self.app = app
+        self.sample_rate = (
+            settings.SERVER_TIMING_SAMPLE_RATE if sample_rate is None else sample_rate
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start_time = time.perf_counter_ns()
+        timings = None
+        if self.sample_rate and (
+            self.sample_rate >= 1 or random.random() < self.sample_rate
+        ):
+            timings = RequestTimings()
+
+        async def send_with_timing(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                process_time = (time.perf_counter_ns() - start_time) / 1e9
+                headers = message.setdefault("headers", [])
+                headers.append((b"x-process-time", str(process_time).encode()))
+                if timings is not None:
+                    headers.append((b"server-timing", timings.header_value()))
+            await send(message)
+
+        token = timings_context.set(timings)
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            timings_context.reset(token)
+
+
+# Content Security Policy for API responses and the home page in production
+PRODUCTION_CSP = "; ".join(
+    [
+        "default-src 'self'",
+        "script-src 'self' https://cdn.jsdelivr.net",
+        "style-src 'self' https://cdn.jsdelivr.net",
+        "img-src 'self' data: https:",
+        "font-src 'self' data: https:",
+        "form-action 'self'",
+        "frame-ancestors 'none'",
+        "base-uri 'self'",
+        "object-src 'none'",
+        "connect-src 'self' https:",
+        "media-src 'none'",
+    ]
+)
+
+# Swagger UI and ReDoc need inline scripts, eval and blob: workers
+DOCS_CSP = "; ".join(
+    [
+        "default-src 'self'",
+        "worker-src 'self' blob: https://cdn.jsdelivr.net",
+        "script-src 'self' 'unsafe-inline' 'unsafe-eval' https://cdn.jsdelivr.net blob:",
+        "style-src 'self' 'unsafe-inline' https://cdn.jsdelivr.net",
+        "img-src 'self' data: https:",
+        "font-src 'self' data: https:",
+        "form-action 'self'",
+        "frame-ancestors 'none'",
+        "base-uri 'self'",
+        "object-src 'none'",
+        "connect-src 'self' https:",
+        "media-src 'none'",
+    ]
+)
+
+# Development CSP - More permissive for tools like ReDoc
+DEVELOPMENT_CSP = "; ".join(
+    [
+        "worker-src blob: 'self' 'unsafe-inline' 'unsafe-eval' https: http:",  # Primary worker directive
+        "script-src blob: 'self' 'unsafe-inline' 'unsafe-eval' https: http:",  # Matching script-src
+        "default-src 'self' 'unsafe-inline' 'unsafe-eval' https: http: data: blob: ws:",
+        "style-src 'self' 'unsafe-inline' https: http:",
+        "img-src 'self' https: http: data: blob:",
+        "font-src 'self' https: http: data:",
+        "connect-src 'self' https: http: ws: wss:",
+        "frame-ancestors 'self'",
+        "form-action 'self'",
+        "media-src 'self' https: http: data: blob:",
+    ]
+)
+
+PERMISSIONS_POLICY = "; ".join(
+    [
+        "accelerometer=()",
+        "camera=()",
+        "geolocation=()",
+        "gyroscope=()",
+        "magnetometer=()",
+        "microphone=()",
+        "payment=()",
+        "usb=()",
+    ]
+)
+
+
+def security_headers(debug: bool) -> dict[str, str]:
+    """
+    Build the security headers sent with every response.
+
+    Args:
+        debug: Whether the application runs in development mode
+
+    Returns:
+        dict[str, str]: Header names and values
+    """
+    # Basic security headers
+    headers = {
+        "X-Content-Type-Options": "nosniff",
+        "X-XSS-Protection": "1; mode=block",
+        "Referrer-Policy": "strict-origin-when-cross-origin",
+    }
+
+    if debug:
+        # Development-specific headers
+        headers.update(
+            {
+                "Content-Security-Policy": DEVELOPMENT_CSP,
+                "X-Frame-Options": "SAMEORIGIN",
+                "Strict-Transport-Security": "max-age=31536000; includeSubDomains",
+            }
+        )
+        return headers
+
+    # Production security headers
+    headers.update(
+        {
+            "Content-Security-Policy": PRODUCTION_CSP,
+            "Permissions-Policy": PERMISSIONS_POLICY,
+            "X-Frame-Options": "DENY",
+            "X-Permitted-Cross-Domain-Policies": "none",
+            "Cross-Origin-Opener-Policy": "same-origin",
+            "Cross-Origin-Resource-Policy": "same-origin",
+            "Cross-Origin-Embedder-Policy": "require-corp",
+            "Strict-Transport-Security": "max-age=31536000; includeSubDomains; preload",
         }
+    )
+    return headers
 
-        if not settings.DEBUG:
-            # Production security headers
-            security_headers.update(
-                {
-                    "X-Frame-Options": "DENY",
-                    "X-Permitted-Cross-Domain-Policies": "none",
-                    "Cross-Origin-Opener-Policy": "same-origin",
-                    "Cross-Origin-Resource-Policy": "same-origin",
-                    "Cross-Origin-Embedder-Policy": "require-corp",
-                    "Strict-Transport-Security": "max-age=31536000; includeSubDomains; preload",
-                }
-            )
 
-            # Production CSP - Strict security with documentation support
-            response.headers["Content-Security-Policy"] = "; ".join(
-                [
-                    "default-src 'self'",
-                    "worker-src 'self' blob: https://cdn.jsdelivr.net",
-                    "script-src 'self' 'unsafe-inline' 'unsafe-eval' https://cdn.jsdelivr.net blob:",
-                    "style-src 'self' 'unsafe-inline' https://cdn.jsdelivr.net",
-                    "img-src 'self' data: https:",
-                    "font-src 'self' data: https:",
-                    "form-action 'self'",
-                    "frame-ancestors 'none'",
-                    "base-uri 'self'",
-                    "object-src 'none'",
-                    "connect-src 'self' https:",
-                    "media-src 'none'",
-                ]
-            )
+class SecurityHeadersMiddleware:
+    """
+    Middleware to add security headers to all responses.
+
+    The headers only depend on the settings, so they are encoded once, as
+    raw ASGI ``(name, value)`` byte pairs, when the middleware is built;
+    ``route_overrides`` (e.g. a relaxed CSP for the API docs) are merged
+    into a separate block per path at the same time. A response then just
+    drops any header it set itself that the block replaces and appends
+    the block for its path.
+    """
 
-            # Permissions Policy in production
-            response.headers["Permissions-Policy"] = "; ".join(
-                [
-                    "accelerometer=()",
-                    "camera=()",
-                    "geolocation=()",
-                    "gyroscope=()",
-                    "magnetometer=()",
-                    "microphone=()",
-                    "payment=()",
-                    "usb=()",
-                ]
-            )
-        else:
-            # Development CSP - More permissive for tools like ReDoc
-            response.headers["Content-Security-Policy"] = "; ".join(
-                [
-                    "worker-src blob: 'self' 'unsafe-inline' 'unsafe-eval' https: http:",  # Primary worker directive
-                    "script-src blob: 'self' 'unsafe-inline' 'unsafe-eval' https: http:",  # Matching script-src
-                    "default-src 'self' 'unsafe-inline' 'unsafe-eval' https: http: data: blob: ws:",
-                    "style-src 'self' 'unsafe-inline' https: http:",
-                    "img-src 'self' https: http: data: blob:",
-                    "font-src 'self' https: http: data:",
-                    "connect-src 'self' https: http: ws: wss:",
-                    "frame-ancestors 'self'",
-                    "form-action 'self'",
-                    "media-src 'self' https: http: data: blob:",
-                ]
-            )
+    def __init__(
+        self,
+        app: ASGIApp,
+        debug: bool | None = None,
+        route_overrides: dict[str, dict[str, str]] | None = None,
+    ) -> None:
+        """
+        Encode the header blocks.
+
+        Args:
+            app: The downstream ASGI application
+            debug: Development mode; defaults to ``settings.DEBUG``
+            route_overrides: Header values replacing the defaults, by exact
+                request path
+        """
+        self.app = app
+        headers = security_headers(settings.DEBUG if debug is None else debug)
+        self.default_block = self._encode(headers)
+        self.route_blocks = {
+            path: self._encode({**headers, **overrides})
+            for path, overrides in (route_overrides or {}).items()
+        }
+        self.header_names = frozenset(
+            name
+            for block in [self.default_block, *self.route_blocks.values()]
+            for name, _ in block
+        )
 
-            # Development-specific headers
-            security_headers.update(
-                {
-                    "X-Frame-Options": "SAMEORIGIN",
-                    "Strict-Transport-Security": "max-age=31536000; includeSubDomains",
-                }
-            )
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        block = self.route_blocks.get(scope["path"], self.default_block)
+        header_names = self.header_names
+
+        async def send_with_security_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                # Security headers take precedence over any set by the route
+                message["headers"] = [
+                    header
+                    for header in message.get("headers", ())
+                    if header[0] not in header_names
+                ] + block
+            await send(message)
+
+        await self.app(scope, receive, send_with_security_headers)
+
+    @staticmethod
+    def _encode(headers: dict[str, str]) -> list[tuple[bytes, bytes]]:
+        """Encode headers as lower-case ASGI name/value byte pairs."""
+        return [
+            (name.lower().encode("latin-1"), value.encode("latin-1"))
+            for name, value in headers.items()
+        ]
+
+
+def docs_header_overrides(app: FastAPI) -> dict[str, dict[str, str]]:
+    """
+    Security header overrides for the interactive API documentation pages.
+
+    Args:
+        app (FastAPI): The FastAPI application instance
 
-        response.headers.update(security_headers)
-        return response
+    Returns:
+        dict[str, dict[str, str]]: Overrides by path (none in development,
+        whose policy already allows the docs)
+    """
+    if settings.DEBUG:
+        return {}
+    paths = [app.docs_url, app.swagger_ui_oauth2_redirect_url, app.redoc_url]
+    return {
+        path: {"Content-Security-Policy": DOCS_CSP}
+        for path in paths
+        if path is not None
+    }
 
 
 def setup_middleware(app: FastAPI) -> None:
@@ -193,19 +524,27 @@ def setup_middleware(app: FastAPI) -> None:
     Configure middleware for the FastAPI application.
 
     Sets up:
+    - Trusted proxy headers
+    - HTTPS redirects (if ``settings.HTTPS_REDIRECT``)
     - Request ID tracking
     - Request timing
     - Security headers
     - CORS with configured origins
     - Rate limiting
+    - Per-request deadlines
+
+    Resources held by the rate limit backend are released by a hook in
+    ``app.state.shutdown_hooks``.
 
     Args:
         app (FastAPI): The FastAPI application instance
     """
     # Order matters! Add middleware in the correct sequence
-    app.add_middleware(RequestIDMiddleware)
-    app.add_middleware(TimingMiddleware)
-    app.add_middleware(SecurityHeadersMiddleware)
+    # Deadline is innermost so its 504 still gets request ID and security headers
+    app.add_middleware(DeadlineMiddleware, timeout=settings.REQUEST_TIMEOUT_SECONDS)
+    app.add_middleware(
+        SecurityHeadersMiddleware, route_overrides=docs_header_overrides(app)
+    )
 
     # Configure CORS with environment-specific settings
     if settings.DEBUG:
@@ -219,6 +558,11 @@ def setup_middleware(app: FastAPI) -> None:
             expose_headers=[
                 "X-Request-ID",
                 "X-Process-Time",
+                "Server-Timing",
+                "X-RateLimit-Limit",
+                "X-RateLimit-Remaining",
+                "X-RateLimit-Reset",
+                "Retry-After",
                 "Content-Disposition",
                 "Content-Type",
                 "Authorization",
@@ -241,12 +585,45 @@ def setup_middleware(app: FastAPI) -> None:
                 "Origin",
                 "X-Requested-With",
             ],
-            expose_headers=["X-Request-ID", "X-Process-Time", "Content-Disposition"],
+            expose_headers=[
+                "X-Request-ID",
+                "X-Process-Time",
+                "Server-Timing",
+                "X-RateLimit-Limit",
+                "X-RateLimit-Remaining",
+                "X-RateLimit-Reset",
+                "Retry-After",
+                "Content-Disposition",
+            ],
             max_age=3600,
         )
 
     # Rate limiting (if enabled)
     if settings.RATE_LIMIT_PER_MINUTE > 0:
+        backend = create_rate_limit_backend(settings)
+        app.state.shutdown_hooks.add(backend.close)
         app.add_middleware(
-            RateLimitMiddleware, rate_limit=settings.RATE_LIMIT_PER_MINUTE
+            RateLimitMiddleware,
+            backend=backend,
+            policies=PolicyTrie(
+                settings.RATE_LIMIT_POLICIES, settings.RATE_LIMIT_PER_MINUTE
+            ),
         )
+
+    # Timing wraps rate limiting so it can be broken down too
+    app.add_middleware(TimingMiddleware)
+
+    # Request IDs wrap rate limiting and CORS so their responses and logs
+    # carry one too
+    app.add_middleware(RequestIDMiddleware)
+
+    # Just inside ProxyHeaders, so it sees the scheme the proxy received the
+    # request on
+    if settings.HTTPS_REDIRECT:
+        app.add_middleware(HTTPSRedirectMiddleware, enabled=True)
+
+    # Client address and scheme from trusted proxies, before anything reads them
+    app.add_middleware(
+        ProxyHeadersMiddleware,
+        trusted_proxies=TrustedProxies(settings.TRUSTED_PROXIES),
+    )
@@ -0,0 +1,145 @@
+"""
+Client address and scheme resolution behind trusted reverse proxies.
+"""
+
+from functools import lru_cache
+from ipaddress import IPv4Network, IPv6Network, ip_address, ip_network
+from typing import Iterable
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+# Schemes a proxy may report in X-Forwarded-Proto, by ASGI scope type
+FORWARDED_SCHEMES = {
+    "http": {b"http": "http", b"https": "https", b"ws": "http", b"wss": "https"},
+    "websocket": {b"http": "ws", b"https": "wss", b"ws": "ws", b"wss": "wss"},
+}
+
+
+class TrustedProxies:
+    """
+    Set of reverse proxy networks whose forwarding headers are believed.
+
+    Only the proxies themselves are trusted: ``X-Forwarded-For`` is read
+    from the right, skipping trusted hops, and the first address that is
+    not a trusted proxy is the client. Anything further left was written
+    by the client and could be forged.
+    """
+
+    def __init__(self, networks: Iterable[str]) -> None:
+        """
+        Parse the trusted networks.
+
+        Args:
+            networks: Addresses or CIDR networks of the proxies
+        """
+        self.networks: list[IPv4Network | IPv6Network] = [
+            ip_network(network, strict=False) for network in networks
+        ]
+
+    def __bool__(self) -> bool:
+        """Whether any proxy is trusted."""
+        return bool(self.networks)
+
+    def __contains__(self, address: str) -> bool:
+        """
+        Check whether an address belongs to a trusted proxy.
+
+        Args:
+            address: IP address; anything else is never trusted
+
+        Returns:
+            bool: True if the address is inside a trusted network
+        """
+        try:
+            ip = ip_address(address.strip())
+        except ValueError:
+            return False
+        return any(ip in network for network in self.networks)
+
+    def client_ip(self, peer: str, forwarded_for: str | None) -> str:
+        """
+        Resolve the address of the client behind any trusted proxies.
+
+        Args:
+            peer: Address of the directly connected peer
+            forwarded_for: Value of the ``X-Forwarded-For`` header, if any
+
+        Returns:
+            str: The client address; ``peer`` unless it is a trusted proxy
+            that forwarded the request
+        """
+        if not forwarded_for or peer not in self:
+            return peer
+        client = peer
+        for hop in reversed(forwarded_for.split(",")):
+            if not hop.strip():
+                continue
+            client = hop.strip()
+            if client not in self:
+                break
+        return client
+
+
+class ProxyHeadersMiddleware:
+    """
+    Apply ``X-Forwarded-For`` and ``X-Forwarded-Proto`` from trusted proxies.
+
+    When the connected peer is one of ``trusted_proxies`` the scope's
+    ``client`` is replaced by the address resolved by
+    ``TrustedProxies.client_ip`` and its ``scheme`` by the forwarded
+    protocol, both found in a single pass over the raw headers. Everything
+    further in (rate limiting, HTTPS redirection, ``request.url``,
+    ``request.client``) then reads the scope without looking at headers.
+    Requests from any other peer are passed on untouched.
+    """
+
+    def __init__(self, app: ASGIApp, trusted_proxies: TrustedProxies) -> None:
+        """
+        Initialize the middleware.
+
+        Args:
+            app: The downstream ASGI application
+            trusted_proxies: Proxies whose forwarding headers are believed
+        """
+        self.app = app
+        self.trusted_proxies = trusted_proxies
+        # Requests come from a handful of proxy addresses; parse each once
+        self.is_trusted = lru_cache(maxsize=1024)(trusted_proxies.__contains__)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] in FORWARDED_SCHEMES and self.trusted_proxies:
+            client = scope.get("client")
+            if client and self.is_trusted(client[0]):
+                self.apply_forwarded_headers(scope, client[0])
+        await self.app(scope, receive, send)
+
+    def apply_forwarded_headers(self, scope: Scope, peer: str) -> None:
+        """
+        Rewrite the scope's client and scheme from the forwarding headers.
+
+        Args:
+            scope: ASGI scope of a request from a trusted proxy
+            peer: Address of the proxy
+        """
+        forwarded_for = forwarded_proto = None
+        for name, value in scope["headers"]:
+            if name == b"x-forwarded-for":
+                # Repeated headers form one list, in order
+                forwarded_for = (
+                    value if forwarded_for is None else forwarded_for + b"," + value
+                )
+            elif name == b"x-forwarded-proto":
+                forwarded_proto = value
+
+        if forwarded_proto is not None:
+            # The last entry was added by the nearest proxy
+            proto = forwarded_proto.rpartition(b",")[2].strip().lower()
+            scheme = FORWARDED_SCHEMES[scope["type"]].get(proto)
+            if scheme is not None:
+                scope["scheme"] = scheme
+
+        if forwarded_for is not None:
+            client = self.trusted_proxies.client_ip(
+                peer, forwarded_for.decode("latin-1")
+            )
+            scope["client"] = (client, 0)
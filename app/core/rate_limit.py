@@ -0,0 +1,807 @@
+"""
+Token bucket rate limiting.
+
+Each bucket is stored as a single float, its theoretical arrival time
+(the generic cell rate algorithm): the time at which the bucket will be
+full again. This behaves exactly like a token bucket holding
+``rate_limit`` tokens, and a bucket whose time has passed is full, so it
+can be forgotten without changing any decision.
+
+Buckets are kept by a pluggable backend:
+
+- ``TokenBucketLimiter``: in the worker's memory (one budget per worker)
+- ``SharedMemoryRateLimitBackend``: in a memory-mapped file shared by all
+  workers on a host
+- ``PostgresRateLimitBackend``: in the database, shared by all hosts; wrap
+  it in ``LeasedRateLimitBackend`` so most requests are decided locally
+
+How many tokens a request costs is decided by ``PolicyTrie``, compiled
+once from ``settings.RATE_LIMIT_POLICIES``.
+
+In-process updates contain no ``await``, so they cannot interleave with
+another request on the event loop and need no lock. Callers decide whether
+to admit a request and release control before doing any work.
+"""
+
+import asyncio
+import fcntl
+import hashlib
+import logging
+import mmap
+import os
+import struct
+import sys
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from typing import Callable, Iterable, Protocol
+
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from app.core import metrics
+from app.core.config import RateLimitPolicy, Settings
+
+logger = logging.getLogger(__name__)
+
+# An empty bucket is full again after one minute
+REFILL_SECONDS = 60.0
+
+# Slack for float rounding when many refill intervals are added up
+ROUNDING_SLACK = 1e-9
+
+
+@dataclass(frozen=True, slots=True)
+class RateLimitDecision:
+    """
+    Outcome of a request for tokens, with the bucket's state afterwards.
+
+    Truthy when the request is admitted.
+
+    Attributes:
+        admitted: Whether the tokens were spent
+        limit: Bucket capacity (tokens per minute)
+        remaining: Tokens left in the bucket
+        reset_after: Seconds until the bucket is full again
+        retry_after: Seconds until the request could be admitted (0 if it was)
+    """
+
+    admitted: bool
+    limit: int
+    remaining: int
+    reset_after: float
+    retry_after: float = 0.0
+
+    def __bool__(self) -> bool:
+        return self.admitted
+
+
+def remaining_tokens(backlog: float, interval: float) -> int:
+    """
+    Count the whole tokens left in a bucket.
+
+    Args:
+        backlog: Seconds until the bucket is full again
+        interval: Seconds to regain one token
+
+    Returns:
+        int: Tokens available
+    """
+    return max(0, int((REFILL_SECONDS + ROUNDING_SLACK - backlog) / interval))
+
+
+def spend(
+    full_at: float, now: float, cost: int, interval: float, rate_limit: int
+) -> tuple[RateLimitDecision, float]:
+    """
+    Try to spend tokens from a bucket (one GCRA step).
+
+    Args:
+        full_at: Time at which the bucket is full again
+        now: Current time, on the same clock as ``full_at``
+        cost: Tokens to spend
+        interval: Seconds to regain one token
+        rate_limit: Bucket capacity
+
+    Returns:
+        tuple[RateLimitDecision, float]: The decision and the bucket's new
+        full-at time (unchanged if the request was rejected)
+    """
+    full_at = max(full_at, now)
+    spent = full_at + cost * interval
+    if spent - now > REFILL_SECONDS + ROUNDING_SLACK:
+        decision = RateLimitDecision(
+            admitted=False,
+            limit=rate_limit,
+            remaining=remaining_tokens(full_at - now, interval),
+            reset_after=full_at - now,
+            retry_after=spent - now - REFILL_SECONDS,
+        )
+        return decision, full_at
+    decision = RateLimitDecision(
+        admitted=True,
+        limit=rate_limit,
+        remaining=remaining_tokens(spent - now, interval),
+        reset_after=spent - now,
+    )
+    return decision, spent
+
+
+class RateLimitBackend(Protocol):
+    """Protocol defining the interface for rate limit bucket stores."""
+
+    rate_limit: int
+
+    async def acquire(self, key: str, cost: int = 1) -> RateLimitDecision:
+        """
+        Spend tokens from a key's bucket if enough are available.
+
+        Args:
+            key: Client identifier (e.g. user or IP address)
+            cost: Tokens the request costs
+
+        Returns:
+            RateLimitDecision: Whether the request is admitted, and the
+            bucket's state
+        """
+        ...
+
+    def register_metrics(self) -> None:
+        """Report the backend's size as metric gauges."""
+        ...
+
+    async def close(self) -> None:
+        """Release the backend's resources at shutdown."""
+        ...
+
+
+class BucketStore:
+    """
+    Bounded least-recently-used map of client keys to full-bucket times.
+
+    Buckets that have refilled completely are swept from the least
+    recently used end a few at a time as new clients arrive. When the
+    store is still full, the least recently used bucket is evicted even
+    though it is not full, which hands that client a fresh bucket; the
+    ``rate_limit_evictions`` counter tracks how often this happens.
+    """
+
+    # Idle buckets examined per new client, keeping sweeps O(1) amortized
+    SWEEP_BATCH = 2
+    # Each bucket's full-at time is a float object of its own
+    FLOAT_BYTES = sys.getsizeof(0.0)
+
+    def __init__(self, capacity: int) -> None:
+        """
+        Initialize an empty store.
+
+        Args:
+            capacity: Maximum number of buckets kept
+        """
+        self.capacity = capacity
+        self.buckets: OrderedDict[str, float] = OrderedDict()
+        # Size of the keys held, kept up to date as buckets come and go
+        self.key_bytes = 0
+
+    def __len__(self) -> int:
+        """Number of buckets held."""
+        return len(self.buckets)
+
+    def get(self, key: str, now: float) -> float:
+        """
+        Get the time a client's bucket is full again.
+
+        Unknown clients get ``now``, i.e. a full bucket, making room for
+        them if the store is at capacity.
+
+        Args:
+            key: Client identifier
+            now: Current monotonic time
+
+        Returns:
+            float: Monotonic time at which the bucket is full
+        """
+        full_at = self.buckets.get(key)
+        if full_at is not None:
+            self.buckets.move_to_end(key)
+            return full_at
+
+        self._sweep(now)
+        if len(self.buckets) >= self.capacity:
+            evicted, _ = self.buckets.popitem(last=False)
+            self.key_bytes -= sys.getsizeof(evicted)
+            metrics.increment("rate_limit_evictions")
+        return now
+
+    def set(self, key: str, full_at: float) -> None:
+        """
+        Record the time a client's bucket is full again.
+
+        Args:
+            key: Client identifier, as passed to ``get``
+            full_at: Monotonic time at which the bucket is full
+        """
+        if key not in self.buckets:
+            self.key_bytes += sys.getsizeof(key)
+        self.buckets[key] = full_at
+
+    def memory_bytes(self) -> int:
+        """
+        Estimate the memory held by the store.
+
+        Counts the mapping itself plus every key and value object, from
+        running totals, so reading it costs the same for any number of
+        clients.
+
+        Returns:
+            int: Approximate size in bytes
+        """
+        return (
+            sys.getsizeof(self.buckets)
+            + self.key_bytes
+            + len(self.buckets) * self.FLOAT_BYTES
+        )
+
+    def _sweep(self, now: float) -> None:
+        """Drop up to ``SWEEP_BATCH`` full buckets from the LRU end."""
+        for _ in range(self.SWEEP_BATCH):
+            if not self.buckets:
+                return
+            key, full_at = next(iter(self.buckets.items()))
+            if full_at > now:
+                return
+            del self.buckets[key]
+            self.key_bytes -= sys.getsizeof(key)
+
+
+class TokenBucketLimiter:
+    """
+    Per-key token buckets in the worker's memory.
+
+    Each key starts with a full bucket of ``rate_limit`` tokens and regains
+    ``rate_limit`` tokens per minute.
+    """
+
+    def __init__(
+        self,
+        rate_limit: int,
+        max_clients: int = 100_000,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Initialize the limiter.
+
+        Args:
+            rate_limit: Bucket capacity and tokens regained per minute
+            max_clients: Maximum number of client buckets kept in memory
+            clock: Monotonic time source in seconds
+        """
+        self.rate_limit = rate_limit
+        self.clock = clock
+        self.interval = REFILL_SECONDS / rate_limit
+        self.store = BucketStore(max_clients)
+
+    async def acquire(self, key: str, cost: int = 1) -> RateLimitDecision:
+        """
+        Spend tokens from a key's bucket if enough are available.
+
+        Args:
+            key: Client identifier (e.g. user or IP address)
+            cost: Tokens the request costs
+
+        Returns:
+            RateLimitDecision: Whether the request is admitted, and the
+            bucket's state
+        """
+        now = self.clock()
+        decision, full_at = spend(
+            self.store.get(key, now), now, cost, self.interval, self.rate_limit
+        )
+        if decision.admitted:
+            self.store.set(key, full_at)
+        return decision
+
+    def register_metrics(self) -> None:
+        """Report the number of buckets and their memory as gauges."""
+        metrics.register_gauge("rate_limit_clients", lambda: len(self.store))
+        metrics.register_gauge("rate_limit_memory_bytes", self.store.memory_bytes)
+
+    async def close(self) -> None:
+        """Buckets live in this worker's memory; nothing to release."""
+
+
+class SharedMemoryRateLimitBackend:
+    """
+    Token buckets in a memory-mapped file shared by the workers of a host.
+
+    The file is a set-associative table: a key's 64-bit hash selects a
+    group of ``GROUP_SLOTS`` slots, each holding ``(key hash, full_at)``.
+    A group is updated under a ``lockf`` lock on its byte range, so
+    workers only contend when their clients share a group. The lock is
+    taken without blocking: a contended group is retried after
+    ``LOCK_RETRY_SECONDS``, so the event loop keeps serving other requests
+    while another worker holds it. Slots whose
+    bucket has refilled are free; when a group has no free slot, the
+    bucket closest to full is evicted. ``full_at`` uses ``time.monotonic``,
+    which is system-wide on Linux, so every process agrees on it.
+    """
+
+    GROUP_SLOTS = 8
+    SLOT = struct.Struct("<Qd")
+    GROUP_BYTES = GROUP_SLOTS * SLOT.size
+    # Groups are held for microseconds, so a contended lock is soon free
+    LOCK_RETRY_SECONDS = 0.0005
+
+    def __init__(
+        self,
+        rate_limit: int,
+        path: str,
+        max_clients: int = 100_000,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Open (creating if needed) and map the bucket table.
+
+        Args:
+            rate_limit: Bucket capacity and tokens regained per minute
+            path: File backing the table, ideally on tmpfs (``/dev/shm``)
+            max_clients: Number of slots in the table
+            clock: Monotonic time source in seconds, shared across processes
+        """
+        self.rate_limit = rate_limit
+        self.clock = clock
+        self.interval = REFILL_SECONDS / rate_limit
+        self.groups = max(1, -(-max_clients // self.GROUP_SLOTS))
+        self.size = self.groups * self.GROUP_BYTES
+        self.fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        # Only ever grow the file: shrinking it under another worker's
+        # mapping would crash that worker
+        if os.fstat(self.fd).st_size < self.size:
+            os.ftruncate(self.fd, self.size)
+        self.table = mmap.mmap(self.fd, self.size)
+
+    async def acquire(self, key: str, cost: int = 1) -> RateLimitDecision:
+        """
+        Spend tokens from a key's bucket if enough are available.
+
+        Args:
+            key: Client identifier (e.g. user or IP address)
+            cost: Tokens the request costs
+
+        Returns:
+            RateLimitDecision: Whether the request is admitted, and the
+            bucket's state
+        """
+        digest = hashlib.blake2b(key.encode(), digest_size=8).digest()
+        # Hash 0 marks an empty slot
+        key_hash = int.from_bytes(digest, "little") or 1
+        group_offset = (key_hash % self.groups) * self.GROUP_BYTES
+
+        await self._lock_group(group_offset)
+        try:
+            now = self.clock()
+            slot_offset, stored = self._find_slot(group_offset, key_hash, now)
+            decision, full_at = spend(stored, now, cost, self.interval, self.rate_limit)
+            if decision.admitted:
+                self.SLOT.pack_into(self.table, slot_offset, key_hash, full_at)
+            return decision
+        finally:
+            fcntl.lockf(self.fd, fcntl.LOCK_UN, self.GROUP_BYTES, group_offset)
+
+    async def _lock_group(self, group_offset: int) -> None:
+        """
+        Take the exclusive lock on a group, yielding while it is contended.
+
+        ``lockf`` locks belong to the process, so this only waits for other
+        workers; requests in this worker are kept apart by having no
+        ``await`` between taking and releasing the lock.
+
+        Args:
+            group_offset: Byte offset of the group in the table
+        """
+        while True:
+            try:
+                fcntl.lockf(
+                    self.fd,
+                    fcntl.LOCK_EX | fcntl.LOCK_NB,
+                    self.GROUP_BYTES,
+                    group_offset,
+                )
+                return
+            except (BlockingIOError, PermissionError):
+                # Held by another worker (EAGAIN or EACCES, by platform)
+                await asyncio.sleep(self.LOCK_RETRY_SECONDS)
+
+    def entries(self) -> int:
+        """
+        Count the buckets that have not refilled yet.
+
+        Reads the whole table without locking, so it is meant for
+        diagnostics; it is too slow to report as a gauge.
+
+        Returns:
+            int: Number of clients currently holding a partial bucket
+        """
+        now = self.clock()
+        return sum(
+            1
+            for key_hash, full_at in self.SLOT.iter_unpack(self.table)
+            if key_hash and full_at > now
+        )
+
+    def register_metrics(self) -> None:
+        """
+        Report the table size as a gauge.
+
+        The number of buckets is not reported: buckets free themselves by
+        refilling, so counting them means reading the whole table.
+        """
+        metrics.register_gauge("rate_limit_memory_bytes", lambda: self.size)
+
+    async def close(self) -> None:
+        """Unmap the table and close its file; the file itself is kept."""
+        self.table.close()
+        os.close(self.fd)
+
+    def _find_slot(
+        self, group_offset: int, key_hash: int, now: float
+    ) -> tuple[int, float]:
+        """
+        Locate a key's slot in its group, or the slot to store it in.
+
+        Returns:
+            tuple[int, float]: Slot offset and the bucket's full-at time
+            (``now`` for a key that has no bucket yet)
+        """
+        victim_offset, victim_full_at = group_offset, float("inf")
+        for index in range(self.GROUP_SLOTS):
+            offset = group_offset + index * self.SLOT.size
+            slot_hash, full_at = self.SLOT.unpack_from(self.table, offset)
+            if slot_hash == key_hash:
+                return offset, full_at
+            if full_at < victim_full_at:
+                victim_offset, victim_full_at = offset, full_at
+        if victim_full_at > now:
+            metrics.increment("rate_limit_evictions")
+        return victim_offset, now
+
+
+# GCRA in one statement on the database clock. A new key starts with a full
+# bucket; an existing one is only updated if it holds enough tokens. Returns
+# the database time, the new full-at time if admitted, and the stored one
+# (the statement's snapshot predates the upsert), so a rejection can report
+# the bucket's state too. statement_timestamp() is constant within it.
+ACQUIRE_BUCKET = text(
+    "WITH admitted AS ("
+    " INSERT INTO rate_limit_buckets AS b (key, full_at)"
+    " VALUES (:key, extract(epoch FROM statement_timestamp()) + :spend)"
+    " ON CONFLICT (key) DO UPDATE"
+    " SET full_at = greatest(b.full_at, extract(epoch FROM statement_timestamp()))"
+    " + :spend"
+    " WHERE greatest(b.full_at, extract(epoch FROM statement_timestamp())) + :spend"
+    " <= extract(epoch FROM statement_timestamp()) + :burst"
+    " RETURNING b.full_at"
+    ") SELECT extract(epoch FROM statement_timestamp())::float8 AS now,"
+    " (SELECT full_at FROM admitted) AS admitted_full_at,"
+    " (SELECT full_at FROM rate_limit_buckets WHERE key = :key) AS stored_full_at"
+)
+
+# Refilled buckets carry no information and are deleted periodically
+PURGE_BUCKETS = text(
+    "DELETE FROM rate_limit_buckets"
+    " WHERE full_at <= extract(epoch FROM statement_timestamp())"
+)
+
+
+class PostgresRateLimitBackend:
+    """
+    Token buckets in the ``rate_limit_buckets`` table, shared by all hosts.
+
+    Every call is a database round-trip on the database clock, so wrap the
+    backend in ``LeasedRateLimitBackend`` for request traffic. If the
+    database cannot be reached or does not answer within ``timeout``,
+    requests are admitted (fail open) and counted in
+    ``rate_limit_backend_errors``: an outage of the limiter should not take
+    the API down with it.
+
+    The backend owns its engine and disposes it on ``close``; give it a
+    small pool of its own, so a burst of rate limit round-trips cannot
+    take the connections request handlers need (and a saturated main pool
+    cannot stall the limiter beyond ``timeout``).
+    """
+
+    # Seconds between purges of refilled buckets, per process
+    PURGE_INTERVAL = 60.0
+
+    def __init__(
+        self,
+        rate_limit: int,
+        engine: AsyncEngine,
+        timeout: float = 0.5,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Initialize the backend.
+
+        Args:
+            rate_limit: Bucket capacity and tokens regained per minute
+            engine: Engine for the database holding ``rate_limit_buckets``,
+                used by this backend alone
+            timeout: Seconds to wait for the database before admitting
+            clock: Monotonic time source for scheduling purges
+        """
+        self.rate_limit = rate_limit
+        self.engine = engine
+        self.timeout = timeout
+        self.clock = clock
+        self.interval = REFILL_SECONDS / rate_limit
+        self.next_purge = clock() + self.PURGE_INTERVAL
+
+    async def acquire(self, key: str, cost: int = 1) -> RateLimitDecision:
+        """
+        Spend tokens from a key's bucket if enough are available.
+
+        Args:
+            key: Client identifier (e.g. user or IP address)
+            cost: Tokens the request costs (at most ``rate_limit``)
+
+        Returns:
+            RateLimitDecision: Whether the request is admitted (always, if
+            the database is unavailable), and the bucket's state
+        """
+        params = {
+            "key": key,
+            "spend": cost * self.interval,
+            "burst": REFILL_SECONDS + ROUNDING_SLACK,
+        }
+        try:
+            async with asyncio.timeout(self.timeout), self.engine.begin() as connection:
+                result = await connection.execute(ACQUIRE_BUCKET, params)
+                now, admitted_full_at, stored_full_at = result.one()
+                if self.clock() >= self.next_purge:
+                    self.next_purge = self.clock() + self.PURGE_INTERVAL
+                    await connection.execute(PURGE_BUCKETS)
+        except (OSError, TimeoutError, SQLAlchemyError):
+            metrics.increment("rate_limit_backend_errors")
+            logger.warning("Rate limit backend unavailable", exc_info=True)
+            return RateLimitDecision(
+                admitted=True,
+                limit=self.rate_limit,
+                remaining=self.rate_limit,
+                reset_after=0.0,
+            )
+
+        if admitted_full_at is not None:
+            return RateLimitDecision(
+                admitted=True,
+                limit=self.rate_limit,
+                remaining=remaining_tokens(admitted_full_at - now, self.interval),
+                reset_after=admitted_full_at - now,
+            )
+        decision, _ = spend(
+            stored_full_at or now, now, cost, self.interval, self.rate_limit
+        )
+        # The upsert is authoritative; the snapshot may predate a concurrent
+        # request that took the last tokens
+        return replace(
+            decision,
+            admitted=False,
+            retry_after=decision.retry_after or cost * self.interval,
+        )
+
+    def register_metrics(self) -> None:
+        """Buckets are counted in the database; nothing to report locally."""
+
+    async def close(self) -> None:
+        """Close the backend's pooled connections."""
+        await self.engine.dispose()
+
+
+class LeasedRateLimitBackend:
+    """
+    Local fast path in front of a remote backend.
+
+    When a client has no local tokens, ``lease_size`` tokens are taken from
+    the remote bucket in one round-trip and spent locally for up to
+    ``lease_seconds``; tokens not spent by then are forfeited. Clients are
+    therefore never admitted beyond the shared budget, but one near its
+    limit may be refused slightly early. If a whole lease is not
+    available, the request's own cost is requested instead.
+    """
+
+    def __init__(
+        self,
+        backend: RateLimitBackend,
+        lease_size: int,
+        lease_seconds: float = 1.0,
+        max_clients: int = 100_000,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Initialize the local lease table.
+
+        Args:
+            backend: Remote backend holding the shared buckets
+            lease_size: Tokens taken per round-trip (capped at the limit)
+            lease_seconds: How long leased tokens may be spent locally
+            max_clients: Maximum number of leases kept in memory
+            clock: Monotonic time source in seconds
+        """
+        self.backend = backend
+        self.rate_limit = backend.rate_limit
+        self.lease_size = max(1, min(lease_size, backend.rate_limit))
+        self.lease_seconds = lease_seconds
+        self.max_clients = max_clients
+        self.clock = clock
+        # Key -> (leased tokens left, lease expiry, remote tokens left after
+        # the lease was taken, time the remote bucket is full again)
+        self.leases: OrderedDict[str, tuple[int, float, int, float]] = OrderedDict()
+
+    async def acquire(self, key: str, cost: int = 1) -> RateLimitDecision:
+        """
+        Spend leased tokens, taking a new lease from the backend if needed.
+
+        Args:
+            key: Client identifier (e.g. user or IP address)
+            cost: Tokens the request costs
+
+        Returns:
+            RateLimitDecision: Whether the request is admitted, and the
+            bucket's state as of the last round-trip plus the local lease
+        """
+        now = self.clock()
+        lease = self.leases.get(key)
+        if lease is not None:
+            tokens, expires, remote_remaining, reset_at = lease
+            if expires > now and tokens >= cost:
+                self.leases[key] = (tokens - cost, expires, remote_remaining, reset_at)
+                return RateLimitDecision(
+                    admitted=True,
+                    limit=self.rate_limit,
+                    remaining=remote_remaining + tokens - cost,
+                    reset_after=max(0.0, reset_at - now),
+                )
+            del self.leases[key]
+
+        if self.lease_size > cost:
+            decision = await self.backend.acquire(key, self.lease_size)
+            if decision.admitted:
+                if len(self.leases) >= self.max_clients:
+                    self.leases.popitem(last=False)
+                tokens = self.lease_size - cost
+                self.leases[key] = (
+                    tokens,
+                    now + self.lease_seconds,
+                    decision.remaining,
+                    now + decision.reset_after,
+                )
+                return replace(decision, remaining=decision.remaining + tokens)
+        return await self.backend.acquire(key, cost)
+
+    def register_metrics(self) -> None:
+        """Report the number of local leases as a gauge."""
+        metrics.register_gauge("rate_limit_leases", lambda: len(self.leases))
+        self.backend.register_metrics()
+
+    async def close(self) -> None:
+        """Drop the local leases, forfeiting their tokens, and close the backend."""
+        self.leases.clear()
+        await self.backend.close()
+
+
+class PolicyNode:
+    """Trie node: child segments and the costs of policies ending here."""
+
+    __slots__ = ("children", "costs", "exact_costs")
+
+    def __init__(self) -> None:
+        self.children: dict[str, PolicyNode] = {}
+        # Cost by method; None holds the cost for every other method
+        self.costs: dict[str | None, int] = {}
+        # As above, for exact policies: this path only, not its children
+        self.exact_costs: dict[str | None, int] = {}
+
+    def match(self, method: str, cost: int, exact: bool = False) -> int:
+        """Return this node's cost for ``method``, or ``cost`` if it has none."""
+        costs = self.exact_costs if exact else self.costs
+        if not costs:
+            return cost
+        return costs.get(method, costs.get(None, cost))
+
+
+class PolicyTrie:
+    """
+    Rate limit policies compiled into a trie of path segments.
+
+    A lookup walks the request path once, keeping the cost of the deepest
+    node with a policy for the request's method, so it takes time
+    proportional to the path length however many policies there are.
+    """
+
+    def __init__(
+        self,
+        policies: Iterable[RateLimitPolicy],
+        rate_limit: int,
+        default_cost: int = 1,
+    ) -> None:
+        """
+        Compile the policies.
+
+        Args:
+            policies: Policies to compile; later ones override earlier ones
+                with the same prefix and method
+            rate_limit: Bucket capacity; costs are capped at it so every
+                route can be admitted
+            default_cost: Cost of requests no policy matches
+        """
+        self.root = PolicyNode()
+        self.default_cost = default_cost
+        for policy in policies:
+            node = self.root
+            for segment in policy.path.split("/"):
+                if segment:
+                    node = node.children.setdefault(segment, PolicyNode())
+            costs = node.exact_costs if policy.exact else node.costs
+            methods: list[str | None] = [*policy.methods] or [None]
+            for method in methods:
+                costs[method] = min(policy.cost, rate_limit)
+
+    def cost(self, method: str, path: str) -> int:
+        """
+        Get the token cost of a request.
+
+        Args:
+            method: Upper-case HTTP method
+            path: Request path
+
+        Returns:
+            int: Tokens the request costs (0 if it is not limited)
+        """
+        node = self.root
+        cost = node.match(method, self.default_cost)
+        for segment in path.split("/"):
+            if not segment:
+                continue
+            child = node.children.get(segment)
+            if child is None:
+                return cost
+            node = child
+            cost = node.match(method, cost)
+        # The whole path matched a node, so its exact policies apply too
+        return node.match(method, cost, exact=True)
+
+
+def create_rate_limit_backend(settings: Settings) -> RateLimitBackend:
+    """
+    Create the rate limit backend selected by ``settings.RATE_LIMIT_BACKEND``.
+
+    Args:
+        settings: Application settings
+
+    Returns:
+        RateLimitBackend: Configured backend
+    """
+    if settings.RATE_LIMIT_BACKEND == "shared_memory":
+        return SharedMemoryRateLimitBackend(
+            settings.RATE_LIMIT_PER_MINUTE,
+            settings.RATE_LIMIT_SHARED_MEMORY_PATH,
+            max_clients=settings.RATE_LIMIT_MAX_CLIENTS,
+        )
+    if settings.RATE_LIMIT_BACKEND == "postgres":
+        # A pool of its own, without overflow: when it is exhausted,
+        # requests wait for the backend's timeout and are admitted
+        engine = create_async_engine(
+            str(settings.SQLALCHEMY_DATABASE_URI),
+            pool_size=settings.RATE_LIMIT_POOL_SIZE,
+            max_overflow=0,
+            pool_pre_ping=True,
+        )
+        return LeasedRateLimitBackend(
+            PostgresRateLimitBackend(settings.RATE_LIMIT_PER_MINUTE, engine),
+            settings.RATE_LIMIT_LEASE_SIZE,
+            max_clients=settings.RATE_LIMIT_MAX_CLIENTS,
+        )
+    return TokenBucketLimiter(
+        settings.RATE_LIMIT_PER_MINUTE, max_clients=settings.RATE_LIMIT_MAX_CLIENTS
+    )
@@ -2,7 +2,9 @@
 Security utilities for JWT token management and user authentication.
 """
 
+import time
 from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import Any, Annotated
 from uuid import UUID
 
@@ -13,8 +15,9 @@ from pydantic import EmailStr
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import get_settings
+from app.core.timing import timed
 from app.db.base import get_db
-from app.repositories.user import SQLAlchemyUserRepository
+from app.repositories.user import get_user_repository
 from app.schemas.auth import TokenData
 from app.schemas.user import UserResponse
 from app.services.user import UserService
@@ -73,11 +76,46 @@ def decode_token(token: str) -> dict[str, Any]:
     Raises:
         JWTError: If the token is invalid or expired
     """
-    return jwt.decode(
-        token,
-        settings.SECRET_KEY.get_secret_value(),
-        algorithms=[settings.JWT_ALGORITHM],
-    )
+    with timed("token"):
+        return jwt.decode(
+            token,
+            settings.SECRET_KEY.get_secret_value(),
+            algorithms=[settings.JWT_ALGORITHM],
+        )
+
+
+@lru_cache(maxsize=4096)
+def _verified_subject(token: str) -> tuple[str, float] | None:
+    """Subject and expiry of a token whose signature is valid, else None."""
+    try:
+        payload = decode_token(token)
+    except JWTError:
+        return None
+    subject, expires = payload.get("sub"), payload.get("exp")
+    if not isinstance(subject, str) or not isinstance(expires, (int, float)):
+        return None
+    return subject, float(expires)
+
+
+def token_subject(token: str) -> str | None:
+    """
+    Get the subject of a valid JWT token without touching the database.
+
+    Uses the same signature and expiry checks as ``verify_token``. Results
+    are cached per token (expiry is still checked on every call), so a
+    client sending the same token repeatedly is decoded once.
+
+    Args:
+        token (str): The JWT token
+
+    Returns:
+        str | None: The token's ``sub`` claim, or None if the token is
+        invalid or expired
+    """
+    verified = _verified_subject(token)
+    if verified is None or verified[1] <= time.time():
+        return None
+    return verified[0]
 
 
 async def verify_token(token: Annotated[str, Depends(oauth2_scheme)]) -> TokenData:
@@ -129,7 +167,7 @@ async def get_current_user(
     Raises:
         HTTPException: If user not found or inactive
     """
-    user_repository = SQLAlchemyUserRepository(db)
+    user_repository = get_user_repository(db)
     user_service = UserService(user_repository)
     try:
         user = await user_service.get_user(UUID(token_data.sub))
@@ -140,3 +178,27 @@ async def get_current_user(
             detail=str(e),
             headers={"WWW-Authenticate": "Bearer"},
         )
+
+
+async def get_current_admin(
+    current_user: Annotated[UserResponse, Depends(get_current_user)],
+) -> UserResponse:
+    """
+    Get the current user and require administrator privileges.
+    This function is designed to be used as a FastAPI dependency.
+
+    Args:
+        current_user: Current authenticated user from get_current_user
+
+    Returns:
+        UserResponse: The current authenticated administrator
+
+    Raises:
+        HTTPException: If the user is not listed in settings.ADMIN_USER_IDS
+    """
+    if current_user.id not in settings.ADMIN_USER_IDS:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Administrator privileges required",
+        )
+    return current_user
@@ -0,0 +1,99 @@
+"""
+Per-request latency breakdown reported as a Server-Timing header.
+
+``TimingMiddleware`` starts a ``RequestTimings`` for sampled requests and
+stores it in ``timings_context``; code on the request path wraps its
+phases in ``timed(name)`` (rate limiting, token decoding, database
+checkout and queries, password hashing, serialization). When the request
+is not sampled ``timed`` only reads the context variable, so
+instrumentation can stay in place in production.
+"""
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Iterator
+
+from fastapi.responses import JSONResponse
+
+
+class RequestTimings:
+    """
+    Phase durations recorded during one request.
+
+    The first ``MAX_ENTRIES`` phases are reported individually (so each
+    query of a request shows up on its own); later ones are summed per
+    name, keeping the header small for requests that run many queries.
+    """
+
+    MAX_ENTRIES = 30
+
+    __slots__ = ("started", "entries", "overflow")
+
+    def __init__(self) -> None:
+        """Start timing a request."""
+        self.started = time.perf_counter_ns()
+        self.entries: list[tuple[str, int]] = []
+        self.overflow: dict[str, tuple[int, int]] = {}
+
+    def add(self, name: str, duration_ns: int) -> None:
+        """
+        Record a phase.
+
+        Args:
+            name: Metric name (an HTTP token, e.g. ``db``)
+            duration_ns: Duration in nanoseconds
+        """
+        if len(self.entries) < self.MAX_ENTRIES:
+            self.entries.append((name, duration_ns))
+            return
+        total, count = self.overflow.get(name, (0, 0))
+        self.overflow[name] = (total + duration_ns, count + 1)
+
+    def header_value(self) -> bytes:
+        """
+        Format the recorded phases and the total so far as Server-Timing.
+
+        Returns:
+            bytes: Header value, durations in milliseconds
+        """
+        metrics = [f"{name};dur={ns / 1e6:.3f}" for name, ns in self.entries]
+        metrics += [
+            f'{name};dur={ns / 1e6:.3f};desc="{count} more"'
+            for name, (ns, count) in self.overflow.items()
+        ]
+        total = time.perf_counter_ns() - self.started
+        metrics.append(f"total;dur={total / 1e6:.3f}")
+        return ", ".join(metrics).encode("ascii")
+
+
+timings_context: ContextVar[RequestTimings | None] = ContextVar("timings", default=None)
+
+
+@contextmanager
+def timed(name: str) -> Iterator[None]:
+    """
+    Record the duration of a block in the current request's timings.
+
+    Does nothing when the request is not being timed.
+
+    Args:
+        name: Metric name reported in Server-Timing
+    """
+    timings = timings_context.get()
+    if timings is None:
+        yield
+        return
+    started = time.perf_counter_ns()
+    try:
+        yield
+    finally:
+        timings.add(name, time.perf_counter_ns() - started)
+
+
+class TimedJSONResponse(JSONResponse):
+    """JSON response whose body encoding is reported as ``serialize``."""
+
+    def render(self, content: Any) -> bytes:
+        with timed("serialize"):
+            return super().render(content)
@@ -2,15 +2,25 @@
 Database connection and session management.
 """
 
-from typing import AsyncGenerator
+import time
+from typing import Any, AsyncGenerator
+from fastapi import Request
+from sqlalchemy import Connection, event, text
 from sqlalchemy.ext.asyncio import (
     create_async_engine,
     AsyncSession,
     async_sessionmaker,
 )
-from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.orm import (
+    DeclarativeBase,
+    ORMExecuteState,
+    Session,
+    SessionTransaction,
+)
 
 from app.core.config import get_settings
+from app.core.deadline import DeadlineExceededError, remaining_seconds
+from app.core.timing import timed, timings_context
 
 settings = get_settings()
 
@@ -37,10 +47,133 @@ AsyncSessionLocal = async_sessionmaker(
 )
 
 
-async def get_db() -> AsyncGenerator[AsyncSession, None]:
+# Transaction-local equivalent of SET LOCAL that accepts a bind parameter, so
+# the prepared statement is reused whatever the remaining budget is
+SET_STATEMENT_TIMEOUT = text("SELECT set_config('statement_timeout', :timeout, true)")
+
+# As above, also tagging the transaction with the request ID. A bind
+# parameter keeps one prepared statement for all requests, where a SQL
+# comment per request would defeat asyncpg's statement cache.
+SET_STATEMENT_TIMEOUT_AND_REQUEST_ID = text(
+    "SELECT set_config('statement_timeout', :timeout, true),"
+    " set_config('application_name', :request_id, true)"
+)
+
+
+@event.listens_for(Session, "after_begin")
+def reset_statement_timeout(
+    session: Session, transaction: SessionTransaction, connection: Connection
+) -> None:
+    """Note that the new transaction has no statement timeout set yet."""
+    session.info["statement_timeout_set"] = False
+
+
+@event.listens_for(Session, "do_orm_execute")
+def apply_statement_timeout(orm_execute_state: ORMExecuteState) -> None:
+    """
+    Bound the request's statements by its remaining budget.
+
+    Sessions created by ``get_db`` carry the request deadline in
+    ``session.info["deadline"]``. Before the first statement of each
+    transaction the remaining budget is applied as a transaction-local
+    ``statement_timeout``, so PostgreSQL cancels a runaway query itself
+    instead of holding the worker. Later statements in the transaction
+    reuse it rather than paying a round-trip each; ``DeadlineMiddleware``
+    still cancels the request at its deadline.
+
+    The request ID in ``session.info["request_id"]`` is set as the
+    transaction's ``application_name`` in the same statement, so it shows
+    in ``pg_stat_activity`` and in server logs whose ``log_line_prefix``
+    includes ``%a`` (e.g. slow query logs).
+
+    Args:
+        orm_execute_state: State of the statement about to be executed
+
+    Raises:
+        DeadlineExceededError: If the request has no budget left
+    """
+    session = orm_execute_state.session
+    deadline = session.info.get("deadline")
+    if deadline is None:
+        return
+
+    remaining_ms = int(remaining_seconds(deadline) * 1000)
+    if remaining_ms <= 0:
+        raise DeadlineExceededError()
+
+    if session.in_transaction():
+        if session.info.get("statement_timeout_set"):
+            return
+        connection = session.connection()
+    else:
+        # First statement of the transaction: this waits for the pool
+        with timed("db_checkout"):
+            connection = session.connection()
+
+    # Reported apart from the request's own queries
+    options = {"timing_phase": "db_setup"}
+    request_id = session.info.get("request_id")
+    if request_id is None:
+        connection.execute(
+            SET_STATEMENT_TIMEOUT,
+            {"timeout": str(remaining_ms)},
+            execution_options=options,
+        )
+    else:
+        connection.execute(
+            SET_STATEMENT_TIMEOUT_AND_REQUEST_ID,
+            {"timeout": str(remaining_ms), "request_id": request_id},
+            execution_options=options,
+        )
+    session.info["statement_timeout_set"] = True
+
+
+@event.listens_for(engine.sync_engine, "before_cursor_execute")
+def start_query_timer(
+    conn: Connection,
+    cursor: Any,
+    statement: str,
+    parameters: Any,
+    context: Any,
+    executemany: bool,
+) -> None:
+    """Note when a statement is sent if the request is being timed."""
+    if timings_context.get() is not None:
+        conn.info["query_started"] = time.perf_counter_ns()
+
+
+@event.listens_for(engine.sync_engine, "after_cursor_execute")
+def record_query_time(
+    conn: Connection,
+    cursor: Any,
+    statement: str,
+    parameters: Any,
+    context: Any,
+    executemany: bool,
+) -> None:
+    """
+    Report each statement of a timed request as a ``db`` phase.
+
+    Statements may name another phase with the ``timing_phase`` execution
+    option.
+    """
+    started = conn.info.pop("query_started", None)
+    timings = timings_context.get()
+    if started is not None and timings is not None:
+        phase = "db"
+        if context is not None:
+            phase = context.execution_options.get("timing_phase", phase)
+        timings.add(phase, time.perf_counter_ns() - started)
+
+
+async def get_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
     """
     Dependency for database sessions.
 
+    The session inherits the request deadline so statements are cancelled
+    by the database once the request runs out of time, and the request ID
+    so its statements can be traced back to the request.
+
     Yields:
         AsyncSession: Database session
 
@@ -54,6 +187,8 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
         ```
     """
     async with AsyncSessionLocal() as session:
+        session.info["deadline"] = getattr(request.state, "deadline", None)
+        session.info["request_id"] = getattr(request.state, "request_id", None)
         try:
             yield session
         finally:
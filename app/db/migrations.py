@@ -0,0 +1,83 @@
+"""
+Helpers for online schema migrations.
+
+PostgreSQL cannot run ``CREATE INDEX CONCURRENTLY`` or ``DROP INDEX
+CONCURRENTLY`` inside a transaction block, so these helpers run them in an
+Alembic autocommit block. Concurrent builds do not block writes to the
+table, which lets index changes ship without downtime.
+
+Example:
+    ```python
+    from app.db.migrations import create_index_concurrently
+
+    def upgrade() -> None:
+        create_index_concurrently("ix_users_full_name", "users", ["full_name"])
+    ```
+"""
+
+from typing import Any, Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# Whether an index exists and is valid; a failed concurrent build leaves an
+# invalid index behind that still has to be maintained on every write
+INDEX_VALIDITY = sa.text(
+    "SELECT i.indisvalid FROM pg_index i"
+    " JOIN pg_class c ON c.oid = i.indexrelid"
+    " WHERE c.relname = :name AND c.relkind = 'i'"
+    " AND pg_catalog.pg_table_is_visible(c.oid)"
+)
+
+
+def create_index_concurrently(
+    index_name: str,
+    table_name: str,
+    columns: Sequence[str | sa.TextClause],
+    **kw: Any,
+) -> None:
+    """
+    Build an index without blocking writes.
+
+    Safe to re-run after an interrupted build: a leftover invalid index
+    of the same name is dropped and rebuilt, a valid one is kept.
+
+    Args:
+        index_name: Name of the index
+        table_name: Table to index
+        columns: Column names or SQL expressions to index
+        **kw: Extra ``op.create_index`` arguments (e.g. ``unique``,
+            ``postgresql_using``)
+    """
+    with op.get_context().autocommit_block():
+        if not op.get_context().as_sql:
+            valid = op.get_bind().scalar(INDEX_VALIDITY, {"name": index_name})
+            if valid is False:
+                op.drop_index(
+                    index_name, table_name=table_name, postgresql_concurrently=True
+                )
+        op.create_index(
+            index_name,
+            table_name,
+            columns,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+            **kw,
+        )
+
+
+def drop_index_concurrently(index_name: str, table_name: str) -> None:
+    """
+    Drop an index without blocking reads or writes.
+
+    Args:
+        index_name: Name of the index
+        table_name: Table the index belongs to
+    """
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            index_name,
+            table_name=table_name,
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
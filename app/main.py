@@ -5,14 +5,14 @@ Main FastAPI application module.
 from fastapi import FastAPI
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
-from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
-from starlette.types import ASGIApp
 from starlette.requests import Request
-from starlette.responses import Response
 from starlette.templating import _TemplateResponse
 
 from app.api.router import api_router
+from app.core.lifespan import ShutdownHooks, lifespan
+from app.core.logging import configure_logging
 from app.core.middleware import setup_middleware
+from app.core.timing import TimedJSONResponse
 from app.core.config import get_settings
 
 settings = get_settings()
@@ -21,30 +21,6 @@ settings = get_settings()
 templates = Jinja2Templates(directory="app/templates")
 
 
-class HTTPSRedirectMiddleware(BaseHTTPMiddleware):
-    """Middleware to handle scheme setting."""
-
-    def __init__(self, app: ASGIApp) -> None:
-        super().__init__(app)
-
-    async def dispatch(
-        self, request: Request, call_next: RequestResponseEndpoint
-    ) -> Response:
-        # Preserve the original scheme in development
-        if "headers" in request.scope:
-            # Get the original scheme from X-Forwarded-Proto if present
-            forwarded_proto = next(
-                (
-                    value.decode()
-                    for key, value in request.scope["headers"]
-                    if key.decode().lower() == "x-forwarded-proto"
-                ),
-                request.url.scheme,
-            )
-            request.scope["scheme"] = forwarded_proto
-        return await call_next(request)
-
-
 def create_application() -> FastAPI:
     """
     Create and configure the FastAPI application.
@@ -52,6 +28,8 @@ def create_application() -> FastAPI:
     Returns:
         FastAPI: The configured FastAPI application instance
     """
+    configure_logging()
+
     swagger_ui_params = {
         "persistAuthorization": True,
         "displayRequestDuration": True,
@@ -106,8 +84,13 @@ def create_application() -> FastAPI:
             }
         ],
         openapi_prefix="",  # Important: This ensures the OpenAPI schema uses the correct base URL
+        lifespan=lifespan,
+        default_response_class=TimedJSONResponse,
     )
 
+    # Resources released on shutdown, before the engine is disposed
+    app.state.shutdown_hooks = ShutdownHooks()
+
     # Mount static files directory
     app.mount("/static", StaticFiles(directory="app/static"), name="static")
 
@@ -0,0 +1,28 @@
+"""
+Rate limit bucket model for the Postgres rate limiting backend.
+"""
+
+from sqlalchemy import Double, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class RateLimitBucket(Base):
+    """
+    Token bucket of one client, shared by every application host.
+
+    ``full_at`` is the database clock time (Unix epoch seconds) at which the
+    bucket is full again. The table is unlogged: buckets are cheap to lose
+    on a crash and not worth WAL traffic on every request.
+    """
+
+    __tablename__ = "rate_limit_buckets"
+    __table_args__ = {"prefixes": ["UNLOGGED"]}
+
+    key: Mapped[str] = mapped_column(String(length=255), primary_key=True)
+    full_at: Mapped[float] = mapped_column(Double, nullable=False)
+
+    def __repr__(self) -> str:
+        """String representation of the bucket."""
+        return f"<RateLimitBucket {self.key}>"
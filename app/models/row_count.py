@@ -0,0 +1,97 @@
+"""
+Row counter model for exact table counts without COUNT(*) scans.
+"""
+
+from typing import Any
+
+from sqlalchemy import BigInteger, Connection, MetaData, SmallInteger, String, event
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+# Rows each table's count is spread over. Each write adds to one of them at
+# random, so concurrent writers rarely queue behind another transaction's
+# lock on the same counter row; readers sum them.
+ROW_COUNT_SLOTS = 16
+
+# Statement-level trigger function keeping row_counts in step with a table.
+# Transition tables make bulk statements (COPY merges, multi-row deletes)
+# cost one counter update, and statements that change no rows (e.g. an
+# INSERT ... ON CONFLICT DO NOTHING that conflicted) do not touch it.
+MAINTAIN_ROW_COUNT = f"""
+CREATE OR REPLACE FUNCTION maintain_row_count() RETURNS trigger
+LANGUAGE plpgsql AS $$
+DECLARE
+    delta bigint;
+BEGIN
+    IF TG_OP = 'TRUNCATE' THEN
+        UPDATE row_counts SET row_count = 0 WHERE table_name = TG_TABLE_NAME;
+        RETURN NULL;
+    END IF;
+    SELECT count(*) INTO delta FROM changed_rows;
+    IF delta <> 0 THEN
+        IF TG_OP = 'DELETE' THEN
+            delta := -delta;
+        END IF;
+        INSERT INTO row_counts AS r (table_name, slot, row_count)
+        VALUES (TG_TABLE_NAME, floor(random() * {ROW_COUNT_SLOTS}), delta)
+        ON CONFLICT (table_name, slot)
+        DO UPDATE SET row_count = r.row_count + EXCLUDED.row_count;
+    END IF;
+    RETURN NULL;
+END
+$$
+"""
+
+USERS_COUNT_TRIGGERS = (
+    "CREATE TRIGGER users_count_insert AFTER INSERT ON users"
+    " REFERENCING NEW TABLE AS changed_rows"
+    " FOR EACH STATEMENT EXECUTE FUNCTION maintain_row_count()",
+    "CREATE TRIGGER users_count_delete AFTER DELETE ON users"
+    " REFERENCING OLD TABLE AS changed_rows"
+    " FOR EACH STATEMENT EXECUTE FUNCTION maintain_row_count()",
+    "CREATE TRIGGER users_count_truncate AFTER TRUNCATE ON users"
+    " FOR EACH STATEMENT EXECUTE FUNCTION maintain_row_count()",
+)
+
+SEED_USERS_COUNT = (
+    "INSERT INTO row_counts (table_name, slot, row_count)"
+    " SELECT 'users', 0, count(*) FROM users"
+    " ON CONFLICT (table_name, slot) DO UPDATE SET row_count = EXCLUDED.row_count"
+)
+
+
+class RowCount(Base):
+    """
+    Share of a table's exact row count, maintained by triggers on that table.
+
+    A table's count is the sum of its rows' ``row_count``; see
+    ``ROW_COUNT_SLOTS``.
+    """
+
+    __tablename__ = "row_counts"
+
+    table_name: Mapped[str] = mapped_column(String(length=63), primary_key=True)
+    slot: Mapped[int] = mapped_column(SmallInteger, primary_key=True)
+    row_count: Mapped[int] = mapped_column(BigInteger, nullable=False)
+
+    def __repr__(self) -> str:
+        """String representation of the counter."""
+        return f"<RowCount {self.table_name}[{self.slot}]={self.row_count}>"
+
+
+@event.listens_for(Base.metadata, "after_create")
+def create_row_count_triggers(
+    target: MetaData, connection: Connection, **kwargs: Any
+) -> None:
+    """
+    Install the counting triggers when the schema is created from metadata.
+
+    Migrations install them explicitly.
+
+    Args:
+        target: The application's metadata
+        connection: Connection creating the schema
+    """
+    for statement in (MAINTAIN_ROW_COUNT, *USERS_COUNT_TRIGGERS, SEED_USERS_COUNT):
+        connection.exec_driver_sql(statement)
@@ -3,31 +3,147 @@ User model for database operations.
 """
 
 from datetime import datetime
-from sqlalchemy import String
+from typing import Any, Protocol
+from sqlalchemy import Connection, Index, String, Table, event, func, text
 from sqlalchemy.orm import Mapped, mapped_column
-from uuid import UUID, uuid4
+from uuid import UUID
 
+from app.core.ids import uuid7
 from app.db.base import Base
 
+# UUIDv7 for server-side defaults (PostgreSQL < 18 has no uuidv7()): a
+# random v4 UUID with its first 48 bits replaced by the Unix time in
+# milliseconds and its version nibble changed from 4 to 7
+CREATE_UUID_GENERATE_V7 = """
+CREATE OR REPLACE FUNCTION uuid_generate_v7() RETURNS uuid
+LANGUAGE sql VOLATILE PARALLEL SAFE AS $$
+    SELECT encode(
+        set_bit(
+            set_bit(
+                overlay(
+                    uuid_send(gen_random_uuid())
+                    PLACING substring(
+                        int8send(
+                            floor(extract(epoch FROM clock_timestamp()) * 1000)::bigint
+                        )
+                        FROM 3
+                    )
+                    FROM 1 FOR 6
+                ),
+                52, 1
+            ),
+            53, 1
+        ),
+        'hex'
+    )::uuid
+$$
+"""
+
+
+def normalize_email(email: str) -> str:
+    """
+    Normalize an email address for storage and lookup.
+
+    Emails are compared case-insensitively, so they are stored and looked up
+    in lower case, matching the ``lower(email)`` unique index.
+
+    Args:
+        email: Email address as entered
+
+    Returns:
+        str: Normalized email address
+    """
+    return email.strip().lower()
+
 
 class User(Base):
     """User model for authentication and profile management."""
 
     __tablename__ = "users"
+    __table_args__ = (
+        # Supports keyset pagination ordered by (created_at, id)
+        Index("ix_users_created_at_id", "created_at", "id"),
+        # Trigram indexes serving substring search (ILIKE '%...%')
+        Index(
+            "ix_users_full_name_trgm",
+            "full_name",
+            postgresql_using="gin",
+            postgresql_ops={"full_name": "gin_trgm_ops"},
+        ),
+        Index(
+            "ix_users_email_trgm",
+            "email",
+            postgresql_using="gin",
+            postgresql_ops={"email": "gin_trgm_ops"},
+        ),
+    )
 
-    id: Mapped[UUID] = mapped_column(primary_key=True, default=uuid4, index=True)
-    email: Mapped[str] = mapped_column(
-        String(length=255), unique=True, index=True, nullable=False
+    # Time-ordered so inserts append to the primary key index; the
+    # primary key's own index serves id lookups
+    id: Mapped[UUID] = mapped_column(
+        primary_key=True,
+        default=uuid7,
+        server_default=text("uuid_generate_v7()"),
     )
+    # Stored normalized (see normalize_email); uniqueness is case-insensitive
+    # through ix_users_email_lower
+    email: Mapped[str] = mapped_column(String(length=255), nullable=False)
     hashed_password: Mapped[str] = mapped_column(String(length=255), nullable=False)
     full_name: Mapped[str] = mapped_column(String(length=255), nullable=False)
     created_at: Mapped[datetime] = mapped_column(
-        default=datetime.utcnow, nullable=False
+        server_default=text("timezone('utc', now())"),
+        nullable=False,
     )
     updated_at: Mapped[datetime] = mapped_column(
-        default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False
+        server_default=text("timezone('utc', now())"),
+        onupdate=datetime.utcnow,
+        nullable=False,
     )
 
     def __repr__(self) -> str:
         """String representation of the user."""
         return f"<User {self.email}>"
+
+
+class UserAccount(Protocol):
+    """Read-only view of a stored user, as returned by repository reads."""
+
+    @property
+    def id(self) -> UUID: ...
+
+    @property
+    def email(self) -> str: ...
+
+    @property
+    def hashed_password(self) -> str: ...
+
+    @property
+    def full_name(self) -> str: ...
+
+    @property
+    def created_at(self) -> datetime: ...
+
+    @property
+    def updated_at(self) -> datetime: ...
+
+
+# Case-insensitive uniqueness; also serves lookups on lower(email)
+Index("ix_users_email_lower", func.lower(User.email), unique=True)
+
+
+@event.listens_for(User.__table__, "before_create")
+def create_users_prerequisites(
+    target: Table, connection: Connection, **kwargs: Any
+) -> None:
+    """
+    Install what ``users`` needs when the schema is created from metadata.
+
+    The trigram indexes need ``pg_trgm`` and the id default needs
+    ``uuid_generate_v7()``; migrations install both explicitly.
+
+    Args:
+        target: The ``users`` table
+        connection: Connection creating the schema
+    """
+    connection.exec_driver_sql("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    connection.exec_driver_sql(CREATE_UUID_GENERATE_V7)
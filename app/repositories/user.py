@@ -1,19 +1,94 @@
 """
-SQLAlchemy implementation of the user repository.
+User repository implementations.
+
+``SQLAlchemyUserRepository`` is the reference implementation.
+``AsyncpgUserRepository`` serves the hot single-user reads with raw asyncpg
+prepared statements and inherits everything else.
 """
 
-from typing import Protocol, List, Sequence, cast, Awaitable
+from datetime import datetime
+from typing import (
+    Any,
+    AsyncIterator,
+    Protocol,
+    List,
+    Mapping,
+    Sequence,
+    cast,
+    Awaitable,
+)
 from uuid import UUID
-from sqlalchemy import select, delete
-from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.user import User
+import asyncpg
+from sqlalchemy import (
+    Row,
+    Select,
+    any_,
+    bindparam,
+    select,
+    delete,
+    func,
+    literal,
+    or_,
+    text,
+    tuple_,
+    update,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+
+from app.core.config import get_settings
+from app.core.deadline import DeadlineExceededError, remaining_seconds
+from app.core.timing import timed
+from app.models.row_count import RowCount
+from app.models.user import User, UserAccount, normalize_email
+
+# Per-connection staging table for COPY-based imports; rows vanish on commit
+CREATE_IMPORT_STAGING = text(
+    "CREATE TEMP TABLE IF NOT EXISTS users_import ("
+    " line integer NOT NULL,"
+    " email varchar(255) NOT NULL,"
+    " hashed_password varchar(255) NOT NULL,"
+    " full_name varchar(255) NOT NULL"
+    ") ON COMMIT DELETE ROWS"
+)
+
+# First occurrence of each staged email wins; registered emails are skipped.
+# Staged emails are already normalized, but lower() keeps the conflict target
+# matching ix_users_email_lower.
+MERGE_IMPORT_STAGING = text(
+    "INSERT INTO users (email, hashed_password, full_name)"
+    " SELECT DISTINCT ON (lower(email)) email, hashed_password, full_name"
+    " FROM users_import ORDER BY lower(email), line"
+    " ON CONFLICT (lower(email)) DO NOTHING"
+    " RETURNING email"
+)
+
+# Planner-style row estimate: tuple density from the last VACUUM/ANALYZE
+# scaled to the table's current size. NULL if the table was never analyzed.
+ESTIMATE_USER_COUNT = text(
+    "SELECT CASE WHEN c.reltuples < 0 OR c.relpages = 0 THEN NULL"
+    " ELSE (c.reltuples / c.relpages"
+    " * (pg_relation_size(c.oid) / current_setting('block_size')::integer))"
+    "::bigint END"
+    " FROM pg_class c WHERE c.oid = 'users'::regclass"
+)
+
+# Columns needed to render a user profile (never includes the password hash)
+PROFILE_COLUMNS = (
+    User.id,
+    User.email,
+    User.full_name,
+    User.created_at,
+    User.updated_at,
+)
 
 
 class UserRepository(Protocol):
     """Protocol defining the interface for user repositories."""
 
-    async def get_by_id(self, user_id: UUID) -> User | None:
+    async def get_by_id(self, user_id: UUID) -> UserAccount | None:
         """
         Get user by ID.
 
@@ -21,11 +96,23 @@ class UserRepository(Protocol):
             user_id: User's UUID
 
         Returns:
-            User | None: User if found, None otherwise
+            UserAccount | None: User if found, None otherwise
         """
         ...
 
-    async def get_by_email(self, email: str) -> User | None:
+    async def get_profile_by_id(self, user_id: UUID) -> Row[Any] | None:
+        """
+        Get a user's profile columns by ID.
+
+        Args:
+            user_id: User's UUID
+
+        Returns:
+            Row[Any] | None: Profile row if found, None otherwise
+        """
+        ...
+
+    async def get_by_email(self, email: str) -> UserAccount | None:
         """
         Get user by email.
 
@@ -33,7 +120,33 @@ class UserRepository(Protocol):
             email: User's email address
 
         Returns:
-            User | None: User if found, None otherwise
+            UserAccount | None: User if found, None otherwise
+        """
+        ...
+
+    async def get_many_by_ids(self, user_ids: Sequence[UUID]) -> Sequence[Row[Any]]:
+        """
+        Get the profiles of several users by ID.
+
+        Args:
+            user_ids: Users' UUIDs
+
+        Returns:
+            Sequence[Row[Any]]: Profile rows of the users found, in no
+            particular order
+        """
+        ...
+
+    async def get_many_by_emails(self, emails: Sequence[str]) -> Sequence[Row[Any]]:
+        """
+        Get the profiles of several users by email.
+
+        Args:
+            emails: Users' email addresses
+
+        Returns:
+            Sequence[Row[Any]]: Profile rows of the users found, in no
+            particular order
         """
         ...
 
@@ -49,6 +162,19 @@ class UserRepository(Protocol):
         """
         ...
 
+    async def create_if_absent(self, user: User) -> Row[Any] | None:
+        """
+        Create a new user unless the email is already registered.
+
+        Args:
+            user: User to create
+
+        Returns:
+            Row[Any] | None: Profile of the created user, or None if the
+            email is taken
+        """
+        ...
+
     async def update(self, user: User) -> User:
         """
         Update an existing user.
@@ -61,6 +187,25 @@ class UserRepository(Protocol):
         """
         ...
 
+    async def update_by_id(
+        self, user_id: UUID, values: Mapping[str, Any]
+    ) -> Row[Any] | None:
+        """
+        Update the given columns of a user.
+
+        Args:
+            user_id: ID of the user to update
+            values: Column values to set
+
+        Returns:
+            Row[Any] | None: Profile of the updated user, or None if user
+            was not found
+
+        Raises:
+            IntegrityError: If the new values violate a unique constraint
+        """
+        ...
+
     async def delete(self, user_id: UUID) -> bool:
         """
         Delete a user by ID.
@@ -82,6 +227,93 @@ class UserRepository(Protocol):
         """
         ...
 
+    async def count(self) -> int:
+        """
+        Get the exact number of users.
+
+        Returns:
+            int: Number of users
+        """
+        ...
+
+    async def count_estimate(self) -> int | None:
+        """
+        Get an approximate number of users from table statistics.
+
+        Returns:
+            int | None: Estimated number of users, or None if the table
+            has no statistics yet
+        """
+        ...
+
+    async def list_page(
+        self, limit: int, after: tuple[datetime, UUID] | None = None
+    ) -> Sequence[Row[Any]]:
+        """
+        List a page of user profiles ordered by creation time.
+
+        Args:
+            limit: Maximum number of rows to return
+            after: ``(created_at, id)`` of the last row of the previous page
+
+        Returns:
+            Sequence[Row[Any]]: Profile rows, oldest first
+        """
+        ...
+
+    async def search(self, query: str, limit: int) -> Sequence[Row[Any]]:
+        """
+        Search user profiles by partial name or email.
+
+        Args:
+            query: Text to find within the full name or email
+            limit: Maximum number of rows to return
+
+        Returns:
+            Sequence[Row[Any]]: Matching profile rows, best match first
+        """
+        ...
+
+    def stream_profiles(
+        self, batch_size: int = 1000
+    ) -> AsyncIterator[Sequence[Row[Any]]]:
+        """
+        Stream every user profile in batches.
+
+        Args:
+            batch_size: Number of rows fetched per round-trip
+
+        Returns:
+            AsyncIterator[Sequence[Row[Any]]]: Batches of profile rows
+        """
+        ...
+
+    async def copy_import(self, rows: Sequence[tuple[int, str, str, str]]) -> set[str]:
+        """
+        Bulk-insert users, skipping emails that are already registered.
+
+        Args:
+            rows: ``(line, email, hashed_password, full_name)`` tuples
+
+        Returns:
+            set[str]: Emails of the users that were created
+        """
+        ...
+
+
+async def _driver_connection(connection: AsyncConnection) -> asyncpg.Connection:
+    """
+    Get the asyncpg connection underneath a session's connection.
+
+    Raises:
+        ConnectionError: If the pooled connection has been invalidated
+    """
+    raw_connection = await connection.get_raw_connection()
+    driver_connection = raw_connection.driver_connection
+    if driver_connection is None:
+        raise ConnectionError("Database connection has been invalidated")
+    return driver_connection
+
 
 class SQLAlchemyUserRepository:
     """SQLAlchemy implementation of the UserRepository protocol."""
@@ -107,9 +339,33 @@ class SQLAlchemyUserRepository:
             scalar_result = await cast(Awaitable[User | None], scalar_result)
         return scalar_result
 
+    async def get_profile_by_id(self, user_id: UUID) -> Row[Any] | None:
+        """
+        Get a user's profile columns by ID.
+
+        Selects only ``PROFILE_COLUMNS`` and returns a plain row, skipping
+        ORM hydration and the identity map. Use ``get_by_id`` when the
+        full entity (e.g. the password hash) is needed.
+
+        Args:
+            user_id: User's UUID
+
+        Returns:
+            Row[Any] | None: Profile row if found, None otherwise
+        """
+        stmt = select(*PROFILE_COLUMNS).where(User.id == user_id)
+        result = await self.session.execute(stmt)
+        row = result.one_or_none()
+        if hasattr(row, "__await__"):
+            row = await cast(Awaitable[Row[Any] | None], row)
+        return row
+
     async def get_by_email(self, email: str) -> User | None:
         """
-        Get user by email.
+        Get user by email, ignoring case.
+
+        Matches on ``lower(email)`` so the lookup is served by the
+        ``ix_users_email_lower`` unique index.
 
         Args:
             email: User's email address
@@ -117,13 +373,56 @@ class SQLAlchemyUserRepository:
         Returns:
             User | None: User if found, None otherwise
         """
-        stmt = select(User).where(User.email == email)
+        stmt = select(User).where(func.lower(User.email) == normalize_email(email))
         result = await self.session.execute(stmt)
         scalar_result = result.scalar_one_or_none()
         if hasattr(scalar_result, "__await__"):
             scalar_result = await cast(Awaitable[User | None], scalar_result)
         return scalar_result
 
+    async def get_many_by_ids(self, user_ids: Sequence[UUID]) -> Sequence[Row[Any]]:
+        """
+        Get the profiles of several users by ID.
+
+        The IDs are bound as a single array parameter (``id = ANY($1)``), so
+        the statement text is the same for any number of keys and one
+        round-trip resolves them all.
+
+        Args:
+            user_ids: Users' UUIDs
+
+        Returns:
+            Sequence[Row[Any]]: Profile rows of the users found, in no
+            particular order
+        """
+        stmt = select(*PROFILE_COLUMNS).where(
+            User.id
+            == any_(bindparam("user_ids", list(user_ids), type_=ARRAY(User.id.type)))
+        )
+        return await self._fetch_rows(stmt)
+
+    async def get_many_by_emails(self, emails: Sequence[str]) -> Sequence[Row[Any]]:
+        """
+        Get the profiles of several users by email, ignoring case.
+
+        The normalized emails are bound as a single array parameter
+        (``lower(email) = ANY($1)``), so one round-trip through
+        ``ix_users_email_lower`` resolves them all.
+
+        Args:
+            emails: Users' email addresses
+
+        Returns:
+            Sequence[Row[Any]]: Profile rows of the users found, in no
+            particular order
+        """
+        normalized = [normalize_email(email) for email in emails]
+        stmt = select(*PROFILE_COLUMNS).where(
+            func.lower(User.email)
+            == any_(bindparam("emails", normalized, type_=ARRAY(User.email.type)))
+        )
+        return await self._fetch_rows(stmt)
+
     async def create(self, user: User) -> User:
         """
         Create a new user.
@@ -134,11 +433,48 @@ class SQLAlchemyUserRepository:
         Returns:
             User: Created user
         """
+        user.email = normalize_email(user.email)
         self.session.add(user)
         await self.session.commit()
         await self.session.refresh(user)
         return user
 
+    async def create_if_absent(self, user: User) -> Row[Any] | None:
+        """
+        Create a new user unless the email is already registered.
+
+        Issues a single ``INSERT ... ON CONFLICT (lower(email)) DO NOTHING
+        RETURNING`` so the case-insensitive uniqueness check and the insert
+        are one atomic round-trip.
+        The id is generated in Python by the column's ``uuid7`` default and
+        sent with the INSERT; the timestamps come from server-side defaults.
+        Only profile columns are returned, so the password hash is not sent
+        back.
+
+        Args:
+            user: User to create
+
+        Returns:
+            Row[Any] | None: Profile of the created user, or None if the
+            email is taken
+        """
+        stmt = (
+            insert(User)
+            .values(
+                email=normalize_email(user.email),
+                hashed_password=user.hashed_password,
+                full_name=user.full_name,
+            )
+            .on_conflict_do_nothing(index_elements=[func.lower(User.email)])
+            .returning(*PROFILE_COLUMNS)
+        )
+        result = await self.session.execute(stmt)
+        row = result.one_or_none()
+        if hasattr(row, "__await__"):
+            row = await cast(Awaitable[Row[Any] | None], row)
+        await self.session.commit()
+        return row
+
     async def update(self, user: User) -> User:
         """
         Update an existing user.
@@ -149,11 +485,55 @@ class SQLAlchemyUserRepository:
         Returns:
             User: Updated user
         """
+        user.email = normalize_email(user.email)
         self.session.add(user)
         await self.session.commit()
         await self.session.refresh(user)
         return user
 
+    async def update_by_id(
+        self, user_id: UUID, values: Mapping[str, Any]
+    ) -> Row[Any] | None:
+        """
+        Update the given columns of a user.
+
+        Issues a single ``UPDATE users SET ... WHERE id = ? RETURNING ...``
+        touching only the supplied columns, instead of loading the user,
+        flushing it and refreshing it. Uniqueness is left to the database's
+        constraints; on a violation the transaction is rolled back and the
+        error is re-raised.
+
+        Args:
+            user_id: ID of the user to update
+            values: Column values to set
+
+        Returns:
+            Row[Any] | None: Profile of the updated user, or None if user
+            was not found
+
+        Raises:
+            IntegrityError: If the new values violate a unique constraint
+        """
+        if "email" in values:
+            values = {**values, "email": normalize_email(values["email"])}
+        stmt = (
+            update(User)
+            .where(User.id == user_id)
+            .values(**values, updated_at=func.timezone("utc", func.now()))
+            .returning(*PROFILE_COLUMNS)
+            .execution_options(synchronize_session=False)
+        )
+        try:
+            result = await self.session.execute(stmt)
+        except IntegrityError:
+            await self.session.rollback()
+            raise
+        row = result.one_or_none()
+        if hasattr(row, "__await__"):
+            row = await cast(Awaitable[Row[Any] | None], row)
+        await self.session.commit()
+        return row
+
     async def delete(self, user_id: UUID) -> bool:
         """
         Delete a user by ID.
@@ -182,3 +562,287 @@ class SQLAlchemyUserRepository:
         if hasattr(all_results, "__await__"):
             all_results = await cast(Awaitable[Sequence[User]], all_results)
         return list(all_results)
+
+    async def count(self) -> int:
+        """
+        Get the exact number of users.
+
+        Sums the ``row_counts`` slots that statement-level triggers on
+        ``users`` keep up to date, so the cost is a short primary-key range
+        scan. Falls back to ``COUNT(*)`` only when ``row_counts`` holds no
+        rows for ``users``; the ``row_counts`` table itself must exist.
+
+        Returns:
+            int: Number of users
+        """
+        stmt = select(func.sum(RowCount.row_count)).where(
+            RowCount.table_name == "users"
+        )
+        row_count = await self.session.scalar(stmt)
+        if row_count is None:
+            row_count = await self.session.scalar(
+                select(func.count()).select_from(User)
+            )
+        return int(row_count or 0)
+
+    async def count_estimate(self) -> int | None:
+        """
+        Get an approximate number of users from table statistics.
+
+        Uses ``pg_class.reltuples``/``relpages`` from the last VACUUM or
+        ANALYZE, scaled to the table's current size the way the planner
+        does. Costs a catalog lookup regardless of table size.
+
+        Returns:
+            int | None: Estimated number of users, or None if the table
+            has no statistics yet
+        """
+        estimate = await self.session.scalar(ESTIMATE_USER_COUNT)
+        return None if estimate is None else int(estimate)
+
+    async def list_page(
+        self, limit: int, after: tuple[datetime, UUID] | None = None
+    ) -> Sequence[Row[Any]]:
+        """
+        List a page of user profiles ordered by creation time.
+
+        Uses keyset (seek) pagination on ``(created_at, id)`` backed by
+        ``ix_users_created_at_id``, so the cost of a page does not grow with
+        its position in the table. Only profile columns are selected and
+        rows are returned without ORM hydration.
+
+        Args:
+            limit: Maximum number of rows to return
+            after: ``(created_at, id)`` of the last row of the previous page
+
+        Returns:
+            Sequence[Row[Any]]: Profile rows, oldest first
+        """
+        stmt = select(*PROFILE_COLUMNS).order_by(User.created_at, User.id).limit(limit)
+        if after is not None:
+            created_at, user_id = after
+            stmt = stmt.where(
+                tuple_(User.created_at, User.id)
+                > tuple_(literal(created_at), literal(user_id))
+            )
+        return await self._fetch_rows(stmt)
+
+    async def search(self, query: str, limit: int) -> Sequence[Row[Any]]:
+        """
+        Search user profiles by partial name or email.
+
+        Matches ``ILIKE '%query%'`` on either column, which PostgreSQL
+        serves from the ``ix_users_full_name_trgm`` and
+        ``ix_users_email_trgm`` GIN trigram indexes (a BitmapOr of two
+        bitmap index scans) rather than a sequential scan. Prefix matches
+        rank first, then rows are ordered by trigram word similarity.
+        ``%`` and ``_`` in the query match literally.
+
+        Args:
+            query: Text to find within the full name or email
+            limit: Maximum number of rows to return
+
+        Returns:
+            Sequence[Row[Any]]: Matching profile rows, best match first
+        """
+        is_prefix = or_(
+            User.full_name.istartswith(query, autoescape=True),
+            User.email.istartswith(query, autoescape=True),
+        )
+        similarity = func.greatest(
+            func.word_similarity(query, User.full_name),
+            func.word_similarity(query, User.email),
+        )
+        stmt = (
+            select(*PROFILE_COLUMNS)
+            .where(
+                or_(
+                    User.full_name.icontains(query, autoescape=True),
+                    User.email.icontains(query, autoescape=True),
+                )
+            )
+            .order_by(is_prefix.desc(), similarity.desc(), User.full_name, User.id)
+            .limit(limit)
+        )
+        return await self._fetch_rows(stmt)
+
+    async def stream_profiles(
+        self, batch_size: int = 1000
+    ) -> AsyncIterator[Sequence[Row[Any]]]:
+        """
+        Stream every user profile in batches.
+
+        Rows are read through a server-side cursor, fetching ``batch_size``
+        rows per round-trip, so memory use stays flat however many users
+        exist and the first batch is available immediately.
+
+        Args:
+            batch_size: Number of rows fetched per round-trip
+
+        Yields:
+            Sequence[Row[Any]]: Batches of profile rows, oldest first
+        """
+        stmt = (
+            select(*PROFILE_COLUMNS)
+            .order_by(User.created_at, User.id)
+            .execution_options(yield_per=batch_size)
+        )
+        result = await self.session.stream(stmt)
+        async for partition in result.partitions():
+            yield partition
+
+    async def copy_import(self, rows: Sequence[tuple[int, str, str, str]]) -> set[str]:
+        """
+        Bulk-insert users, skipping emails that are already registered.
+
+        Rows are loaded with asyncpg's binary COPY
+        (``copy_records_to_table``) into a temporary staging table and then
+        merged into ``users`` with a single ``INSERT ... SELECT ... ON
+        CONFLICT DO NOTHING``. The batch is committed as one transaction.
+
+        Args:
+            rows: ``(line, email, hashed_password, full_name)`` tuples with
+                emails already normalized by ``normalize_email``
+
+        Returns:
+            set[str]: Emails of the users that were created
+        """
+        await self.session.execute(CREATE_IMPORT_STAGING)
+        connection = await _driver_connection(await self.session.connection())
+        await connection.copy_records_to_table(
+            "users_import",
+            records=rows,
+            columns=("line", "email", "hashed_password", "full_name"),
+        )
+        result = await self.session.execute(MERGE_IMPORT_STAGING)
+        inserted = set(result.scalars().all())
+        await self.session.commit()
+        return inserted
+
+    async def _fetch_rows(self, stmt: Select[Any]) -> Sequence[Row[Any]]:
+        """Execute a column select and return its rows without ORM hydration."""
+        result = await self.session.execute(stmt)
+        rows = result.all()
+        if hasattr(rows, "__await__"):
+            rows = await cast(Awaitable[Sequence[Row[Any]]], rows)
+        return rows
+
+
+# Every users column, in table order, for the raw asyncpg reads
+USER_COLUMNS = ", ".join(column.name for column in User.__table__.columns)
+
+SELECT_USER_BY_ID = f"SELECT {USER_COLUMNS} FROM users WHERE id = $1"
+
+SELECT_USER_BY_EMAIL = f"SELECT {USER_COLUMNS} FROM users WHERE lower(email) = $1"
+
+
+# asyncpg ships no type information, so Record is Any to mypy
+class UserRecord(asyncpg.Record):  # type: ignore[misc]
+    """
+    Compact user row returned by ``AsyncpgUserRepository``.
+
+    A plain asyncpg record (a C-level tuple with a shared name map) that
+    also exposes its columns as attributes, so it satisfies ``UserAccount``
+    and can be validated into ``UserResponse`` like an ORM entity.
+    """
+
+    __slots__ = ()
+
+    def __getattr__(self, name: str) -> Any:
+        """Look up a column by attribute name."""
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+
+class AsyncpgUserRepository(SQLAlchemyUserRepository):
+    """
+    UserRepository with asyncpg-native single-user reads.
+
+    ``get_by_id`` and ``get_by_email`` run hand-written SQL on the session's
+    asyncpg connection, skipping statement compilation, result processing
+    and identity-map hydration, and return ``UserRecord`` rows. asyncpg
+    prepares each statement once per connection and reuses it from its
+    statement cache. The reads run on the session's connection, so they
+    see the session's flushed writes; the entities are detached and cannot
+    be modified through the session. All other methods are inherited.
+    """
+
+    async def get_by_id(self, user_id: UUID) -> UserRecord | None:
+        """
+        Get user by ID.
+
+        Args:
+            user_id: User's UUID
+
+        Returns:
+            UserRecord | None: User if found, None otherwise
+        """
+        return await self._fetch_user(SELECT_USER_BY_ID, user_id)
+
+    async def get_by_email(self, email: str) -> UserRecord | None:
+        """
+        Get user by email, ignoring case.
+
+        Args:
+            email: User's email address
+
+        Returns:
+            UserRecord | None: User if found, None otherwise
+        """
+        return await self._fetch_user(SELECT_USER_BY_EMAIL, normalize_email(email))
+
+    async def _fetch_user(self, query: str, key: Any) -> UserRecord | None:
+        """
+        Run a single-row user query on the session's asyncpg connection.
+
+        The ORM's ``statement_timeout`` hook does not see raw driver calls,
+        so the remaining request budget is passed to asyncpg as the query
+        timeout instead.
+
+        Raises:
+            DeadlineExceededError: If the request has no budget left, or
+                runs out of it during the query
+        """
+        timeout = None
+        deadline = self.session.info.get("deadline")
+        if deadline is not None:
+            timeout = remaining_seconds(deadline)
+            if timeout <= 0:
+                raise DeadlineExceededError()
+
+        if self.session.in_transaction():
+            connection = await self.session.connection()
+        else:
+            with timed("db_checkout"):
+                connection = await self.session.connection()
+        driver_connection = await _driver_connection(connection)
+        with timed("db"):
+            try:
+                return cast(
+                    UserRecord | None,
+                    await driver_connection.fetchrow(
+                        query, key, timeout=timeout, record_class=UserRecord
+                    ),
+                )
+            except TimeoutError as e:
+                # asyncpg's timeout was the request's remaining budget
+                raise DeadlineExceededError() from e
+
+
+def get_user_repository(session: AsyncSession) -> SQLAlchemyUserRepository:
+    """
+    Create the configured user repository for a session.
+
+    Args:
+        session: Database session
+
+    Returns:
+        SQLAlchemyUserRepository: ``AsyncpgUserRepository`` when
+        ``settings.ASYNCPG_FAST_READS`` is enabled, the SQLAlchemy
+        implementation otherwise
+    """
+    if get_settings().ASYNCPG_FAST_READS:
+        return AsyncpgUserRepository(session)
+    return SQLAlchemyUserRepository(session)
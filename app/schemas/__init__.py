@@ -3,9 +3,10 @@ Schema models for the application.
 """
 
 from app.schemas.base import HTTPError
-from app.schemas.health import HealthResponse, HealthStatus
+from app.schemas.health import AppMetricsResponse, HealthResponse, HealthStatus
 
 __all__ = [
+    "AppMetricsResponse",
     "HealthResponse",
     "HealthStatus",
     "HTTPError",
@@ -88,3 +88,30 @@ class HealthResponse(BaseModel):
             }
         }
     }
+
+
+class AppMetricsResponse(BaseModel):
+    """
+    Schema for the application metrics of one worker.
+
+    Attributes:
+        metrics (Dict[str, float]): Counters and gauges keyed by metric name
+    """
+
+    metrics: Dict[str, float] = Field(
+        ...,
+        description="Application counters (e.g. deadline_exceeded) and gauges "
+        "of the worker that answered; each worker counts separately",
+    )
+
+    model_config = {
+        "json_schema_extra": {
+            "example": {
+                "metrics": {
+                    "deadline_exceeded": 3,
+                    "rate_limit_clients": 1250,
+                    "rate_limit_memory_bytes": 196608,
+                }
+            }
+        }
+    }
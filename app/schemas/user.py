@@ -3,9 +3,13 @@ User schema models for request/response validation.
 """
 
 from datetime import datetime
-from pydantic import BaseModel, EmailStr, Field, ConfigDict
+from enum import Enum
+from pydantic import BaseModel, EmailStr, Field, ConfigDict, model_validator
 from uuid import UUID
 
+# Maximum number of keys resolved by one user lookup request
+MAX_LOOKUP_KEYS = 100
+
 
 class UserBase(BaseModel):
     """
@@ -141,3 +145,195 @@ class UserResponse(UserBase):
             }
         },
     )
+
+
+class UserPage(BaseModel):
+    """
+    Schema for a page of users from a keyset-paginated listing.
+
+    Attributes:
+        items (list[UserResponse]): Users on this page, oldest first
+        next_cursor (str | None): Opaque cursor for the next page, or None
+            if this is the last page
+    """
+
+    items: list[UserResponse] = Field(..., description="Users on this page")
+    next_cursor: str | None = Field(
+        None, description="Opaque cursor for the next page; null on the last page"
+    )
+
+    model_config = {
+        "json_schema_extra": {
+            "example": {
+                "items": [
+                    {
+                        "id": "123e4567-e89b-12d3-a456-426614174000",
+                        "email": "user@example.com",
+                        "full_name": "John Doe",
+                        "created_at": "2024-01-01T00:00:00Z",
+                        "updated_at": "2024-01-01T00:00:00Z",
+                    }
+                ],
+                "next_cursor": "MjAyNC0wMS0wMVQwMDowMDowMHwxMjNlNDU2Nw",
+            }
+        }
+    }
+
+
+class UserLookupRequest(BaseModel):
+    """
+    Schema for resolving many users by ID and/or email in one request.
+
+    Attributes:
+        ids (list[UUID]): User IDs to resolve
+        emails (list[EmailStr]): Email addresses to resolve
+    """
+
+    ids: list[UUID] = Field(default_factory=list, description="User IDs to resolve")
+    emails: list[EmailStr] = Field(
+        default_factory=list, description="Email addresses to resolve"
+    )
+
+    @model_validator(mode="after")
+    def check_key_count(self) -> "UserLookupRequest":
+        """Require between 1 and MAX_LOOKUP_KEYS keys in total."""
+        total = len(self.ids) + len(self.emails)
+        if total == 0:
+            raise ValueError("At least one id or email is required")
+        if total > MAX_LOOKUP_KEYS:
+            raise ValueError(f"At most {MAX_LOOKUP_KEYS} keys can be looked up at once")
+        return self
+
+    model_config = {
+        "json_schema_extra": {
+            "example": {
+                "ids": ["123e4567-e89b-12d3-a456-426614174000"],
+                "emails": ["user@example.com", "unknown@example.com"],
+            }
+        }
+    }
+
+
+class UserLookupResult(BaseModel):
+    """
+    Schema for the users resolved by a lookup request.
+
+    Attributes:
+        items (list[UserResponse]): Users found, in request order
+        not_found (list[str]): Requested IDs and emails that matched no user
+    """
+
+    items: list[UserResponse] = Field(..., description="Users found")
+    not_found: list[str] = Field(
+        default_factory=list, description="Requested keys that matched no user"
+    )
+
+    model_config = {
+        "json_schema_extra": {
+            "example": {
+                "items": [
+                    {
+                        "id": "123e4567-e89b-12d3-a456-426614174000",
+                        "email": "user@example.com",
+                        "full_name": "John Doe",
+                        "created_at": "2024-01-01T00:00:00Z",
+                        "updated_at": "2024-01-01T00:00:00Z",
+                    }
+                ],
+                "not_found": ["unknown@example.com"],
+            }
+        }
+    }
+
+
+class UserCount(BaseModel):
+    """
+    Schema for the number of registered users.
+
+    Attributes:
+        count (int): Number of users
+        exact (bool): Whether the count is exact or estimated from table
+            statistics
+    """
+
+    count: int = Field(..., description="Number of users")
+    exact: bool = Field(
+        ..., description="False if estimated from table statistics, True if exact"
+    )
+
+    model_config = {"json_schema_extra": {"example": {"count": 1284, "exact": False}}}
+
+
+class UserFileFormat(str, Enum):
+    """Enumeration of supported bulk user import and export formats."""
+
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+class ImportRowError(BaseModel):
+    """
+    Schema for a row rejected by a bulk user import.
+
+    Attributes:
+        line (int): Line number of the row in the uploaded file
+        email (str | None): Email of the row, if it could be read
+        reason (str): Why the row was rejected
+    """
+
+    line: int = Field(..., description="Line number in the uploaded file")
+    email: str | None = Field(None, description="Email of the rejected row")
+    reason: str = Field(..., description="Why the row was rejected")
+
+
+class UserImportResult(BaseModel):
+    """
+    Schema for the outcome of a bulk user import.
+
+    Attributes:
+        received (int): Number of data rows read from the upload
+        inserted (int): Number of users created
+        invalid (int): Number of rows that failed validation
+        conflicts (int): Number of rows whose email was already registered
+        elapsed_seconds (float): Wall-clock duration of the import
+        rows_per_second (float): Throughput over received rows
+        errors (list[ImportRowError]): Rejected rows (truncated if too many)
+        errors_truncated (bool): Whether some rejected rows were omitted
+    """
+
+    received: int = Field(0, description="Number of data rows read")
+    inserted: int = Field(0, description="Number of users created")
+    invalid: int = Field(0, description="Number of rows that failed validation")
+    conflicts: int = Field(
+        0, description="Number of rows whose email was already registered"
+    )
+    elapsed_seconds: float = Field(0.0, description="Duration of the import")
+    rows_per_second: float = Field(0.0, description="Throughput over received rows")
+    errors: list[ImportRowError] = Field(
+        default_factory=list, description="Rejected rows"
+    )
+    errors_truncated: bool = Field(
+        False, description="Whether some rejected rows were omitted from errors"
+    )
+
+    model_config = {
+        "json_schema_extra": {
+            "example": {
+                "received": 3,
+                "inserted": 1,
+                "invalid": 1,
+                "conflicts": 1,
+                "elapsed_seconds": 0.52,
+                "rows_per_second": 5.77,
+                "errors": [
+                    {"line": 3, "email": "bad", "reason": "value is not a valid email"},
+                    {
+                        "line": 4,
+                        "email": "john.doe@example.com",
+                        "reason": "Email is already registered",
+                    },
+                ],
+                "errors_truncated": False,
+            }
+        }
+    }
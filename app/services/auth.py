@@ -6,14 +6,14 @@ from typing import Protocol
 
 from app.core.hashing import verify_password
 from app.core.security import create_access_token
-from app.models.user import User
+from app.models.user import UserAccount, normalize_email
 from app.services.exceptions import AuthenticationError, UserNotFoundError
 
 
 class UserRepository(Protocol):
     """Protocol defining required user repository methods."""
 
-    async def get_by_email(self, email: str) -> User | None:
+    async def get_by_email(self, email: str) -> UserAccount | None:
         """Get user by email."""
         ...
 
@@ -45,7 +45,8 @@ class AuthService:
             AuthenticationError: If credentials are invalid
             UserNotFoundError: If user does not exist
         """
-        # Get user by email
+        # Get user by email, ignoring case
+        email = normalize_email(email)
         user = await self.user_repo.get_by_email(email)
         if not user:
             raise UserNotFoundError(email=email)
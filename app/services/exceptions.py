@@ -86,3 +86,24 @@ class AuthenticationError(DomainError):
     def format_message(self) -> str:
         """Format authentication error message."""
         return str(self.context["message"])
+
+
+class ImportRecordTooLargeError(DomainError):
+    """Raised when a record of an import upload exceeds the size limit."""
+
+    def __init__(self, line: int, limit: int):
+        """
+        Initialize record too large error.
+
+        Args:
+            line: Line the record starts on
+            limit: Maximum record size in bytes
+        """
+        super().__init__(413, {"line": line, "limit": limit})
+
+    def format_message(self) -> str:
+        """Format record too large message."""
+        return (
+            f"Record starting on line {self.context['line']} exceeds "
+            f"{self.context['limit']} bytes"
+        )
@@ -2,34 +2,133 @@
 User service for managing user operations.
 """
 
+import base64
+import binascii
+import csv
+import io
+from datetime import datetime
 from uuid import UUID
-from typing import Protocol
+from typing import Any, AsyncIterator, Mapping, Protocol, Sequence
+
+import orjson
+from sqlalchemy import Row
+from sqlalchemy.exc import IntegrityError
 
 from app.core.hashing import get_password_hash
-from app.models.user import User
-from app.schemas.user import UserCreate, UserResponse, UserUpdate
+from app.models.user import User, UserAccount, normalize_email
+from app.schemas.user import (
+    UserFileFormat,
+    UserCount,
+    UserCreate,
+    UserLookupRequest,
+    UserLookupResult,
+    UserPage,
+    UserResponse,
+    UserUpdate,
+)
 from app.services.exceptions import UserNotFoundError, EmailAlreadyExistsError
 
+# Column order of bulk user exports
+EXPORT_FIELDS = ("id", "email", "full_name", "created_at", "updated_at")
+
 
 class UserRepository(Protocol):
     """Protocol defining required user repository methods."""
 
-    async def get_by_id(self, user_id: UUID) -> User | None:
+    async def get_by_id(self, user_id: UUID) -> UserAccount | None:
         """Get user by ID."""
         ...
 
-    async def get_by_email(self, email: str) -> User | None:
+    async def get_by_email(self, email: str) -> UserAccount | None:
         """Get user by email."""
         ...
 
-    async def create(self, user: User) -> User:
-        """Create a new user."""
+    async def get_profile_by_id(self, user_id: UUID) -> Row[Any] | None:
+        """Get a user's profile columns by ID."""
+        ...
+
+    async def get_many_by_ids(self, user_ids: Sequence[UUID]) -> Sequence[Row[Any]]:
+        """Get the profiles of several users by ID."""
+        ...
+
+    async def get_many_by_emails(self, emails: Sequence[str]) -> Sequence[Row[Any]]:
+        """Get the profiles of several users by email."""
+        ...
+
+    async def create_if_absent(self, user: User) -> Row[Any] | None:
+        """Create a new user unless the email is already registered."""
         ...
 
     async def update(self, user: User) -> User:
         """Update an existing user."""
         ...
 
+    async def update_by_id(
+        self, user_id: UUID, values: Mapping[str, Any]
+    ) -> Row[Any] | None:
+        """Update the given columns of a user."""
+        ...
+
+    async def list_page(
+        self, limit: int, after: tuple[datetime, UUID] | None = None
+    ) -> Sequence[Row[Any]]:
+        """List a page of user profiles ordered by creation time."""
+        ...
+
+    async def search(self, query: str, limit: int) -> Sequence[Row[Any]]:
+        """Search user profiles by partial name or email."""
+        ...
+
+    async def count(self) -> int:
+        """Get the exact number of users."""
+        ...
+
+    async def count_estimate(self) -> int | None:
+        """Get an approximate number of users from table statistics."""
+        ...
+
+    def stream_profiles(
+        self, batch_size: int = 1000
+    ) -> AsyncIterator[Sequence[Row[Any]]]:
+        """Stream every user profile in batches."""
+        ...
+
+
+def encode_cursor(created_at: datetime, user_id: UUID) -> str:
+    """
+    Encode a keyset position as an opaque pagination cursor.
+
+    Args:
+        created_at: Creation time of the last user on a page
+        user_id: ID of the last user on a page
+
+    Returns:
+        str: URL-safe cursor string
+    """
+    raw = f"{created_at.isoformat()}|{user_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, UUID]:
+    """
+    Decode a pagination cursor produced by ``encode_cursor``.
+
+    Args:
+        cursor: Cursor string from a previous page
+
+    Returns:
+        tuple[datetime, UUID]: Keyset position to continue after
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, user_id = base64.urlsafe_b64decode(padded).decode().split("|", 1)
+        return datetime.fromisoformat(created_at), UUID(user_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise ValueError("Invalid pagination cursor")
+
 
 class UserService:
     """Service for handling user operations."""
@@ -56,19 +155,17 @@ class UserService:
         Raises:
             EmailAlreadyExistsError: If email is already registered
         """
-        # Check if email already exists
-        if await self.user_repo.get_by_email(user_data.email):
-            raise EmailAlreadyExistsError(email=user_data.email)
-
         # Create user instance
         user = User(
-            email=user_data.email,
+            email=normalize_email(user_data.email),
             hashed_password=get_password_hash(user_data.password),
             full_name=user_data.full_name,
         )
 
-        # Save to database
-        created_user = await self.user_repo.create(user)
+        # Insert unless the email is taken, in a single statement
+        created_user = await self.user_repo.create_if_absent(user)
+        if created_user is None:
+            raise EmailAlreadyExistsError(email=user.email)
         return UserResponse.model_validate(created_user)
 
     async def get_user(self, user_id: UUID) -> UserResponse:
@@ -84,10 +181,48 @@ class UserService:
         Raises:
             UserNotFoundError: If user does not exist
         """
-        user = await self.user_repo.get_by_id(user_id)
-        if not user:
+        profile = await self.user_repo.get_profile_by_id(user_id)
+        if profile is None:
             raise UserNotFoundError(user_id=user_id)
-        return UserResponse.model_validate(user)
+        return UserResponse.model_validate(profile)
+
+    async def lookup_users(self, lookup: UserLookupRequest) -> UserLookupResult:
+        """
+        Resolve many users by ID and/or email.
+
+        Each kind of key is resolved with one batched repository query
+        instead of one query per key.
+
+        Args:
+            lookup: IDs and emails to resolve
+
+        Returns:
+            UserLookupResult: Users found, in request order (IDs first,
+            without duplicates), and the keys that matched no user
+        """
+        by_id: dict[UUID, UserResponse] = {}
+        by_email: dict[str, UserResponse] = {}
+        if lookup.ids:
+            for row in await self.user_repo.get_many_by_ids(lookup.ids):
+                by_id[row.id] = UserResponse.model_validate(row)
+        if lookup.emails:
+            for row in await self.user_repo.get_many_by_emails(lookup.emails):
+                by_email[normalize_email(row.email)] = UserResponse.model_validate(row)
+
+        items: dict[UUID, UserResponse] = {}
+        not_found: list[str] = []
+        for user_id in lookup.ids:
+            if user_id in by_id:
+                items.setdefault(user_id, by_id[user_id])
+            else:
+                not_found.append(str(user_id))
+        for email in lookup.emails:
+            user = by_email.get(normalize_email(email))
+            if user is not None:
+                items.setdefault(user.id, user)
+            else:
+                not_found.append(email)
+        return UserLookupResult(items=list(items.values()), not_found=not_found)
 
     async def update_user(self, user_id: UUID, user_data: UserUpdate) -> UserResponse:
         """
@@ -104,23 +239,127 @@ class UserService:
             UserNotFoundError: If user does not exist
             EmailAlreadyExistsError: If new email is already registered
         """
-        # Get existing user
-        user = await self.user_repo.get_by_id(user_id)
-        if not user:
-            raise UserNotFoundError(user_id=user_id)
-
-        # Check if new email is available
-        if user_data.email and user_data.email != user.email:
-            if await self.user_repo.get_by_email(user_data.email):
-                raise EmailAlreadyExistsError(email=user_data.email)
-            user.email = user_data.email
-
-        # Update other fields
+        # Only the columns present in the request are written
+        values: dict[str, Any] = {}
+        if user_data.email:
+            values["email"] = normalize_email(user_data.email)
         if user_data.full_name is not None:
-            user.full_name = user_data.full_name
+            values["full_name"] = user_data.full_name
         if user_data.password:
-            user.hashed_password = get_password_hash(user_data.password)
+            values["hashed_password"] = get_password_hash(user_data.password)
+
+        if not values:
+            return await self.get_user(user_id)
 
-        # Save changes
-        updated_user = await self.user_repo.update(user)
+        # Single UPDATE ... RETURNING; the unique constraint guards the email
+        try:
+            updated_user = await self.user_repo.update_by_id(user_id, values)
+        except IntegrityError:
+            if "email" not in values:
+                raise
+            raise EmailAlreadyExistsError(email=values["email"])
+        if not updated_user:
+            raise UserNotFoundError(user_id=user_id)
         return UserResponse.model_validate(updated_user)
+
+    async def list_users(self, limit: int, cursor: str | None = None) -> UserPage:
+        """
+        List users one page at a time.
+
+        Args:
+            limit: Maximum number of users on the page
+            cursor: Cursor returned with the previous page, if any
+
+        Returns:
+            UserPage: Users on the page and the cursor for the next one
+
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        after = decode_cursor(cursor) if cursor else None
+
+        # Fetch one extra row to learn whether another page exists
+        rows = await self.user_repo.list_page(limit + 1, after)
+        items = [UserResponse.model_validate(row) for row in rows[:limit]]
+
+        next_cursor = None
+        if len(rows) > limit:
+            next_cursor = encode_cursor(items[-1].created_at, items[-1].id)
+        return UserPage(items=items, next_cursor=next_cursor)
+
+    async def count_users(self, exact: bool = False) -> UserCount:
+        """
+        Count registered users.
+
+        Args:
+            exact: Return the exact count instead of the statistics-based
+                estimate. The estimate is also replaced by the exact count
+                when the table has no statistics yet.
+
+        Returns:
+            UserCount: Number of users and whether it is exact
+        """
+        if not exact:
+            estimate = await self.user_repo.count_estimate()
+            if estimate is not None:
+                return UserCount(count=estimate, exact=False)
+        return UserCount(count=await self.user_repo.count(), exact=True)
+
+    async def search_users(self, query: str, limit: int) -> list[UserResponse]:
+        """
+        Find users whose full name or email contains the query.
+
+        Args:
+            query: Text to search for (case-insensitive)
+            limit: Maximum number of users to return
+
+        Returns:
+            list[UserResponse]: Matching users, best match first
+        """
+        rows = await self.user_repo.search(query.strip(), limit)
+        return [UserResponse.model_validate(row) for row in rows]
+
+    async def export_users(
+        self, export_format: UserFileFormat, batch_size: int = 1000
+    ) -> AsyncIterator[bytes]:
+        """
+        Export every user profile as NDJSON or CSV.
+
+        Output is produced one batch of rows at a time, so memory use does
+        not depend on the number of users.
+
+        Args:
+            export_format: Output format
+            batch_size: Number of rows fetched and encoded per chunk
+
+        Yields:
+            bytes: Encoded chunk of the export
+        """
+        if export_format is UserFileFormat.CSV:
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow(EXPORT_FIELDS)
+            yield buffer.getvalue().encode()
+            async for rows in self.user_repo.stream_profiles(batch_size):
+                buffer.seek(0)
+                buffer.truncate()
+                writer.writerows(
+                    (
+                        row.id,
+                        row.email,
+                        row.full_name,
+                        row.created_at.isoformat(),
+                        row.updated_at.isoformat(),
+                    )
+                    for row in rows
+                )
+                yield buffer.getvalue().encode()
+        else:
+            async for rows in self.user_repo.stream_profiles(batch_size):
+                # default=str covers the driver's own UUID type
+                yield b"".join(
+                    orjson.dumps(
+                        row._asdict(), default=str, option=orjson.OPT_APPEND_NEWLINE
+                    )
+                    for row in rows
+                )
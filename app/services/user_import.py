@@ -0,0 +1,388 @@
+"""
+Bulk user import service.
+"""
+
+import asyncio
+import csv
+import logging
+import os
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Any, AsyncIterator, Protocol, Sequence
+
+import orjson
+from pydantic import ValidationError
+
+from app.core.hashing import get_password_hash
+from app.models.user import normalize_email
+from app.schemas.user import (
+    ImportRowError,
+    UserCreate,
+    UserFileFormat,
+    UserImportResult,
+)
+from app.services.exceptions import ImportRecordTooLargeError
+
+logger = logging.getLogger(__name__)
+
+# Columns an import file must provide
+IMPORT_FIELDS = ("email", "full_name", "password")
+
+# Rejected rows listed individually in the result; the rest are only counted
+MAX_REPORTED_ERRORS = 100
+
+# Longest line (or multi-line CSV record) accepted, far above any real
+# user record; keeps a body without newlines from filling memory
+MAX_RECORD_BYTES = 64 * 1024
+
+# Threads hashing passwords; bounded so an import cannot claim every core
+MAX_HASH_WORKERS = 4
+
+
+@lru_cache(maxsize=1)
+def get_hash_executor() -> ThreadPoolExecutor:
+    """
+    Get the thread pool hashing imported passwords, creating it on first use.
+
+    bcrypt releases the GIL, so the threads hash passwords in parallel.
+
+    Returns:
+        ThreadPoolExecutor: Shared password hashing pool
+    """
+    return ThreadPoolExecutor(
+        max_workers=min(MAX_HASH_WORKERS, os.cpu_count() or 1),
+        thread_name_prefix="import-hash",
+    )
+
+
+class UserImportRepository(Protocol):
+    """Protocol defining required user repository methods."""
+
+    async def copy_import(self, rows: Sequence[tuple[int, str, str, str]]) -> set[str]:
+        """Bulk-insert users, skipping emails that are already registered."""
+        ...
+
+
+async def iter_lines(
+    chunks: AsyncIterator[bytes], max_line_bytes: int = MAX_RECORD_BYTES
+) -> AsyncIterator[bytes]:
+    """
+    Split a stream of byte chunks into lines.
+
+    Args:
+        chunks: Raw upload chunks
+        max_line_bytes: Longest line accepted
+
+    Yields:
+        bytes: Lines without their trailing newline
+
+    Raises:
+        ImportRecordTooLargeError: If a line is longer than ``max_line_bytes``
+    """
+    pending = bytearray()
+    line_number = 0
+    async for chunk in chunks:
+        # Only the new bytes can hold a newline
+        scanned = len(pending)
+        pending += chunk
+        start = 0
+        while (end := pending.find(b"\n", max(start, scanned))) != -1:
+            line_number += 1
+            if end - start > max_line_bytes:
+                raise ImportRecordTooLargeError(line_number, max_line_bytes)
+            yield bytes(pending[start:end]).rstrip(b"\r")
+            start = end + 1
+        del pending[:start]
+        if len(pending) > max_line_bytes:
+            raise ImportRecordTooLargeError(line_number + 1, max_line_bytes)
+    if pending.strip():
+        yield bytes(pending).rstrip(b"\r")
+
+
+class PendingLines:
+    """
+    Lines waiting to be parsed by a ``csv.reader``.
+
+    Unlike a generator, running out of lines does not exhaust it for
+    good, so one reader can parse a whole upload as lines arrive.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty buffer."""
+        self.lines: deque[str] = deque()
+
+    def __iter__(self) -> "PendingLines":
+        """Return the buffer itself; ``csv.reader`` draws lines from it."""
+        return self
+
+    def __next__(self) -> str:
+        """Hand the oldest buffered line to the reader."""
+        if not self.lines:
+            raise StopIteration
+        return self.lines.popleft()
+
+    def append(self, line: str) -> None:
+        """Buffer a line, with the newline ``iter_lines`` stripped."""
+        self.lines.append(line + "\n")
+
+
+async def iter_csv_rows(
+    chunks: AsyncIterator[bytes],
+) -> AsyncIterator[tuple[int, list[str] | None]]:
+    """
+    Parse a CSV upload into ``(line number, values)`` pairs.
+
+    A single ``csv.reader`` parses the whole upload, so quoted fields may
+    span lines. Lines are buffered until their quotes balance, so the
+    reader is only asked for a row once all of its lines have arrived.
+    Blank rows are skipped; rows that cannot be decoded or parsed yield
+    ``None``.
+
+    Args:
+        chunks: Raw upload chunks
+
+    Yields:
+        tuple[int, list[str] | None]: Line the row starts on and its values
+
+    Raises:
+        ImportRecordTooLargeError: If a row spans more than
+            ``MAX_RECORD_BYTES``
+    """
+    pending = PendingLines()
+    reader = csv.reader(pending)
+    quotes = 0
+    record_bytes = 0
+    undecodable = False
+
+    def parse_pending() -> list[tuple[int, list[str] | None]]:
+        """Parse every buffered line into rows."""
+        rows: list[tuple[int, list[str] | None]] = []
+        while pending.lines:
+            line_number = reader.line_num + 1
+            try:
+                values: list[str] | None = next(reader)
+            except csv.Error:
+                values = None
+            if values is None or undecodable:
+                rows.append((line_number, None))
+            elif any(value.strip() for value in values):
+                rows.append((line_number, values))
+        return rows
+
+    async for line in iter_lines(chunks):
+        try:
+            text = line.decode()
+        except UnicodeDecodeError:
+            text = line.decode(errors="replace")
+            undecodable = True
+        pending.append(text)
+        quotes += text.count('"')
+        record_bytes += len(line) + 1
+        if quotes % 2:
+            # An unterminated quote must not buffer the rest of the upload
+            if record_bytes > MAX_RECORD_BYTES:
+                raise ImportRecordTooLargeError(reader.line_num + 1, MAX_RECORD_BYTES)
+            continue
+        for row in parse_pending():
+            yield row
+        quotes = 0
+        record_bytes = 0
+        undecodable = False
+
+    # Whatever is left has an unterminated quote
+    for row in parse_pending():
+        yield row
+
+
+async def iter_records(
+    chunks: AsyncIterator[bytes], import_format: UserFileFormat
+) -> AsyncIterator[tuple[int, dict[str, Any] | None]]:
+    """
+    Parse an upload into ``(line number, record)`` pairs.
+
+    NDJSON uploads hold one record per line. CSV uploads need a header row
+    naming the ``IMPORT_FIELDS`` columns, and may quote fields spanning
+    several lines. Unparseable records yield ``None``.
+
+    Args:
+        chunks: Raw upload chunks
+        import_format: Format of the upload
+
+    Yields:
+        tuple[int, dict[str, Any] | None]: Line number the record starts
+        on and the parsed record
+
+    Raises:
+        ValueError: If a CSV header is missing required columns
+        ImportRecordTooLargeError: If a record exceeds ``MAX_RECORD_BYTES``
+    """
+    if import_format is UserFileFormat.NDJSON:
+        line_number = 0
+        async for line in iter_lines(chunks):
+            line_number += 1
+            if not line.strip():
+                continue
+            try:
+                record = orjson.loads(line)
+            except orjson.JSONDecodeError:
+                yield line_number, None
+                continue
+            yield line_number, record if isinstance(record, dict) else None
+        return
+
+    header: list[str] | None = None
+    async for line_number, values in iter_csv_rows(chunks):
+        if values is None:
+            yield line_number, None
+        elif header is None:
+            header = [value.strip().lower() for value in values]
+            missing = set(IMPORT_FIELDS) - set(header)
+            if missing:
+                raise ValueError(
+                    f"CSV header is missing columns: {', '.join(sorted(missing))}"
+                )
+        else:
+            yield line_number, dict(zip(header, values))
+
+
+class UserImportService:
+    """Service for importing users in bulk."""
+
+    def __init__(self, user_repo: UserImportRepository):
+        """
+        Initialize the import service.
+
+        Args:
+            user_repo: User repository implementation
+        """
+        self.user_repo = user_repo
+
+    async def import_users(
+        self,
+        chunks: AsyncIterator[bytes],
+        import_format: UserFileFormat,
+        batch_size: int = 500,
+    ) -> UserImportResult:
+        """
+        Import users from a streamed CSV or NDJSON upload.
+
+        Rows are validated with ``UserCreate`` in batches of ``batch_size``.
+        Passwords in a batch are hashed in parallel, and the batch is then
+        loaded with a single COPY and merged into ``users``. Rows whose
+        email is already registered, or repeated within the upload (ignoring
+        case), are reported as conflicts. Progress is logged after every batch.
+
+        Args:
+            chunks: Raw upload chunks
+            import_format: Format of the upload
+            batch_size: Number of rows validated and loaded at a time
+
+        Returns:
+            UserImportResult: Counts, throughput and rejected rows
+
+        Raises:
+            ValueError: If a CSV header is missing required columns
+        ImportRecordTooLargeError: If a record exceeds ``MAX_RECORD_BYTES``
+        """
+        result = UserImportResult()
+        started = time.perf_counter()
+        batch: list[tuple[int, UserCreate]] = []
+
+        async for line_number, record in iter_records(chunks, import_format):
+            result.received += 1
+            user_data = self._validate(result, line_number, record)
+            if user_data is not None:
+                batch.append((line_number, user_data))
+            if len(batch) >= batch_size:
+                await self._load_batch(result, batch)
+                batch = []
+                self._log_progress(result, started)
+
+        if batch:
+            await self._load_batch(result, batch)
+
+        # Conflicts are found a batch after the invalid rows that follow them
+        result.errors.sort(key=lambda error: error.line)
+        result.elapsed_seconds = time.perf_counter() - started
+        if result.elapsed_seconds > 0:
+            result.rows_per_second = result.received / result.elapsed_seconds
+        self._log_progress(result, started)
+        return result
+
+    def _validate(
+        self, result: UserImportResult, line_number: int, record: dict[str, Any] | None
+    ) -> UserCreate | None:
+        """Validate one record, recording it as invalid on failure."""
+        if record is None:
+            self._reject(result, line_number, None, "Row could not be parsed")
+            result.invalid += 1
+            return None
+        try:
+            return UserCreate.model_validate(record)
+        except ValidationError as e:
+            error = e.errors()[0]
+            field = ".".join(str(part) for part in error["loc"])
+            email = record.get("email")
+            self._reject(
+                result,
+                line_number,
+                email if isinstance(email, str) else None,
+                f"{field}: {error['msg']}",
+            )
+            result.invalid += 1
+            return None
+
+    async def _load_batch(
+        self, result: UserImportResult, batch: list[tuple[int, UserCreate]]
+    ) -> None:
+        """Hash passwords for a batch in parallel and load it in one COPY."""
+        loop = asyncio.get_running_loop()
+        hashed_passwords = await asyncio.gather(
+            *(
+                loop.run_in_executor(
+                    get_hash_executor(), get_password_hash, row.password
+                )
+                for _, row in batch
+            )
+        )
+        rows = [
+            (line_number, normalize_email(row.email), hashed_password, row.full_name)
+            for (line_number, row), hashed_password in zip(batch, hashed_passwords)
+        ]
+        inserted = await self.user_repo.copy_import(rows)
+
+        # Only the first staged row for each inserted email was written
+        claimed: set[str] = set()
+        for line_number, email, _, _ in rows:
+            if email in inserted and email not in claimed:
+                claimed.add(email)
+                result.inserted += 1
+            else:
+                result.conflicts += 1
+                self._reject(result, line_number, email, "Email is already registered")
+
+    def _reject(
+        self, result: UserImportResult, line_number: int, email: str | None, reason: str
+    ) -> None:
+        """Record a rejected row, keeping at most MAX_REPORTED_ERRORS."""
+        if len(result.errors) < MAX_REPORTED_ERRORS:
+            result.errors.append(
+                ImportRowError(line=line_number, email=email, reason=reason)
+            )
+        else:
+            result.errors_truncated = True
+
+    def _log_progress(self, result: UserImportResult, started: float) -> None:
+        """Log rows processed so far and the current throughput."""
+        elapsed = time.perf_counter() - started
+        logger.info(
+            "User import: %d rows read, %d inserted, %d invalid, %d conflicts "
+            "(%.0f rows/s)",
+            result.received,
+            result.inserted,
+            result.invalid,
+            result.conflicts,
+            result.received / elapsed if elapsed > 0 else 0.0,
+        )
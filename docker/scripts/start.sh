@@ -51,9 +51,9 @@ exec gunicorn app.main:app \
     --worker-class uvicorn.workers.UvicornWorker \
     --workers $MAX_WORKERS \
     --worker-connections 1000 \
-    --forwarded-allow-ips '*' \
     --proxy-allow-from '*' \
     --log-level info \
     --error-logfile - \
     --access-logfile - \
-    --timeout 120 
\ No newline at end of file
+    --timeout 120 \
+    --graceful-timeout 30 
\ No newline at end of file
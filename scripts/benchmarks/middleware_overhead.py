@@ -0,0 +1,168 @@
+"""
+Benchmark the per-request overhead of the middleware stack.
+
+Calls a minimal application directly over ASGI (no HTTP client or server
+in the way) bare, wrapped in the request ID, timing, security header and
+rate limit middleware as they are now, and wrapped in equivalent
+``BaseHTTPMiddleware`` versions, as the stack used to be written. Reports
+the median time per request and the overhead each stack adds.
+
+Usage:
+    python -m scripts.benchmarks.middleware_overhead --requests 20000
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+
+from fastapi import FastAPI, Request, Response
+from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
+from starlette.types import ASGIApp, Message
+
+from app.core.middleware import (
+    RateLimitMiddleware,
+    RequestIDMiddleware,
+    SecurityHeadersMiddleware,
+    TimingMiddleware,
+    security_headers,
+    settings,
+)
+from app.core.rate_limit import TokenBucketLimiter
+
+# Enough tokens that the benchmark never gets rate limited
+RATE_LIMIT = 10**9
+
+
+class BaseRequestIDMiddleware(BaseHTTPMiddleware):
+    async def dispatch(
+        self, request: Request, call_next: RequestResponseEndpoint
+    ) -> Response:
+        request_id = str(uuid.uuid4())
+        request.state.request_id = request_id
+        response = await call_next(request)
+        response.headers["X-Request-ID"] = request_id
+        return response
+
+
+class BaseTimingMiddleware(BaseHTTPMiddleware):
+    async def dispatch(
+        self, request: Request, call_next: RequestResponseEndpoint
+    ) -> Response:
+        start_time = time.perf_counter()
+        response = await call_next(request)
+        response.headers["X-Process-Time"] = str(time.perf_counter() - start_time)
+        return response
+
+
+class BaseSecurityHeadersMiddleware(BaseHTTPMiddleware):
+    async def dispatch(
+        self, request: Request, call_next: RequestResponseEndpoint
+    ) -> Response:
+        response = await call_next(request)
+        response.headers.update(security_headers(settings.DEBUG))
+        return response
+
+
+class BaseRateLimitMiddleware(BaseHTTPMiddleware):
+    def __init__(self, app: ASGIApp) -> None:
+        super().__init__(app)
+        self.backend = TokenBucketLimiter(RATE_LIMIT)
+
+    async def dispatch(
+        self, request: Request, call_next: RequestResponseEndpoint
+    ) -> Response:
+        client_ip = request.client.host if request.client else "unknown"
+        if await self.backend.acquire(client_ip):
+            return await call_next(request)
+        return Response(content="Rate limit exceeded", status_code=429)
+
+
+def build_app(stack: list[tuple[type, dict]]) -> FastAPI:
+    """Application with one trivial endpoint wrapped in ``stack``."""
+    app = FastAPI()
+    for middleware, options in stack:
+        app.add_middleware(middleware, **options)
+
+    @app.get("/ping")
+    async def ping() -> Response:
+        return Response(b"pong", media_type="text/plain")
+
+    return app
+
+
+async def time_requests(app: FastAPI, requests: int) -> list[float]:
+    """Return the time in microseconds of each of ``requests`` calls."""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/ping",
+        "raw_path": b"/ping",
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"bench")],
+        "client": ("127.0.0.1", 5000),
+        "server": ("bench", 80),
+    }
+
+    async def receive() -> Message:
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message: Message) -> None:
+        pass
+
+    latencies = []
+    for _ in range(requests):
+        started = time.perf_counter_ns()
+        # Each request gets its own scope, as a server would create
+        await app(dict(scope), receive, send)
+        latencies.append((time.perf_counter_ns() - started) / 1000)
+    return latencies
+
+
+async def main(requests: int) -> None:
+    """Time every stack and print the per-request overhead."""
+    apps = {
+        "bare": build_app([]),
+        "BaseHTTPMiddleware": build_app(
+            [
+                (BaseRequestIDMiddleware, {}),
+                (BaseTimingMiddleware, {}),
+                (BaseSecurityHeadersMiddleware, {}),
+                (BaseRateLimitMiddleware, {}),
+            ]
+        ),
+        "pure ASGI": build_app(
+            [
+                (RequestIDMiddleware, {}),
+                (TimingMiddleware, {}),
+                (SecurityHeadersMiddleware, {}),
+                (RateLimitMiddleware, {"rate_limit": RATE_LIMIT}),
+            ]
+        ),
+    }
+    # Warm up (route compilation, first-call caches) before measuring
+    for app in apps.values():
+        await time_requests(app, 200)
+    medians = {
+        label: statistics.median(await time_requests(app, requests))
+        for label, app in apps.items()
+    }
+
+    print(f"requests={requests}")
+    for label, median in medians.items():
+        overhead = median - medians["bare"]
+        print(f"{label:<20}p50 {median:7.1f} us  overhead {overhead:7.1f} us")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--requests", type=int, default=20000, help="Requests per stack"
+    )
+    args = parser.parse_args()
+    asyncio.run(main(args.requests))
@@ -0,0 +1,79 @@
+"""
+Benchmark full-entity versus projected profile reads.
+
+Seeds temporary users inside a transaction that is rolled back, then reads
+them repeatedly with ``select(User)`` (ORM hydration into the identity
+map, all columns) and with ``select(*PROFILE_COLUMNS)`` (plain rows,
+profile columns only), and reports the per-row cost of each.
+
+Usage:
+    python -m scripts.benchmarks.profile_reads --rows 5000 --rounds 20
+"""
+
+import argparse
+import asyncio
+import time
+from typing import Any
+
+from sqlalchemy import insert, select
+
+from app.db.base import AsyncSessionLocal, engine
+from app.models.user import User
+from app.repositories.user import PROFILE_COLUMNS
+
+# bcrypt-sized placeholder so the hash column costs what it does in production
+FAKE_HASH = "$2b$12$" + "x" * 53
+
+
+async def time_reads(session: Any, stmt: Any, rounds: int) -> float:
+    """Return the best wall-clock time of ``rounds`` executions of ``stmt``."""
+    best = float("inf")
+    for _ in range(rounds):
+        session.expunge_all()
+        started = time.perf_counter()
+        result = await session.execute(stmt)
+        result.all()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+async def main(rows: int, rounds: int) -> None:
+    """Seed ``rows`` users, time both read paths and print the comparison."""
+    async with AsyncSessionLocal() as session:
+        await session.execute(
+            insert(User),
+            [
+                {
+                    "email": f"bench-{i}@example.com",
+                    "hashed_password": FAKE_HASH,
+                    "full_name": f"Bench User {i}",
+                }
+                for i in range(rows)
+            ],
+        )
+        seeded = User.email.like("bench-%@example.com")
+        entity = await time_reads(session, select(User).where(seeded), rounds)
+        projected = await time_reads(
+            session, select(*PROFILE_COLUMNS).where(seeded), rounds
+        )
+        await session.rollback()
+    await engine.dispose()
+
+    print(f"rows={rows} rounds={rounds} (best of)")
+    report("select(User)", entity, rows)
+    report("select(*PROFILE_COLUMNS)", projected, rows)
+    report("saving", entity - projected, rows)
+    print(f"projection is {(1 - projected / entity) * 100:.0f}% faster per row")
+
+
+def report(label: str, seconds: float, rows: int) -> None:
+    """Print a total and per-row timing line."""
+    print(f"{label:<25}{seconds * 1e3:9.2f} ms {seconds / rows * 1e6:7.2f} us/row")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=5000, help="Users to seed")
+    parser.add_argument("--rounds", type=int, default=20, help="Reads per path")
+    args = parser.parse_args()
+    asyncio.run(main(args.rows, args.rounds))
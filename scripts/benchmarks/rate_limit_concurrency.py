@@ -0,0 +1,95 @@
+"""
+Benchmark request throughput through the rate limiter at rising concurrency.
+
+Drives a minimal application whose endpoint waits on simulated I/O through
+``RateLimitMiddleware`` (with a limit high enough never to reject) using
+1, 10, 50 and 100 requests in flight, and reports requests per second.
+A variant holding a lock across the downstream call, as the limiter used
+to, is measured alongside for comparison: its throughput stays flat
+however many requests are in flight.
+
+Usage:
+    python -m scripts.benchmarks.rate_limit_concurrency --requests 2000 --io-ms 10
+"""
+
+import argparse
+import asyncio
+import time
+
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.middleware import RateLimitMiddleware
+
+CONCURRENCY = (1, 10, 50, 100)
+
+
+class LockedRateLimitMiddleware(RateLimitMiddleware):
+    """Baseline that serializes requests on a lock held across call_next."""
+
+    def __init__(self, app: ASGIApp, rate_limit: int = 60) -> None:
+        super().__init__(app, rate_limit)
+        self.lock = asyncio.Lock()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        async with self.lock:
+            await super().__call__(scope, receive, send)
+
+
+def build_app(middleware: type[RateLimitMiddleware], io_seconds: float) -> FastAPI:
+    """Application with one endpoint that waits ``io_seconds``."""
+    app = FastAPI()
+    app.add_middleware(middleware, rate_limit=10**9)
+
+    @app.get("/io")
+    async def io() -> dict[str, bool]:
+        await asyncio.sleep(io_seconds)
+        return {"ok": True}
+
+    return app
+
+
+async def throughput(app: FastAPI, requests: int, concurrency: int) -> float:
+    """Send ``requests`` requests with ``concurrency`` in flight; return req/s."""
+    remaining = requests
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://bench") as client:
+
+        async def worker() -> None:
+            nonlocal remaining
+            while remaining > 0:
+                remaining -= 1
+                response = await client.get("/io")
+                assert response.status_code == 200
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return requests / (time.perf_counter() - started)
+
+
+async def main(requests: int, io_ms: float) -> None:
+    """Measure both limiters at every concurrency level and print a table."""
+    apps = {
+        "lock-free": build_app(RateLimitMiddleware, io_ms / 1000),
+        "locked": build_app(LockedRateLimitMiddleware, io_ms / 1000),
+    }
+    print(f"requests={requests} io={io_ms} ms")
+    print(f"{'in flight':>10}" + "".join(f"{label:>12}" for label in apps))
+    for concurrency in CONCURRENCY:
+        # The locked baseline needs io_ms per request; keep its runs short
+        rates = []
+        for label, app in apps.items():
+            runs = min(requests, 200) if label == "locked" else requests
+            rates.append(await throughput(app, runs, concurrency))
+        print(f"{concurrency:>10}" + "".join(f"{rate:>10.0f}/s" for rate in rates))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=2000, help="Requests per run")
+    parser.add_argument(
+        "--io-ms", type=float, default=10.0, help="Simulated I/O per request"
+    )
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.io_ms))
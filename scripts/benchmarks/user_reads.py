@@ -0,0 +1,92 @@
+"""
+Benchmark single-user reads: SQLAlchemy ORM versus raw asyncpg.
+
+Seeds temporary users inside a transaction that is rolled back, then looks
+each of them up by ID and by email through ``SQLAlchemyUserRepository``
+and ``AsyncpgUserRepository`` on the same connection, and reports the
+median and 99th percentile latency of every read path.
+
+Usage:
+    python -m scripts.benchmarks.user_reads --users 1000 --rounds 5
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from typing import Any, Awaitable, Callable
+
+from sqlalchemy import insert, select
+
+from app.db.base import AsyncSessionLocal, engine
+from app.models.user import User
+from app.repositories.user import AsyncpgUserRepository, SQLAlchemyUserRepository
+
+# bcrypt-sized placeholder so the hash column costs what it does in production
+FAKE_HASH = "$2b$12$" + "x" * 53
+
+
+async def time_lookups(
+    session: Any, lookup: Callable[[Any], Awaitable[Any]], keys: list[Any]
+) -> list[float]:
+    """Return the latency in microseconds of ``lookup`` for every key."""
+    latencies = []
+    for key in keys:
+        session.expunge_all()
+        started = time.perf_counter_ns()
+        assert await lookup(key) is not None
+        latencies.append((time.perf_counter_ns() - started) / 1000)
+    return latencies
+
+
+async def main(users: int, rounds: int) -> None:
+    """Seed ``users`` users, time every read path and print the comparison."""
+    async with AsyncSessionLocal() as session:
+        await session.execute(
+            insert(User),
+            [
+                {
+                    "email": f"bench-{i}@example.com",
+                    "hashed_password": FAKE_HASH,
+                    "full_name": f"Bench User {i}",
+                }
+                for i in range(users)
+            ],
+        )
+        seeded = await session.execute(
+            select(User.id, User.email).where(User.email.like("bench-%@example.com"))
+        )
+        ids, emails = map(list, zip(*seeded.all()))
+        reference = SQLAlchemyUserRepository(session)
+        fast = AsyncpgUserRepository(session)
+        paths = {
+            "sqlalchemy get_by_id": (reference.get_by_id, ids),
+            "asyncpg get_by_id": (fast.get_by_id, ids),
+            "sqlalchemy get_by_email": (reference.get_by_email, emails),
+            "asyncpg get_by_email": (fast.get_by_email, emails),
+        }
+        # Warm up connection-level statement caches before measuring
+        for lookup, keys in paths.values():
+            await time_lookups(session, lookup, keys[:10])
+        results: dict[str, list[float]] = {label: [] for label in paths}
+        for _ in range(rounds):
+            for label, (lookup, keys) in paths.items():
+                results[label] += await time_lookups(session, lookup, keys)
+        await session.rollback()
+    await engine.dispose()
+
+    print(f"users={users} rounds={rounds}")
+    for label, latencies in results.items():
+        p99 = statistics.quantiles(latencies, n=100)[98]
+        print(
+            f"{label:<25}p50 {statistics.median(latencies):7.1f} us"
+            f"  p99 {p99:7.1f} us"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--users", type=int, default=1000, help="Users to seed")
+    parser.add_argument("--rounds", type=int, default=5, help="Lookups per user")
+    args = parser.parse_args()
+    asyncio.run(main(args.users, args.rounds))
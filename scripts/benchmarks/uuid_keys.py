@@ -0,0 +1,77 @@
+"""
+Benchmark insert throughput and primary key index size for UUID versions.
+
+Inserts the same number of rows into two scratch tables whose uuid
+primary keys default to ``gen_random_uuid()`` (v4) and
+``uuid_generate_v7()`` (v7), batch by batch as a bulk registration would,
+then reports rows per second and the size of each primary key index.
+The tables are regular (WAL-logged) tables so page splits cost what they
+do in production; they are dropped afterwards. Requires the
+``uuid_generate_v7()`` function from the migrations.
+
+Usage:
+    python -m scripts.benchmarks.uuid_keys --rows 1000000 --batch 1000
+"""
+
+import argparse
+import asyncio
+import time
+
+from sqlalchemy import text
+
+from app.db.base import engine
+
+GENERATORS = {"uuid4": "gen_random_uuid()", "uuid7": "uuid_generate_v7()"}
+
+
+async def run(kind: str, rows: int, batch: int) -> tuple[float, int]:
+    """Insert ``rows`` rows in batches; return seconds taken and index bytes."""
+    table = f"bench_keys_{kind}"
+    async with engine.connect() as connection:
+        await connection.execute(text(f"DROP TABLE IF EXISTS {table}"))
+        await connection.execute(
+            text(
+                f"CREATE TABLE {table} ("
+                f" id uuid PRIMARY KEY DEFAULT {GENERATORS[kind]},"
+                " full_name varchar(255) NOT NULL)"
+            )
+        )
+        await connection.commit()
+        insert = text(
+            f"INSERT INTO {table} (full_name)"
+            " SELECT 'Bench User ' || g FROM generate_series(1, :batch) g"
+        )
+        started = time.perf_counter()
+        for _ in range(rows // batch):
+            await connection.execute(insert, {"batch": batch})
+            await connection.commit()
+        elapsed = time.perf_counter() - started
+        index_bytes = await connection.scalar(
+            text(
+                "SELECT pg_relation_size(indexrelid) FROM pg_index"
+                f" WHERE indrelid = '{table}'::regclass AND indisprimary"
+            )
+        )
+        await connection.execute(text(f"DROP TABLE {table}"))
+        await connection.commit()
+    return elapsed, int(index_bytes or 0)
+
+
+async def main(rows: int, batch: int) -> None:
+    """Benchmark every generator and print the comparison."""
+    print(f"rows={rows} batch={batch}")
+    for kind in GENERATORS:
+        elapsed, index_bytes = await run(kind, rows, batch)
+        print(
+            f"{kind}: {rows / elapsed:10.0f} rows/s"
+            f"  pkey {index_bytes / 2**20:7.1f} MiB"
+        )
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Rows to insert")
+    parser.add_argument("--batch", type=int, default=1000, help="Rows per INSERT")
+    args = parser.parse_args()
+    asyncio.run(main(args.rows, args.batch))
@@ -2,15 +2,20 @@
 Unit tests for health check endpoints.
 """
 
+from datetime import datetime
 from typing import Any, Generator
+from uuid import uuid4
 import pytest
 from unittest.mock import AsyncMock, patch
 from fastapi import status
 from httpx import AsyncClient
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core import metrics, security
 from app.core.config import get_settings
+from app.core.security import get_current_user
 from app.schemas.health import HealthStatus, ServiceStatus, SystemMetrics
+from app.schemas.user import UserResponse
 from app.main import app
 from app.db.base import get_db
 
@@ -63,6 +68,82 @@ async def test_health_check_healthy(
             assert data["checks"]["database"]["status"] == ServiceStatus.PASS
 
 
+@pytest.fixture
+def admin(monkeypatch: pytest.MonkeyPatch) -> Generator[UserResponse, None, None]:
+    """Authenticate requests as a configured administrator."""
+    now = datetime.utcnow()
+    user = UserResponse(
+        id=uuid4(),
+        email="admin@hccc.edu",
+        full_name="Admin",
+        created_at=now,
+        updated_at=now,
+    )
+    monkeypatch.setattr(security.settings, "ADMIN_USER_IDS", [user.id])
+    app.dependency_overrides[get_current_user] = lambda: user
+    yield user
+    app.dependency_overrides.clear()
+
+
+@pytest.mark.asyncio
+async def test_health_check_hides_app_metrics(
+    mock_db: AsyncSession, override_get_db: Any
+) -> None:
+    """Test the public health check does not expose application metrics."""
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        with patch(
+            "app.services.health.HealthService.get_system_metrics",
+            return_value=SystemMetrics(
+                cpu_usage=50.0, memory_usage=60.0, disk_usage=70.0
+            ),
+        ):
+            response = await client.get(f"{settings.API_PREFIX}/v1/health")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert "app_metrics" not in response.json()
+
+
+@pytest.mark.asyncio
+async def test_app_metrics_require_admin(admin: UserResponse) -> None:
+    """Test ordinary users cannot read application metrics."""
+    student = admin.model_copy(update={"id": uuid4()})
+    app.dependency_overrides[get_current_user] = lambda: student
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        response = await client.get(f"{settings.API_PREFIX}/v1/health/metrics")
+
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+@pytest.mark.asyncio
+async def test_app_metrics_report_counters(admin: UserResponse) -> None:
+    """Test administrators get the worker's application counters."""
+    metrics.increment("deadline_exceeded")
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        response = await client.get(f"{settings.API_PREFIX}/v1/health/metrics")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert (
+        response.json()["metrics"]["deadline_exceeded"]
+        == metrics.counters["deadline_exceeded"]
+    )
+
+
+@pytest.mark.asyncio
+async def test_app_metrics_report_rate_limit_gauges(admin: UserResponse) -> None:
+    """Test the rate limiter's bucket count and memory are reported."""
+    # Rebuild the middleware so it registers its gauges again, replacing
+    # any registered by limiters in other tests
+    app.middleware_stack = None
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        # The health check itself costs no tokens; this request does
+        await client.get(f"{settings.API_PREFIX}/v1/users/me")
+        response = await client.get(f"{settings.API_PREFIX}/v1/health/metrics")
+
+    app_metrics = response.json()["metrics"]
+    assert app_metrics["rate_limit_clients"] >= 1
+    assert app_metrics["rate_limit_memory_bytes"] > 0
+
+
 @pytest.mark.asyncio
 async def test_health_check_degraded(
     mock_db: AsyncSession, override_get_db: Any
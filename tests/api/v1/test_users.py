@@ -0,0 +1,176 @@
+"""
+Unit tests for user endpoints.
+"""
+
+from datetime import datetime
+from typing import Any, Generator
+from unittest.mock import AsyncMock, patch
+from uuid import UUID, uuid4
+
+import pytest
+from fastapi import status
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core import security
+from app.core.security import get_current_user
+from app.db.base import get_db
+from app.main import app
+from app.schemas.user import UserLookupResult, UserPage, UserResponse
+from app.services.user_import import MAX_RECORD_BYTES
+
+ADMIN_ID = uuid4()
+
+
+def make_user(email: str, user_id: UUID | None = None) -> UserResponse:
+    """Build an authenticated user with the given email."""
+    now = datetime.utcnow()
+    return UserResponse(
+        id=user_id or uuid4(),
+        email=email,
+        full_name="Test User",
+        created_at=now,
+        updated_at=now,
+    )
+
+
+@pytest.fixture
+def override_dependencies(
+    mock_db: AsyncSession, monkeypatch: pytest.MonkeyPatch
+) -> Generator[None, None, None]:
+    """Override the database and make ADMIN_ID an administrator."""
+    monkeypatch.setattr(security.settings, "ADMIN_USER_IDS", [ADMIN_ID])
+    app.dependency_overrides[get_db] = lambda: mock_db
+    yield
+    app.dependency_overrides.clear()
+
+
+class TestListUsers:
+    """Test cases for GET /api/v1/users."""
+
+    @pytest.mark.asyncio
+    async def test_requires_admin(self, override_dependencies: Any) -> None:
+        """Test ordinary users cannot list other users."""
+        app.dependency_overrides[get_current_user] = lambda: make_user(
+            "student@hccc.edu"
+        )
+
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="https://test") as client:
+            response = await client.get("/api/v1/users")
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    @pytest.mark.asyncio
+    async def test_admin_gets_page(self, override_dependencies: Any) -> None:
+        """Test administrators get a page of users."""
+        admin = make_user("admin@hccc.edu", ADMIN_ID)
+        app.dependency_overrides[get_current_user] = lambda: admin
+
+        page = UserPage(items=[admin], next_cursor=None)
+        transport = ASGITransport(app=app)
+        with patch(
+            "app.api.v1.users.UserService.list_users", AsyncMock(return_value=page)
+        ):
+            async with AsyncClient(
+                transport=transport, base_url="https://test"
+            ) as client:
+                response = await client.get("/api/v1/users")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["items"][0]["email"] == "admin@hccc.edu"
+
+    @pytest.mark.asyncio
+    async def test_admin_email_does_not_grant_admin(
+        self, override_dependencies: Any
+    ) -> None:
+        """Test taking an administrator's email address grants nothing."""
+        student = make_user("student@hccc.edu")
+        current = {"user": student}
+        app.dependency_overrides[get_current_user] = lambda: current["user"]
+
+        async def update_user(
+            service: Any, user_id: UUID, user_data: Any
+        ) -> UserResponse:
+            current["user"] = student.model_copy(update={"email": user_data.email})
+            return current["user"]
+
+        transport = ASGITransport(app=app)
+        with patch("app.api.v1.users.UserService.update_user", update_user):
+            async with AsyncClient(
+                transport=transport, base_url="https://test"
+            ) as client:
+                renamed = await client.patch(
+                    "/api/v1/users/me", json={"email": "admin@hccc.edu"}
+                )
+                response = await client.get("/api/v1/users")
+
+        assert renamed.status_code == status.HTTP_200_OK
+        assert current["user"].email == "admin@hccc.edu"
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+class TestLookupUsers:
+    """Test cases for POST /api/v1/users/lookup."""
+
+    @pytest.mark.asyncio
+    async def test_requires_admin(self, override_dependencies: Any) -> None:
+        """Test ordinary users cannot resolve other users' emails."""
+        app.dependency_overrides[get_current_user] = lambda: make_user(
+            "student@hccc.edu"
+        )
+
+        transport = ASGITransport(app=app)
+        with patch("app.api.v1.users.UserService.lookup_users", AsyncMock()) as lookup:
+            async with AsyncClient(
+                transport=transport, base_url="https://test"
+            ) as client:
+                response = await client.post(
+                    "/api/v1/users/lookup", json={"emails": ["admin@hccc.edu"]}
+                )
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+        lookup.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_admin_resolves_users(self, override_dependencies: Any) -> None:
+        """Test administrators get the users found and the keys not found."""
+        admin = make_user("admin@hccc.edu", ADMIN_ID)
+        app.dependency_overrides[get_current_user] = lambda: admin
+
+        result = UserLookupResult(items=[admin], not_found=["gone@hccc.edu"])
+        transport = ASGITransport(app=app)
+        with patch(
+            "app.api.v1.users.UserService.lookup_users", AsyncMock(return_value=result)
+        ):
+            async with AsyncClient(
+                transport=transport, base_url="https://test"
+            ) as client:
+                response = await client.post(
+                    "/api/v1/users/lookup",
+                    json={"emails": ["admin@hccc.edu", "gone@hccc.edu"]},
+                )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["not_found"] == ["gone@hccc.edu"]
+
+
+class TestImportUsers:
+    """Test cases for POST /api/v1/users/import."""
+
+    @pytest.mark.asyncio
+    async def test_oversized_record(self, override_dependencies: Any) -> None:
+        """Test a record over the size limit is answered with a 413."""
+        admin = make_user("admin@hccc.edu", ADMIN_ID)
+        app.dependency_overrides[get_current_user] = lambda: admin
+
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="https://test") as client:
+            response = await client.post(
+                "/api/v1/users/import",
+                content=b"x" * (MAX_RECORD_BYTES + 1),
+                headers={"Content-Type": "application/x-ndjson"},
+            )
+
+        assert response.status_code == status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+        assert "line 1" in response.json()["detail"]
@@ -5,12 +5,16 @@ Tests for the configuration management module.
 import os
 from typing import Any
 from unittest.mock import patch
+from uuid import UUID
 
 import pytest
 from pydantic import SecretStr, ValidationError
 
 from app.core.config import Settings, get_settings
 
+ADMIN_ID = "0192a4e2-7c1b-7d3e-9f4a-2b6c8d0e1f23"
+OTHER_ADMIN_ID = "0192a4e2-8a5d-7f01-b2c3-d4e5f6a7b8c9"
+
 
 @pytest.fixture
 def test_settings() -> Settings:
@@ -187,3 +191,68 @@ class TestSettingsConfiguration:
         with pytest.raises(ValidationError) as exc_info:
             Settings(RATE_LIMIT_PER_MINUTE=0)
         assert "Input should be greater than or equal to 1" in str(exc_info.value)
+
+    def test_rate_limit_policies_from_env(self) -> None:
+        """Test rate limit policies are read as JSON and methods upper-cased."""
+        env = {
+            "RATE_LIMIT_POLICIES": '[{"path": "/api/v1/auth/login", '
+            '"methods": ["post"], "cost": 5}]'
+        }
+        with patch.dict(os.environ, env, clear=True):
+            settings = Settings()
+
+        assert len(settings.RATE_LIMIT_POLICIES) == 1
+        assert settings.RATE_LIMIT_POLICIES[0].methods == ["POST"]
+        assert settings.RATE_LIMIT_POLICIES[0].cost == 5
+
+    def test_rate_limit_policy_validation(self) -> None:
+        """Test policies need an absolute path and a non-negative cost."""
+        with pytest.raises(ValidationError):
+            Settings(RATE_LIMIT_POLICIES=[{"path": "api", "cost": 1}])
+        with pytest.raises(ValidationError):
+            Settings(RATE_LIMIT_POLICIES=[{"path": "/api", "cost": -1}])
+
+    def test_trusted_proxies(self) -> None:
+        """Test trusted proxies are parsed into networks and validated."""
+        settings = Settings(TRUSTED_PROXIES="172.16.0.0/12, 127.0.0.1")
+        assert settings.TRUSTED_PROXIES == ["172.16.0.0/12", "127.0.0.1/32"]
+
+        with pytest.raises(ValidationError):
+            Settings(TRUSTED_PROXIES="traefik")
+
+    def test_server_timing_sample_rate(self) -> None:
+        """Test Server-Timing is always on in debug and off in production."""
+        assert Settings(DEBUG=True).SERVER_TIMING_SAMPLE_RATE == 1.0
+        assert Settings(DEBUG=False).SERVER_TIMING_SAMPLE_RATE == 0.0
+        assert (
+            Settings(
+                DEBUG=False, SERVER_TIMING_SAMPLE_RATE=0.1
+            ).SERVER_TIMING_SAMPLE_RATE
+            == 0.1
+        )
+
+        with pytest.raises(ValidationError):
+            Settings(SERVER_TIMING_SAMPLE_RATE=2)
+
+    @pytest.mark.parametrize(
+        "user_ids,expected",
+        [
+            (
+                f"{ADMIN_ID}, {OTHER_ADMIN_ID}",
+                [UUID(ADMIN_ID), UUID(OTHER_ADMIN_ID)],
+            ),
+            ([ADMIN_ID], [UUID(ADMIN_ID)]),
+            ("", []),
+        ],
+    )
+    def test_admin_user_ids(
+        self, user_ids: str | list[str], expected: list[UUID]
+    ) -> None:
+        """Test admin user IDs are split and parsed."""
+        settings = Settings(ADMIN_USER_IDS=user_ids)
+        assert settings.ADMIN_USER_IDS == expected
+
+    def test_admin_user_ids_rejects_emails(self) -> None:
+        """Test admins cannot be named by email."""
+        with pytest.raises(ValidationError):
+            Settings(ADMIN_USER_IDS="registrar@hccc.edu")
@@ -0,0 +1,195 @@
+"""
+Tests for per-request deadlines.
+"""
+
+import asyncio
+import time
+from unittest.mock import MagicMock
+
+import pytest
+from fastapi import Depends, FastAPI, Request, status
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy.exc import DBAPIError
+
+from app.core import metrics
+from app.core.deadline import DeadlineExceededError, request_deadline
+from app.core.middleware import DeadlineMiddleware
+from app.db.base import apply_statement_timeout, reset_statement_timeout
+
+
+class QueryCanceled(Exception):
+    """Stand-in for the driver error raised on statement_timeout."""
+
+    sqlstate = "57014"
+
+
+@pytest.fixture
+def deadline_app() -> FastAPI:
+    """Minimal application wired with the deadline middleware."""
+    app = FastAPI()
+    app.add_middleware(DeadlineMiddleware, timeout=1.0)
+
+    @app.get("/remaining")
+    async def remaining(request: Request) -> dict[str, float]:
+        return {"remaining": request.state.deadline - time.monotonic()}
+
+    @app.get("/slow", dependencies=[Depends(request_deadline(0.01))])
+    async def slow() -> None:
+        await asyncio.sleep(1.0)
+
+    @app.get("/extended", dependencies=[Depends(request_deadline(5.0))])
+    async def extended(request: Request) -> dict[str, float]:
+        return {"remaining": request.state.deadline - time.monotonic()}
+
+    @app.get("/upstream-timeout")
+    async def upstream_timeout() -> None:
+        raise TimeoutError("upstream service timed out")
+
+    @app.get("/no-budget")
+    async def no_budget() -> None:
+        raise DeadlineExceededError()
+
+    @app.get("/canceled")
+    async def canceled() -> None:
+        raise DBAPIError("SELECT pg_sleep(60)", {}, QueryCanceled())
+
+    return app
+
+
+class TestDeadlineMiddleware:
+    """Test cases for DeadlineMiddleware."""
+
+    @pytest.mark.asyncio
+    async def test_default_deadline_on_request_state(
+        self, deadline_app: FastAPI
+    ) -> None:
+        """Test the global deadline is available on request state."""
+        transport = ASGITransport(app=deadline_app)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.get("/remaining")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert 0 < response.json()["remaining"] <= 1.0
+
+    @pytest.mark.asyncio
+    async def test_route_deadline_overrun(self, deadline_app: FastAPI) -> None:
+        """Test a route exceeding its deadline is cancelled with a 504."""
+        before = metrics.counters["deadline_exceeded"]
+        transport = ASGITransport(app=deadline_app)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.get("/slow")
+
+        assert response.status_code == status.HTTP_504_GATEWAY_TIMEOUT
+        assert response.json() == {"detail": "Request deadline exceeded"}
+        assert metrics.counters["deadline_exceeded"] == before + 1
+
+    @pytest.mark.asyncio
+    async def test_route_deadline_extension(self, deadline_app: FastAPI) -> None:
+        """Test a route can extend the deadline beyond the global default."""
+        transport = ASGITransport(app=deadline_app)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.get("/extended")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["remaining"] > 1.0
+
+    @pytest.mark.asyncio
+    async def test_statement_timeout_maps_to_504(self, deadline_app: FastAPI) -> None:
+        """Test a query cancelled by statement_timeout is answered with a 504."""
+        transport = ASGITransport(app=deadline_app)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.get("/canceled")
+
+        assert response.status_code == status.HTTP_504_GATEWAY_TIMEOUT
+
+    @pytest.mark.asyncio
+    async def test_other_timeouts_are_errors(self, deadline_app: FastAPI) -> None:
+        """Test a handler's own TimeoutError is not reported as a deadline."""
+        before = metrics.counters["deadline_exceeded"]
+        transport = ASGITransport(app=deadline_app, raise_app_exceptions=False)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.get("/upstream-timeout")
+
+        assert response.status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
+        assert metrics.counters["deadline_exceeded"] == before
+
+    @pytest.mark.asyncio
+    async def test_exhausted_budget_maps_to_504(self, deadline_app: FastAPI) -> None:
+        """Test DeadlineExceededError from the app is answered with a 504."""
+        transport = ASGITransport(app=deadline_app)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.get("/no-budget")
+
+        assert response.status_code == status.HTTP_504_GATEWAY_TIMEOUT
+
+
+class TestStatementTimeout:
+    """Test cases for applying the deadline to database statements."""
+
+    def test_no_deadline(self) -> None:
+        """Test sessions without a deadline issue no extra statement."""
+        state = MagicMock()
+        state.session.info = {}
+
+        apply_statement_timeout(state)
+
+        state.session.connection.assert_not_called()
+
+    def test_remaining_budget_applied(self) -> None:
+        """Test the remaining budget is set as the statement timeout."""
+        state = MagicMock()
+        state.session.info = {"deadline": time.monotonic() + 2.0}
+
+        apply_statement_timeout(state)
+
+        params = state.session.connection.return_value.execute.call_args.args[1]
+        assert 1000 < int(params["timeout"]) <= 2000
+
+    def test_request_id_tags_transaction(self) -> None:
+        """Test the request ID is set as application_name in the same statement."""
+        state = MagicMock()
+        state.session.info = {
+            "deadline": time.monotonic() + 2.0,
+            "request_id": "01JAB3X5R0ABCDEFGH12345678",
+        }
+
+        apply_statement_timeout(state)
+
+        execute = state.session.connection.return_value.execute
+        assert execute.call_count == 1
+        params = execute.call_args.args[1]
+        assert params["request_id"] == "01JAB3X5R0ABCDEFGH12345678"
+
+    def test_once_per_transaction(self) -> None:
+        """Test later statements of a transaction reuse its timeout."""
+        state = MagicMock()
+        state.session.info = {"deadline": time.monotonic() + 2.0}
+        execute = state.session.connection.return_value.execute
+
+        apply_statement_timeout(state)
+        apply_statement_timeout(state)
+        assert execute.call_count == 1
+
+        reset_statement_timeout(state.session, MagicMock(), MagicMock())
+        apply_statement_timeout(state)
+        assert execute.call_count == 2
+
+    def test_setup_reported_apart_from_queries(self) -> None:
+        """Test the timeout statement is timed as db_setup, not db."""
+        state = MagicMock()
+        state.session.info = {"deadline": time.monotonic() + 2.0}
+
+        apply_statement_timeout(state)
+
+        execute = state.session.connection.return_value.execute
+        assert execute.call_args.kwargs["execution_options"] == {
+            "timing_phase": "db_setup"
+        }
+
+    def test_expired_deadline(self) -> None:
+        """Test statements are refused once the deadline has passed."""
+        state = MagicMock()
+        state.session.info = {"deadline": time.monotonic() - 1.0}
+
+        with pytest.raises(DeadlineExceededError):
+            apply_statement_timeout(state)
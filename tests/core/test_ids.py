@@ -0,0 +1,83 @@
+"""
+Tests for time-ordered identifier generation.
+"""
+
+import time
+
+from app.core.ids import CROCKFORD_BASE32, RequestIDGenerator, uuid7
+
+
+class TestUuid7:
+    """Test cases for UUIDv7 generation."""
+
+    def test_version_and_variant(self) -> None:
+        """Identifiers are RFC 9562 version 7 UUIDs."""
+        value = uuid7()
+
+        # Verify behavior
+        assert value.version == 7
+        assert value.variant == "specified in RFC 4122"
+
+    def test_embeds_creation_time(self) -> None:
+        """The top 48 bits hold the current Unix time in milliseconds."""
+        before = time.time_ns() // 1_000_000
+        value = uuid7()
+        after = time.time_ns() // 1_000_000
+
+        # Verify behavior
+        assert before <= value.int >> 80 <= after
+
+    def test_sorts_by_creation_time(self) -> None:
+        """Identifiers generated in sequence sort in generation order."""
+        values = []
+        for _ in range(3):
+            values.append(uuid7())
+            time.sleep(0.002)
+
+        # Verify behavior
+        assert values == sorted(values)
+        assert len(set(values)) == len(values)
+
+
+class TestRequestIDGenerator:
+    """Test cases for ULID-style request IDs."""
+
+    def test_format(self) -> None:
+        """IDs are 26 Crockford base32 characters."""
+        request_id = RequestIDGenerator()()
+
+        # Verify behavior
+        assert len(request_id) == 26
+        assert set(request_id) <= set(CROCKFORD_BASE32)
+
+    def test_embeds_creation_time(self) -> None:
+        """The first 10 characters hold the Unix time in milliseconds."""
+        before = time.time_ns() // 1_000_000
+        request_id = RequestIDGenerator()()
+        after = time.time_ns() // 1_000_000
+
+        milliseconds = 0
+        for char in request_id[:10]:
+            milliseconds = milliseconds * 32 + CROCKFORD_BASE32.index(char)
+
+        # Verify behavior
+        assert before <= milliseconds <= after
+
+    def test_strictly_increasing(self) -> None:
+        """IDs from one generator are unique and sort in creation order."""
+        generator = RequestIDGenerator()
+        request_ids = [generator() for _ in range(10_000)]
+
+        # Verify behavior
+        assert request_ids == sorted(request_ids)
+        assert len(set(request_ids)) == len(request_ids)
+
+    def test_reseed_changes_prefix(self) -> None:
+        """Forked workers do not continue their parent's sequence."""
+        generator = RequestIDGenerator()
+        before = generator()
+        generator.reseed()
+        after = generator()
+
+        # Verify behavior
+        assert before[10:18] != after[10:18]
@@ -0,0 +1,78 @@
+"""
+Tests for application lifespan and graceful shutdown.
+"""
+
+from pathlib import Path
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from fastapi import FastAPI
+
+from app.core.lifespan import ShutdownHooks, lifespan
+from app.core.rate_limit import SharedMemoryRateLimitBackend
+from app.main import create_application
+
+
+class TestShutdownHooks:
+    """Test cases for ShutdownHooks."""
+
+    @pytest.mark.asyncio
+    async def test_hook_failure_is_isolated(self) -> None:
+        """Test a failing hook does not prevent the others from running."""
+        hooks = ShutdownHooks()
+        failing = AsyncMock(side_effect=RuntimeError("boom"))
+        succeeding = AsyncMock()
+        hooks.add(failing)
+        hooks.add(succeeding)
+
+        await hooks.run()
+
+        failing.assert_awaited_once()
+        succeeding.assert_awaited_once()
+
+
+class TestLifespan:
+    """Test cases for the lifespan handler."""
+
+    @pytest.mark.asyncio
+    async def test_shutdown_runs_hooks_and_disposes_engine(self) -> None:
+        """Test shutdown runs the hooks, then disposes the engine."""
+        app = FastAPI()
+        app.state.shutdown_hooks = ShutdownHooks()
+        hook = AsyncMock()
+        app.state.shutdown_hooks.add(hook)
+
+        with patch("app.core.lifespan.engine") as mock_engine:
+            mock_engine.dispose = AsyncMock()
+            async with lifespan(app):
+                hook.assert_not_awaited()
+
+            hook.assert_awaited_once()
+            mock_engine.dispose.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_rate_limit_backend_closed_at_shutdown(
+        self, monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+    ) -> None:
+        """Test the application registers its rate limit backend for shutdown."""
+        monkeypatch.setattr(
+            "app.core.middleware.settings.RATE_LIMIT_BACKEND", "shared_memory"
+        )
+        monkeypatch.setattr(
+            "app.core.middleware.settings.RATE_LIMIT_SHARED_MEMORY_PATH",
+            f"{tmp_path}/buckets",
+        )
+        app = create_application()
+        backend = next(
+            middleware.kwargs["backend"]
+            for middleware in app.user_middleware
+            if "backend" in middleware.kwargs
+        )
+        assert isinstance(backend, SharedMemoryRateLimitBackend)
+
+        with patch("app.core.lifespan.engine") as mock_engine:
+            mock_engine.dispose = AsyncMock()
+            async with lifespan(app):
+                pass
+
+        assert backend.table.closed
@@ -0,0 +1,283 @@
+"""
+Tests for the header-injecting ASGI middleware.
+"""
+
+from typing import AsyncIterator
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
+from httpx import ASGITransport, AsyncClient
+
+from app.core import middleware
+from app.core.logging import request_id_context
+from app.core.middleware import (
+    DOCS_CSP,
+    PRODUCTION_CSP,
+    HTTPSRedirectMiddleware,
+    RequestIDMiddleware,
+    SecurityHeadersMiddleware,
+    TimingMiddleware,
+    docs_header_overrides,
+)
+from app.core.proxy import ProxyHeadersMiddleware
+from app.core.timing import timed, timings_context
+from app.main import create_application
+
+
+@pytest.fixture
+def header_app(monkeypatch: pytest.MonkeyPatch) -> FastAPI:
+    """Application wrapped in the header middleware, as setup_middleware does."""
+    monkeypatch.setattr(middleware.settings, "DEBUG", True)
+    app = FastAPI()
+    app.add_middleware(RequestIDMiddleware)
+    app.add_middleware(TimingMiddleware)
+    app.add_middleware(SecurityHeadersMiddleware)
+
+    @app.get("/state")
+    async def state(request: Request) -> dict[str, str]:
+        return {
+            "request_id": request.state.request_id,
+            "logged_as": request_id_context.get(),
+        }
+
+    @app.get("/stream")
+    async def stream() -> StreamingResponse:
+        async def chunks() -> AsyncIterator[bytes]:
+            for chunk in (b"a", b"b", b"c"):
+                yield chunk
+
+        return StreamingResponse(chunks(), headers={"X-Frame-Options": "ALLOW"})
+
+    return app
+
+
+class TestHeaderMiddleware:
+    """Test cases for RequestID, Timing and SecurityHeaders middleware."""
+
+    @pytest.mark.asyncio
+    async def test_request_id_matches_state(self, header_app: FastAPI) -> None:
+        """Test the response header carries the ID routes see on state."""
+        transport = ASGITransport(app=header_app)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.get("/state")
+
+        assert response.headers["X-Request-ID"] == response.json()["request_id"]
+        assert float(response.headers["X-Process-Time"]) >= 0
+
+    @pytest.mark.asyncio
+    async def test_request_id_in_logging_context(self, header_app: FastAPI) -> None:
+        """Test log records made during the request carry its ID."""
+        transport = ASGITransport(app=header_app)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            body = (await client.get("/state")).json()
+
+        assert body["logged_as"] == body["request_id"]
+        assert request_id_context.get() == "-"
+
+    @pytest.mark.asyncio
+    async def test_inbound_request_id_kept(self, header_app: FastAPI) -> None:
+        """Test an ID set by the proxy follows the request."""
+        transport = ASGITransport(app=header_app)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.get(
+                "/state",
+                headers={"X-Request-ID": "c0ffee00-1234-4abc-8def-0123456789ab"},
+            )
+
+        assert response.json()["request_id"] == "c0ffee00-1234-4abc-8def-0123456789ab"
+        assert response.headers.get_list("X-Request-ID") == [
+            "c0ffee00-1234-4abc-8def-0123456789ab"
+        ]
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "inbound", ["", "a b", "x" * 64, "id\nInjected: 1", "<script>"]
+    )
+    async def test_invalid_inbound_request_id_replaced(
+        self, header_app: FastAPI, inbound: str
+    ) -> None:
+        """Test implausible IDs are replaced by a generated one."""
+        transport = ASGITransport(app=header_app)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.get("/state", headers={"X-Request-ID": inbound})
+
+        request_id = response.json()["request_id"]
+        assert request_id != inbound
+        assert len(request_id) == 26
+
+    @pytest.mark.asyncio
+    async def test_streamed_response_gets_headers(self, header_app: FastAPI) -> None:
+        """Test headers are added without buffering a streamed body."""
+        transport = ASGITransport(app=header_app)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.get("/stream")
+
+        assert response.content == b"abc"
+        assert "X-Request-ID" in response.headers
+        assert response.headers["X-Content-Type-Options"] == "nosniff"
+        # Security headers override whatever the route set
+        assert response.headers.get_list("X-Frame-Options") == ["SAMEORIGIN"]
+
+    @pytest.mark.asyncio
+    async def test_not_found_gets_headers(self, header_app: FastAPI) -> None:
+        """Test responses produced by the router itself are covered too."""
+        transport = ASGITransport(app=header_app)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.get("/missing")
+
+        assert response.status_code == 404
+        assert "X-Request-ID" in response.headers
+        assert "Content-Security-Policy" in response.headers
+
+
+class TestTimingMiddleware:
+    """Test cases for the sampled Server-Timing breakdown."""
+
+    @staticmethod
+    def timing_app(sample_rate: float) -> FastAPI:
+        """Application with one timed phase and the given sample rate."""
+        app = FastAPI()
+        app.add_middleware(TimingMiddleware, sample_rate=sample_rate)
+
+        @app.get("/work")
+        async def work() -> dict[str, bool]:
+            with timed("db"):
+                pass
+            return {"ok": True}
+
+        return app
+
+    @pytest.mark.asyncio
+    async def test_breakdown_when_sampled(self) -> None:
+        """Test sampled requests report their phases and total."""
+        transport = ASGITransport(app=self.timing_app(1.0))
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.get("/work")
+
+        metrics = [
+            metric.split(";")[0]
+            for metric in response.headers["Server-Timing"].split(", ")
+        ]
+        assert metrics == ["db", "total"]
+        assert float(response.headers["X-Process-Time"]) >= 0
+        assert timings_context.get() is None
+
+    @pytest.mark.asyncio
+    async def test_no_breakdown_when_disabled(self) -> None:
+        """Test a zero sample rate leaves out the header."""
+        transport = ASGITransport(app=self.timing_app(0.0))
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.get("/work")
+
+        assert "Server-Timing" not in response.headers
+        assert "X-Process-Time" in response.headers
+
+
+class TestSecurityHeadersMiddleware:
+    """Test cases for the precomputed security header blocks."""
+
+    @pytest.fixture
+    def production_app(self, monkeypatch: pytest.MonkeyPatch) -> FastAPI:
+        """Production-mode application with relaxed headers for its docs."""
+        monkeypatch.setattr(middleware.settings, "DEBUG", False)
+        app = FastAPI()
+        app.add_middleware(
+            SecurityHeadersMiddleware, route_overrides=docs_header_overrides(app)
+        )
+
+        @app.get("/ping")
+        async def ping() -> dict[str, bool]:
+            return {"ok": True}
+
+        return app
+
+    @pytest.mark.asyncio
+    async def test_strict_policy_by_default(self, production_app: FastAPI) -> None:
+        """Test ordinary routes get the strict production headers once each."""
+        transport = ASGITransport(app=production_app)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.get("/ping")
+
+        assert response.headers.get_list("Content-Security-Policy") == [PRODUCTION_CSP]
+        assert "'unsafe-inline'" not in PRODUCTION_CSP
+        assert response.headers["X-Frame-Options"] == "DENY"
+        assert response.headers["Content-Type"] == "application/json"
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("path", ["/docs", "/redoc", "/docs/oauth2-redirect"])
+    async def test_docs_get_relaxed_policy(
+        self, production_app: FastAPI, path: str
+    ) -> None:
+        """Test the documentation pages get the CSP Swagger UI and ReDoc need."""
+        transport = ASGITransport(app=production_app)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.get(path)
+
+        assert response.status_code == 200
+        assert response.headers.get_list("Content-Security-Policy") == [DOCS_CSP]
+        assert response.headers["X-Frame-Options"] == "DENY"
+
+    def test_blocks_encoded_once(self) -> None:
+        """Test blocks are raw ASGI header pairs built at construction."""
+        headers_middleware = SecurityHeadersMiddleware(
+            FastAPI(),
+            debug=False,
+            route_overrides={"/docs": {"Content-Security-Policy": DOCS_CSP}},
+        )
+
+        assert (
+            b"content-security-policy",
+            PRODUCTION_CSP.encode(),
+        ) in headers_middleware.default_block
+        assert (
+            b"content-security-policy",
+            DOCS_CSP.encode(),
+        ) in headers_middleware.route_blocks["/docs"]
+
+
+class TestHTTPSRedirectMiddleware:
+    """Test cases for HTTPSRedirectMiddleware."""
+
+    @pytest.mark.asyncio
+    async def test_redirects_in_production(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test plain HTTP is redirected to the same URL over HTTPS."""
+        monkeypatch.setattr(middleware.settings, "DEBUG", False)
+        app = FastAPI()
+        app.add_middleware(HTTPSRedirectMiddleware)
+
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.get("/users?page=2")
+
+        assert response.status_code == 301
+        assert response.headers["Location"] == "https://test/users?page=2"
+
+    @pytest.mark.asyncio
+    async def test_registered_behind_setting(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test the application redirects only when HTTPS_REDIRECT is set."""
+        monkeypatch.setattr(middleware.settings, "TRUSTED_PROXIES", ["127.0.0.0/8"])
+        monkeypatch.setattr(middleware.settings, "HTTPS_REDIRECT", False)
+        assert all(
+            entry.cls is not HTTPSRedirectMiddleware
+            for entry in create_application().user_middleware
+        )
+
+        monkeypatch.setattr(middleware.settings, "HTTPS_REDIRECT", True)
+        app = create_application()
+        assert app.user_middleware[0].cls is ProxyHeadersMiddleware
+        assert app.user_middleware[1].cls is HTTPSRedirectMiddleware
+
+        transport = ASGITransport(app=app, client=("127.0.0.1", 5000))
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            plain = await client.get("/api/v1/health")
+            proxied = await client.get(
+                "/api/v1/docs", headers={"X-Forwarded-Proto": "https"}
+            )
+
+        assert plain.status_code == 301
+        assert proxied.status_code != 301
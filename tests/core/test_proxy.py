@@ -0,0 +1,147 @@
+"""
+Tests for client address resolution behind trusted proxies.
+"""
+
+import pytest
+from fastapi import FastAPI, Request
+from httpx import ASGITransport, AsyncClient
+
+from app.core.middleware import HTTPSRedirectMiddleware
+from app.core.proxy import ProxyHeadersMiddleware, TrustedProxies
+
+
+@pytest.fixture
+def proxies() -> TrustedProxies:
+    """Traefik on a Docker network plus a local proxy."""
+    return TrustedProxies(["172.16.0.0/12", "127.0.0.1", "fd00::/8"])
+
+
+class TestTrustedProxies:
+    """Test cases for TrustedProxies."""
+
+    @pytest.mark.parametrize(
+        "address, expected",
+        [
+            ("172.18.0.5", True),
+            ("127.0.0.1", True),
+            ("fd00::1", True),
+            ("10.0.0.1", False),
+            ("not-an-ip", False),
+            ("", False),
+        ],
+    )
+    def test_contains(
+        self, proxies: TrustedProxies, address: str, expected: bool
+    ) -> None:
+        """Test membership covers whole networks and rejects non-addresses."""
+        assert (address in proxies) is expected
+
+    def test_untrusted_peer_ignores_header(self, proxies: TrustedProxies) -> None:
+        """Test a client cannot choose its address by sending the header."""
+        assert proxies.client_ip("203.0.113.9", "198.51.100.1") == "203.0.113.9"
+
+    def test_trusted_peer_uses_header(self, proxies: TrustedProxies) -> None:
+        """Test the address reported by a trusted proxy is used."""
+        assert proxies.client_ip("172.18.0.5", "198.51.100.1") == "198.51.100.1"
+
+    def test_skips_trusted_hops_only(self, proxies: TrustedProxies) -> None:
+        """Test forged entries left of the first untrusted hop are ignored."""
+        forwarded_for = "1.2.3.4, 198.51.100.1, 127.0.0.1"
+
+        assert proxies.client_ip("172.18.0.5", forwarded_for) == "198.51.100.1"
+
+    def test_missing_header(self, proxies: TrustedProxies) -> None:
+        """Test the peer is the client when no header was forwarded."""
+        assert proxies.client_ip("172.18.0.5", None) == "172.18.0.5"
+
+    def test_no_trusted_proxies(self) -> None:
+        """Test nothing is trusted by default."""
+        proxies = TrustedProxies([])
+
+        assert not proxies
+        assert proxies.client_ip("172.18.0.5", "198.51.100.1") == "172.18.0.5"
+
+
+class TestProxyHeadersMiddleware:
+    """Test cases for ProxyHeadersMiddleware."""
+
+    @staticmethod
+    def proxied_app(proxies: TrustedProxies, redirect: bool = False) -> FastAPI:
+        """Application reporting the client and scheme it sees."""
+        app = FastAPI()
+        if redirect:
+            app.add_middleware(HTTPSRedirectMiddleware, enabled=True)
+        app.add_middleware(ProxyHeadersMiddleware, trusted_proxies=proxies)
+
+        @app.get("/whoami")
+        async def whoami(request: Request) -> dict[str, str | None]:
+            return {
+                "client": request.client.host if request.client else None,
+                "scheme": request.url.scheme,
+            }
+
+        return app
+
+    @pytest.mark.asyncio
+    async def test_trusted_proxy_rewrites_scope(self, proxies: TrustedProxies) -> None:
+        """Test client and scheme come from a trusted proxy's headers."""
+        transport = ASGITransport(
+            app=self.proxied_app(proxies), client=("172.18.0.5", 5000)
+        )
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.get(
+                "/whoami",
+                headers={
+                    "X-Forwarded-For": "1.2.3.4, 198.51.100.1",
+                    "X-Forwarded-Proto": "HTTPS",
+                },
+            )
+
+        assert response.json() == {"client": "198.51.100.1", "scheme": "https"}
+
+    @pytest.mark.asyncio
+    async def test_untrusted_peer_ignored(self, proxies: TrustedProxies) -> None:
+        """Test clients cannot set their own address or scheme."""
+        transport = ASGITransport(
+            app=self.proxied_app(proxies), client=("203.0.113.9", 5000)
+        )
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.get(
+                "/whoami",
+                headers={
+                    "X-Forwarded-For": "198.51.100.1",
+                    "X-Forwarded-Proto": "https",
+                },
+            )
+
+        assert response.json() == {"client": "203.0.113.9", "scheme": "http"}
+
+    @pytest.mark.asyncio
+    async def test_unknown_scheme_ignored(self, proxies: TrustedProxies) -> None:
+        """Test only real schemes are accepted from the header."""
+        transport = ASGITransport(
+            app=self.proxied_app(proxies), client=("172.18.0.5", 5000)
+        )
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.get(
+                "/whoami", headers={"X-Forwarded-Proto": "javascript"}
+            )
+
+        assert response.json() == {"client": "172.18.0.5", "scheme": "http"}
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "proto, status_code", [("https", 200), ("http", 301), (None, 301)]
+    )
+    async def test_https_redirect_uses_forwarded_scheme(
+        self, proxies: TrustedProxies, proto: str | None, status_code: int
+    ) -> None:
+        """Test requests the proxy received over HTTPS are not redirected."""
+        transport = ASGITransport(
+            app=self.proxied_app(proxies, redirect=True), client=("172.18.0.5", 5000)
+        )
+        headers = {"X-Forwarded-Proto": proto} if proto else {}
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.get("/whoami", headers=headers)
+
+        assert response.status_code == status_code
@@ -0,0 +1,782 @@
+"""
+Tests for token bucket rate limiting.
+"""
+
+import asyncio
+import fcntl
+import multiprocessing
+import os
+import sys
+import time
+from multiprocessing.synchronize import Event
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from fastapi import FastAPI, status
+from httpx import ASGITransport, AsyncClient
+
+from app.core import metrics
+from app.core.middleware import RateLimitMiddleware
+from app.core.config import RateLimitPolicy, Settings
+from app.core.proxy import ProxyHeadersMiddleware, TrustedProxies
+from app.core.security import create_access_token
+from app.core.rate_limit import (
+    BucketStore,
+    LeasedRateLimitBackend,
+    PolicyTrie,
+    PostgresRateLimitBackend,
+    RateLimitBackend,
+    RateLimitDecision,
+    SharedMemoryRateLimitBackend,
+    TokenBucketLimiter,
+    create_rate_limit_backend,
+)
+from app.db.base import engine
+
+
+class FakeClock:
+    """Manually advanced time source."""
+
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+    """Fake monotonic clock."""
+    return FakeClock()
+
+
+def spend_in_child(path: str, tokens: int) -> None:
+    """Spend a client's whole bucket from a separate process."""
+    backend = SharedMemoryRateLimitBackend(tokens, path)
+    for _ in range(tokens):
+        assert asyncio.run(backend.acquire("10.0.0.1"))
+
+
+def hold_table_lock(path: str, locked: Event) -> None:
+    """Hold the lock on a whole bucket table from a separate process."""
+    fd = os.open(path, os.O_RDWR)
+    fcntl.lockf(fd, fcntl.LOCK_EX)
+    locked.set()
+    time.sleep(0.3)
+    fcntl.lockf(fd, fcntl.LOCK_UN)
+    os.close(fd)
+
+
+async def acquire_many(backend: RateLimitBackend, key: str, count: int) -> list[bool]:
+    """Acquire one token ``count`` times and return whether each was admitted."""
+    return [bool(await backend.acquire(key)) for _ in range(count)]
+
+
+class TestTokenBucketLimiter:
+    """Test cases for TokenBucketLimiter."""
+
+    @pytest.mark.asyncio
+    async def test_allows_burst_up_to_limit(self, clock: FakeClock) -> None:
+        """Test a new client may spend a full bucket at once."""
+        limiter = TokenBucketLimiter(3, clock=clock)
+
+        assert await acquire_many(limiter, "10.0.0.1", 4) == [True, True, True, False]
+
+    @pytest.mark.asyncio
+    async def test_refills_over_time(self, clock: FakeClock) -> None:
+        """Test tokens are regained at rate_limit per minute."""
+        limiter = TokenBucketLimiter(60, clock=clock)
+        await acquire_many(limiter, "10.0.0.1", 60)
+        assert not await limiter.acquire("10.0.0.1")
+
+        clock.now += 1.0
+
+        assert await limiter.acquire("10.0.0.1")
+        assert not await limiter.acquire("10.0.0.1")
+
+    @pytest.mark.asyncio
+    async def test_rejections_do_not_earn_tokens(self, clock: FakeClock) -> None:
+        """Test refill is measured from the last check, not the last success."""
+        limiter = TokenBucketLimiter(60, clock=clock)
+        await acquire_many(limiter, "10.0.0.1", 60)
+
+        # Half a token per check; two checks must not add up to a free token
+        clock.now += 0.5
+        assert not await limiter.acquire("10.0.0.1")
+        clock.now += 0.5
+        assert await limiter.acquire("10.0.0.1")
+        assert not await limiter.acquire("10.0.0.1")
+
+    @pytest.mark.asyncio
+    async def test_keys_are_independent(self, clock: FakeClock) -> None:
+        """Test one client exhausting its bucket does not affect another."""
+        limiter = TokenBucketLimiter(1, clock=clock)
+
+        assert await limiter.acquire("10.0.0.1")
+        assert not await limiter.acquire("10.0.0.1")
+        assert await limiter.acquire("10.0.0.2")
+
+    @pytest.mark.asyncio
+    async def test_uneven_rate_allows_full_burst(self, clock: FakeClock) -> None:
+        """Test rounding in the refill interval never costs a token."""
+        limiter = TokenBucketLimiter(7, clock=clock)
+
+        assert await acquire_many(limiter, "10.0.0.1", 8) == [True] * 7 + [False]
+
+    @pytest.mark.asyncio
+    async def test_capacity_is_capped(self, clock: FakeClock) -> None:
+        """Test idle time never grows a bucket beyond rate_limit tokens."""
+        limiter = TokenBucketLimiter(2, clock=clock)
+        await limiter.acquire("10.0.0.1")
+
+        clock.now += 3600
+
+        assert await acquire_many(limiter, "10.0.0.1", 3) == [True, True, False]
+
+    @pytest.mark.asyncio
+    async def test_reports_bucket_state(self, clock: FakeClock) -> None:
+        """Test decisions carry the tokens left and the time to refill."""
+        limiter = TokenBucketLimiter(60, clock=clock)
+
+        admitted = await limiter.acquire("10.0.0.1", cost=58)
+        assert admitted == RateLimitDecision(
+            admitted=True, limit=60, remaining=2, reset_after=pytest.approx(58.0)
+        )
+
+        rejected = await limiter.acquire("10.0.0.1", cost=5)
+        assert not rejected
+        assert rejected.remaining == 2
+        assert rejected.retry_after == pytest.approx(3.0)
+
+    @pytest.mark.asyncio
+    async def test_cost_spends_several_tokens(self, clock: FakeClock) -> None:
+        """Test a request may cost more than one token."""
+        limiter = TokenBucketLimiter(5, clock=clock)
+
+        assert await limiter.acquire("10.0.0.1", cost=3)
+        assert not await limiter.acquire("10.0.0.1", cost=3)
+        assert await limiter.acquire("10.0.0.1", cost=2)
+
+
+class TestBucketStore:
+    """Test cases for BucketStore."""
+
+    def test_unknown_client_has_full_bucket(self) -> None:
+        """Test a client never seen before is full as of now."""
+        store = BucketStore(capacity=2)
+
+        assert store.get("a", 5.0) == 5.0
+        assert len(store) == 0
+
+    def test_evicts_least_recently_used_at_capacity(self) -> None:
+        """Test a full store evicts the bucket used longest ago."""
+        store = BucketStore(capacity=2)
+        before = metrics.counters["rate_limit_evictions"]
+        store.set("a", 100.0)
+        store.set("b", 100.0)
+        store.get("a", 0.0)
+
+        store.get("c", 1.0)
+        store.set("c", 100.0)
+
+        assert list(store.buckets) == ["a", "c"]
+        assert metrics.counters["rate_limit_evictions"] == before + 1
+
+    def test_sweeps_refilled_buckets(self) -> None:
+        """Test buckets that are full again are dropped as clients arrive."""
+        store = BucketStore(capacity=10)
+        store.set("a", 10.0)
+        store.set("b", 20.0)
+        store.set("c", 30.0)
+
+        store.get("d", 15.0)
+        assert list(store.buckets) == ["b", "c"]
+
+        store.get("e", 30.0)
+        assert list(store.buckets) == []
+
+    def test_memory_bytes_grows_with_entries(self) -> None:
+        """Test the memory estimate accounts for every bucket."""
+        store = BucketStore(capacity=100)
+        empty = store.memory_bytes()
+        for i in range(50):
+            store.set(f"10.0.0.{i}", 1.0)
+
+        assert store.memory_bytes() > empty + 50 * (24 + 50)
+
+    def test_memory_bytes_tracks_evictions_and_sweeps(self) -> None:
+        """Test the running memory total matches the buckets actually held."""
+        store = BucketStore(capacity=3)
+        for i, key in enumerate(["a", "bb", "ccc", "dddd"]):
+            store.get(key, 0.0)
+            store.set(key, 10.0 + i)
+        store.set("ccc", 20.0)
+        store.get("eeeee", 12.5)
+
+        held = sys.getsizeof(store.buckets) + sum(
+            sys.getsizeof(key) + sys.getsizeof(full_at)
+            for key, full_at in store.buckets.items()
+        )
+        assert store.memory_bytes() == held
+
+
+class TestLimiterMetrics:
+    """Test cases for limiter gauges."""
+
+    @pytest.mark.asyncio
+    async def test_reports_clients_and_memory(self, clock: FakeClock) -> None:
+        """Test the bucket count and memory appear in metric snapshots."""
+        limiter = TokenBucketLimiter(10, clock=clock)
+        limiter.register_metrics()
+        await limiter.acquire("10.0.0.1")
+        await limiter.acquire("10.0.0.2")
+
+        snapshot = metrics.snapshot()
+
+        assert snapshot["rate_limit_clients"] == 2
+        assert snapshot["rate_limit_memory_bytes"] == limiter.store.memory_bytes()
+
+    def test_failing_gauge_left_out(self) -> None:
+        """Test a gauge that cannot be read does not break the snapshot."""
+        metrics.increment("test_events")
+        metrics.register_gauge("test_broken", lambda: 1 / 0)
+        try:
+            snapshot = metrics.snapshot()
+        finally:
+            del metrics.gauges["test_broken"]
+
+        assert "test_broken" not in snapshot
+        assert snapshot["test_events"] >= 1
+
+    @pytest.mark.asyncio
+    async def test_capacity_bounds_clients(self, clock: FakeClock) -> None:
+        """Test the limiter never holds more than max_clients buckets."""
+        limiter = TokenBucketLimiter(10, max_clients=3, clock=clock)
+        for i in range(10):
+            await limiter.acquire(f"10.0.0.{i}")
+
+        assert len(limiter.store) == 3
+
+
+class TestSharedMemoryRateLimitBackend:
+    """Test cases for SharedMemoryRateLimitBackend."""
+
+    @pytest.mark.asyncio
+    async def test_workers_share_buckets(
+        self, tmp_path: Path, clock: FakeClock
+    ) -> None:
+        """Test two workers mapping the same file draw from one bucket."""
+        path = str(tmp_path / "buckets")
+        first = SharedMemoryRateLimitBackend(3, path, clock=clock)
+        second = SharedMemoryRateLimitBackend(3, path, clock=clock)
+
+        decisions = [
+            bool(await first.acquire("10.0.0.1")),
+            bool(await second.acquire("10.0.0.1")),
+            bool(await first.acquire("10.0.0.1")),
+            bool(await second.acquire("10.0.0.1")),
+        ]
+
+        assert decisions == [True, True, True, False]
+        assert await second.acquire("10.0.0.2")
+
+    def test_shared_across_processes(self, tmp_path: Path) -> None:
+        """Test buckets spent in another process are seen by this one."""
+        path = str(tmp_path / "buckets")
+        context = multiprocessing.get_context("fork")
+        child = context.Process(target=spend_in_child, args=(path, 5))
+        child.start()
+        child.join(timeout=10)
+        assert child.exitcode == 0
+
+        backend = SharedMemoryRateLimitBackend(5, path)
+        loop = asyncio.new_event_loop()
+        try:
+            assert not loop.run_until_complete(backend.acquire("10.0.0.1"))
+        finally:
+            loop.close()
+
+    @pytest.mark.asyncio
+    async def test_contended_lock_does_not_block_loop(self, tmp_path: Path) -> None:
+        """Test waiting for another worker's lock lets other tasks run."""
+        path = str(tmp_path / "buckets")
+        backend = SharedMemoryRateLimitBackend(5, path)
+        context = multiprocessing.get_context("fork")
+        locked = context.Event()
+        child = context.Process(target=hold_table_lock, args=(path, locked))
+        child.start()
+        try:
+            assert await asyncio.to_thread(locked.wait, 10)
+            acquire = asyncio.create_task(backend.acquire("10.0.0.1"))
+            ticks = 0
+            while not acquire.done():
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+            assert await acquire
+            assert ticks > 5
+        finally:
+            child.join(timeout=10)
+        assert child.exitcode == 0
+
+    @pytest.mark.asyncio
+    async def test_refills_over_time(self, tmp_path: Path, clock: FakeClock) -> None:
+        """Test tokens are regained at rate_limit per minute."""
+        backend = SharedMemoryRateLimitBackend(60, str(tmp_path / "b"), clock=clock)
+        await acquire_many(backend, "10.0.0.1", 60)
+        assert not await backend.acquire("10.0.0.1")
+
+        clock.now += 1.0
+
+        assert await backend.acquire("10.0.0.1")
+
+    @pytest.mark.asyncio
+    async def test_full_group_evicts_closest_to_full(
+        self, tmp_path: Path, clock: FakeClock
+    ) -> None:
+        """Test a table with no free slot evicts and counts it."""
+        backend = SharedMemoryRateLimitBackend(
+            2, str(tmp_path / "b"), max_clients=1, clock=clock
+        )
+        before = metrics.counters["rate_limit_evictions"]
+        for i in range(backend.GROUP_SLOTS):
+            await backend.acquire(f"10.0.0.{i}")
+        assert backend.entries() == backend.GROUP_SLOTS
+
+        assert await backend.acquire("10.0.1.1")
+
+        assert backend.entries() == backend.GROUP_SLOTS
+        assert metrics.counters["rate_limit_evictions"] == before + 1
+
+    @pytest.mark.asyncio
+    async def test_refilled_slots_are_reused(
+        self, tmp_path: Path, clock: FakeClock
+    ) -> None:
+        """Test slots of refilled buckets are free without an eviction."""
+        backend = SharedMemoryRateLimitBackend(
+            2, str(tmp_path / "b"), max_clients=1, clock=clock
+        )
+        for i in range(backend.GROUP_SLOTS):
+            await backend.acquire(f"10.0.0.{i}")
+        before = metrics.counters["rate_limit_evictions"]
+
+        clock.now += 60
+
+        assert backend.entries() == 0
+        assert await backend.acquire("10.0.1.1")
+        assert metrics.counters["rate_limit_evictions"] == before
+
+
+class FakeBackend:
+    """Remote backend stand-in with a fixed budget and a call log."""
+
+    def __init__(self, rate_limit: int, budget: int) -> None:
+        self.rate_limit = rate_limit
+        self.budget = budget
+        self.calls: list[int] = []
+
+    async def acquire(self, key: str, cost: int = 1) -> RateLimitDecision:
+        self.calls.append(cost)
+        admitted = cost <= self.budget
+        if admitted:
+            self.budget -= cost
+        return RateLimitDecision(admitted, self.rate_limit, self.budget, 10.0)
+
+    def register_metrics(self) -> None:
+        pass
+
+
+class TestLeasedRateLimitBackend:
+    """Test cases for LeasedRateLimitBackend."""
+
+    @pytest.mark.asyncio
+    async def test_spends_lease_locally(self, clock: FakeClock) -> None:
+        """Test one round-trip admits lease_size requests."""
+        remote = FakeBackend(rate_limit=60, budget=60)
+        backend = LeasedRateLimitBackend(remote, lease_size=5, clock=clock)
+
+        assert await acquire_many(backend, "10.0.0.1", 5) == [True] * 5
+        assert remote.calls == [5]
+
+        assert await backend.acquire("10.0.0.1")
+        assert remote.calls == [5, 5]
+
+    @pytest.mark.asyncio
+    async def test_remaining_counts_leased_tokens(self, clock: FakeClock) -> None:
+        """Test tokens held in the local lease are reported as remaining."""
+        remote = FakeBackend(rate_limit=60, budget=60)
+        backend = LeasedRateLimitBackend(remote, lease_size=5, clock=clock)
+
+        first = await backend.acquire("10.0.0.1")
+        second = await backend.acquire("10.0.0.1")
+
+        assert first.remaining == 59
+        assert second.remaining == 58
+
+    @pytest.mark.asyncio
+    async def test_never_exceeds_remote_budget(self, clock: FakeClock) -> None:
+        """Test near the limit single tokens are requested, then refused."""
+        remote = FakeBackend(rate_limit=60, budget=7)
+        backend = LeasedRateLimitBackend(remote, lease_size=5, clock=clock)
+
+        decisions = await acquire_many(backend, "10.0.0.1", 9)
+
+        assert decisions == [True] * 7 + [False] * 2
+        assert remote.budget == 0
+
+    @pytest.mark.asyncio
+    async def test_lease_expires(self, clock: FakeClock) -> None:
+        """Test unspent leased tokens are forfeited after lease_seconds."""
+        remote = FakeBackend(rate_limit=60, budget=60)
+        backend = LeasedRateLimitBackend(
+            remote, lease_size=5, lease_seconds=1.0, clock=clock
+        )
+        await backend.acquire("10.0.0.1")
+
+        clock.now += 2.0
+        await backend.acquire("10.0.0.1")
+
+        assert remote.calls == [5, 5]
+
+    def test_lease_capped_at_rate_limit(self) -> None:
+        """Test a lease never asks for more than a full bucket."""
+        backend = LeasedRateLimitBackend(FakeBackend(3, 3), lease_size=10)
+
+        assert backend.lease_size == 3
+
+
+class TestPostgresRateLimitBackend:
+    """Test cases for PostgresRateLimitBackend."""
+
+    @staticmethod
+    def mock_engine(row: tuple[float, float | None, float | None]) -> MagicMock:
+        """Engine whose upsert returns ``(now, admitted_full_at, stored_full_at)``."""
+        engine = MagicMock()
+        connection = engine.begin.return_value.__aenter__.return_value
+        result = MagicMock()
+        result.one.return_value = row
+        connection.execute = AsyncMock(return_value=result)
+        return engine
+
+    @pytest.mark.asyncio
+    async def test_admits_when_upserted(self) -> None:
+        """Test the upsert returning a full-at time admits the request."""
+        engine = self.mock_engine((1000.0, 1002.0, 1000.0))
+        backend = PostgresRateLimitBackend(60, engine)
+
+        decision = await backend.acquire("10.0.0.1", cost=2)
+
+        assert decision.admitted
+        assert decision.remaining == 58
+        connection = engine.begin.return_value.__aenter__.return_value
+        params = connection.execute.call_args.args[1]
+        assert params["key"] == "10.0.0.1"
+        assert params["spend"] == 2.0
+
+    @pytest.mark.asyncio
+    async def test_rejects_when_not_upserted(self) -> None:
+        """Test an update filtered out by the burst check rejects."""
+        engine = self.mock_engine((1000.0, None, 1059.5))
+
+        decision = await PostgresRateLimitBackend(60, engine).acquire("10.0.0.1")
+
+        assert not decision
+        assert decision.remaining == 0
+        assert decision.retry_after == pytest.approx(0.5)
+
+    @pytest.mark.asyncio
+    async def test_fails_open(self) -> None:
+        """Test requests are admitted and counted when the database is down."""
+        engine = MagicMock()
+        engine.begin.return_value.__aenter__.side_effect = ConnectionRefusedError()
+        before = metrics.counters["rate_limit_backend_errors"]
+
+        assert await PostgresRateLimitBackend(60, engine).acquire("10.0.0.1")
+        assert metrics.counters["rate_limit_backend_errors"] == before + 1
+
+
+class TestCreateRateLimitBackend:
+    """Test cases for backend selection."""
+
+    def test_selects_backend(self, test_settings: Settings, tmp_path: Path) -> None:
+        """Test RATE_LIMIT_BACKEND picks the implementation."""
+        memory = test_settings.model_copy(update={"RATE_LIMIT_BACKEND": "memory"})
+        shared = test_settings.model_copy(
+            update={
+                "RATE_LIMIT_BACKEND": "shared_memory",
+                "RATE_LIMIT_SHARED_MEMORY_PATH": str(tmp_path / "buckets"),
+            }
+        )
+        postgres = test_settings.model_copy(update={"RATE_LIMIT_BACKEND": "postgres"})
+
+        assert isinstance(create_rate_limit_backend(memory), TokenBucketLimiter)
+        assert isinstance(
+            create_rate_limit_backend(shared), SharedMemoryRateLimitBackend
+        )
+        leased = create_rate_limit_backend(postgres)
+        assert isinstance(leased, LeasedRateLimitBackend)
+        assert isinstance(leased.backend, PostgresRateLimitBackend)
+
+    @pytest.mark.asyncio
+    async def test_postgres_backend_has_own_pool(self, test_settings: Settings) -> None:
+        """Test the postgres backend does not borrow the main engine's pool."""
+        postgres = test_settings.model_copy(
+            update={"RATE_LIMIT_BACKEND": "postgres", "RATE_LIMIT_POOL_SIZE": 3}
+        )
+
+        leased = create_rate_limit_backend(postgres)
+
+        assert isinstance(leased, LeasedRateLimitBackend)
+        assert isinstance(leased.backend, PostgresRateLimitBackend)
+        pool = leased.backend.engine.pool
+        assert leased.backend.engine is not engine
+        assert pool.size() == 3  # type: ignore[attr-defined]
+        await leased.close()
+
+
+class TestPolicyTrie:
+    """Test cases for PolicyTrie."""
+
+    @pytest.fixture
+    def trie(self) -> PolicyTrie:
+        """Trie compiled from a typical policy set."""
+        return PolicyTrie(
+            [
+                RateLimitPolicy(path="/static", cost=0),
+                RateLimitPolicy(path="/api/v1/auth", cost=2),
+                RateLimitPolicy(path="/api/v1/auth/login", methods=["post"], cost=5),
+                RateLimitPolicy(path="/api/v1/users", methods=["POST"], cost=3),
+                RateLimitPolicy(path="/api/v1/items", exact=True, cost=4),
+            ],
+            rate_limit=60,
+        )
+
+    @pytest.mark.parametrize(
+        "method, path, expected",
+        [
+            ("GET", "/static/css/site.css", 0),
+            ("POST", "/api/v1/auth/login", 5),
+            ("POST", "/api/v1/auth/login/", 5),
+            ("GET", "/api/v1/auth/login", 2),
+            ("POST", "/api/v1/auth/verify", 2),
+            ("POST", "/api/v1/users", 3),
+            ("POST", "/api/v1/users/import", 3),
+            ("GET", "/api/v1/users/me", 1),
+            ("GET", "/api/v1/usersettings", 1),
+            ("GET", "/api/v1/items", 4),
+            ("GET", "/api/v1/items/", 4),
+            ("GET", "/api/v1/items/42", 1),
+            ("GET", "/", 1),
+        ],
+    )
+    def test_longest_prefix_and_method(
+        self, trie: PolicyTrie, method: str, path: str, expected: int
+    ) -> None:
+        """Test the deepest policy for the request method decides the cost."""
+        assert trie.cost(method, path) == expected
+
+    def test_cost_capped_at_rate_limit(self) -> None:
+        """Test a policy never costs more than a full bucket."""
+        trie = PolicyTrie([RateLimitPolicy(path="/expensive", cost=100)], 10)
+
+        assert trie.cost("GET", "/expensive") == 10
+
+    def test_later_policy_overrides(self) -> None:
+        """Test a repeated prefix and method keeps the last cost."""
+        trie = PolicyTrie(
+            [
+                RateLimitPolicy(path="/api", cost=2),
+                RateLimitPolicy(path="/api/", cost=4),
+            ],
+            rate_limit=60,
+        )
+
+        assert trie.cost("GET", "/api/v1") == 4
+
+    def test_default_policies(self, test_settings: Settings) -> None:
+        """Test probes are free and password hashing endpoints cost more."""
+        trie = PolicyTrie(
+            test_settings.RATE_LIMIT_POLICIES, test_settings.RATE_LIMIT_PER_MINUTE
+        )
+
+        assert trie.cost("GET", "/api/v1/health") == 0
+        assert trie.cost("POST", "/api/v1/auth/login") > trie.cost(
+            "POST", "/api/v1/auth/verify"
+        )
+        # Registration hashes a password; lookups and imports are charged
+        # as ordinary requests
+        assert trie.cost("POST", "/api/v1/users") == 5
+        assert trie.cost("POST", "/api/v1/users/lookup") == 1
+        assert trie.cost("POST", "/api/v1/users/import") == 1
+
+    def test_default_policies_follow_api_prefix(self) -> None:
+        """Test the default prefixes are built from the API path settings."""
+        settings = Settings(API_PREFIX="/sso", API_V1_STR="v2")
+        trie = PolicyTrie(settings.RATE_LIMIT_POLICIES, settings.RATE_LIMIT_PER_MINUTE)
+
+        assert trie.cost("GET", "/sso/v2/health") == 0
+        assert trie.cost("POST", "/sso/v2/users") == 5
+        assert trie.cost("GET", "/api/v1/health") == 1
+
+
+class TestRateLimitMiddleware:
+    """Test cases for RateLimitMiddleware."""
+
+    @pytest.mark.asyncio
+    async def test_rejects_over_limit(self) -> None:
+        """Test requests beyond the bucket are answered with 429."""
+        app = FastAPI()
+        app.add_middleware(RateLimitMiddleware, rate_limit=2)
+
+        @app.get("/ping")
+        async def ping() -> dict[str, bool]:
+            return {"ok": True}
+
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            statuses = [(await client.get("/ping")).status_code for _ in range(3)]
+
+        assert statuses == [
+            status.HTTP_200_OK,
+            status.HTTP_200_OK,
+            status.HTTP_429_TOO_MANY_REQUESTS,
+        ]
+
+    @pytest.mark.asyncio
+    async def test_admitted_requests_run_concurrently(self) -> None:
+        """Test a slow request does not block the next one from the limiter."""
+        app = FastAPI()
+        app.add_middleware(RateLimitMiddleware, rate_limit=10)
+        both_arrived = asyncio.Event()
+        arrived = 0
+
+        @app.get("/rendezvous")
+        async def rendezvous() -> dict[str, bool]:
+            nonlocal arrived
+            arrived += 1
+            if arrived == 2:
+                both_arrived.set()
+            # Only completes if the other request got past the limiter too
+            await asyncio.wait_for(both_arrived.wait(), timeout=1.0)
+            return {"ok": True}
+
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            responses = await asyncio.gather(
+                client.get("/rendezvous"), client.get("/rendezvous")
+            )
+
+        assert [r.status_code for r in responses] == [200, 200]
+
+    @pytest.mark.asyncio
+    async def test_policies_set_cost(self) -> None:
+        """Test expensive routes drain the bucket faster and free ones do not."""
+        app = FastAPI()
+        app.add_middleware(
+            RateLimitMiddleware,
+            rate_limit=4,
+            policies=PolicyTrie(
+                [
+                    RateLimitPolicy(path="/login", methods=["POST"], cost=3),
+                    RateLimitPolicy(path="/health", cost=0),
+                ],
+                rate_limit=4,
+            ),
+        )
+
+        @app.post("/login")
+        async def login() -> dict[str, bool]:
+            return {"ok": True}
+
+        @app.get("/health")
+        async def health() -> dict[str, bool]:
+            return {"ok": True}
+
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            first = await client.post("/login")
+            second = await client.post("/login")
+            probes = [(await client.get("/health")).status_code for _ in range(10)]
+
+        assert first.status_code == status.HTTP_200_OK
+        assert second.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+        assert probes == [status.HTTP_200_OK] * 10
+
+    @staticmethod
+    def limited_app(**kwargs: object) -> FastAPI:
+        """Application with one endpoint behind RateLimitMiddleware."""
+        app = FastAPI()
+        app.add_middleware(RateLimitMiddleware, **kwargs)
+
+        @app.get("/ping")
+        async def ping() -> dict[str, bool]:
+            return {"ok": True}
+
+        return app
+
+    @pytest.mark.asyncio
+    async def test_rate_limit_headers(self) -> None:
+        """Test responses report the limit, tokens left and time to refill."""
+        transport = ASGITransport(app=self.limited_app(rate_limit=2))
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            first = await client.get("/ping")
+            await client.get("/ping")
+            rejected = await client.get("/ping")
+
+        assert first.headers["X-RateLimit-Limit"] == "2"
+        assert first.headers["X-RateLimit-Remaining"] == "1"
+        assert first.headers["X-RateLimit-Reset"] == "30"
+        assert rejected.headers["X-RateLimit-Remaining"] == "0"
+        assert int(rejected.headers["Retry-After"]) in (29, 30)
+
+    @pytest.mark.asyncio
+    async def test_authenticated_users_have_own_buckets(self) -> None:
+        """Test users behind one address are limited separately."""
+        tokens = [create_access_token(f"user-{i}", f"u{i}@hccc.edu") for i in (1, 2)]
+
+        transport = ASGITransport(app=self.limited_app(rate_limit=1))
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            statuses = [
+                (
+                    await client.get(
+                        "/ping", headers={"Authorization": f"Bearer {token}"}
+                    )
+                ).status_code
+                for token in tokens * 2
+            ]
+
+        assert statuses == [200, 200, 429, 429]
+
+    @pytest.mark.asyncio
+    async def test_invalid_token_falls_back_to_address(self) -> None:
+        """Test a forged token is charged to the client address."""
+        forged = create_access_token("user-1", "u1@hccc.edu") + "x"
+
+        transport = ASGITransport(app=self.limited_app(rate_limit=1))
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            statuses = [
+                (
+                    await client.get("/ping", headers={"Authorization": f"Bearer {t}"})
+                ).status_code
+                for t in (forged, forged + "y")
+            ]
+
+        assert statuses == [200, 429]
+
+    @pytest.mark.asyncio
+    async def test_forwarded_for_from_trusted_proxy(self) -> None:
+        """Test anonymous clients behind a trusted proxy are told apart."""
+        app = self.limited_app(rate_limit=1)
+        app.add_middleware(
+            ProxyHeadersMiddleware, trusted_proxies=TrustedProxies(["127.0.0.0/8"])
+        )
+
+        transport = ASGITransport(app=app, client=("127.0.0.1", 5000))
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            statuses = [
+                (await client.get("/ping", headers={"X-Forwarded-For": ip})).status_code
+                for ip in ("198.51.100.1", "198.51.100.2", "198.51.100.1")
+            ]
+
+        assert statuses == [200, 200, 429]
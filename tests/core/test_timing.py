@@ -0,0 +1,74 @@
+"""
+Tests for the per-request Server-Timing breakdown.
+"""
+
+import json
+
+from app.core.timing import (
+    RequestTimings,
+    TimedJSONResponse,
+    timed,
+    timings_context,
+)
+
+
+class TestRequestTimings:
+    """Test cases for RequestTimings."""
+
+    def test_header_value(self) -> None:
+        """Test phases are listed in order, in milliseconds, then the total."""
+        timings = RequestTimings()
+        timings.add("db_checkout", 1_500_000)
+        timings.add("db", 250_000)
+
+        metrics = timings.header_value().decode().split(", ")
+
+        assert metrics[:2] == ["db_checkout;dur=1.500", "db;dur=0.250"]
+        assert metrics[2].startswith("total;dur=")
+
+    def test_overflow_summed_per_name(self) -> None:
+        """Test phases past the limit are folded into one entry per name."""
+        timings = RequestTimings()
+        for _ in range(RequestTimings.MAX_ENTRIES + 3):
+            timings.add("db", 1_000_000)
+
+        metrics = timings.header_value().decode().split(", ")
+
+        assert len(metrics) == RequestTimings.MAX_ENTRIES + 2
+        assert metrics[-2] == 'db;dur=3.000;desc="3 more"'
+
+
+class TestTimed:
+    """Test cases for the timed context manager."""
+
+    def test_records_into_current_request(self) -> None:
+        """Test a block is recorded under its name while a request is timed."""
+        timings = RequestTimings()
+        token = timings_context.set(timings)
+        try:
+            with timed("hash"):
+                pass
+        finally:
+            timings_context.reset(token)
+
+        assert [name for name, _ in timings.entries] == ["hash"]
+
+    def test_noop_without_request(self) -> None:
+        """Test nothing is recorded when the request is not sampled."""
+        with timed("hash"):
+            result = 1
+
+        assert result == 1
+        assert timings_context.get() is None
+
+    def test_json_rendering_timed(self) -> None:
+        """Test JSON responses report their encoding as serialize."""
+        timings = RequestTimings()
+        token = timings_context.set(timings)
+        try:
+            response = TimedJSONResponse({"ok": True})
+        finally:
+            timings_context.reset(token)
+
+        assert json.loads(response.body) == {"ok": True}
+        assert [name for name, _ in timings.entries] == ["serialize"]
@@ -0,0 +1,71 @@
+"""
+Tests for online migration helpers.
+"""
+
+from unittest.mock import MagicMock
+
+import pytest
+from pytest_mock import MockFixture
+
+from app.db.migrations import create_index_concurrently, drop_index_concurrently
+
+
+@pytest.fixture
+def mock_op(mocker: MockFixture) -> MagicMock:
+    """Patch Alembic's operations proxy used by the helpers."""
+    op = mocker.patch("app.db.migrations.op")
+    op.get_context.return_value.as_sql = False
+    return op
+
+
+class TestCreateIndexConcurrently:
+    """Test cases for create_index_concurrently."""
+
+    def test_builds_in_autocommit_block(self, mock_op: MagicMock) -> None:
+        """Test the index is built concurrently outside a transaction."""
+        mock_op.get_bind.return_value.scalar.return_value = None
+
+        create_index_concurrently("ix_users_full_name", "users", ["full_name"])
+
+        mock_op.get_context.return_value.autocommit_block.assert_called_once()
+        mock_op.drop_index.assert_not_called()
+        mock_op.create_index.assert_called_once_with(
+            "ix_users_full_name",
+            "users",
+            ["full_name"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+    def test_rebuilds_invalid_index(self, mock_op: MagicMock) -> None:
+        """Test an invalid index left by a failed build is dropped first."""
+        mock_op.get_bind.return_value.scalar.return_value = False
+
+        create_index_concurrently("ix_users_full_name", "users", ["full_name"])
+
+        mock_op.drop_index.assert_called_once_with(
+            "ix_users_full_name", table_name="users", postgresql_concurrently=True
+        )
+        mock_op.create_index.assert_called_once()
+
+    def test_offline_mode(self, mock_op: MagicMock) -> None:
+        """Test no catalog query is made when generating SQL scripts."""
+        mock_op.get_context.return_value.as_sql = True
+
+        create_index_concurrently("ix_users_full_name", "users", ["full_name"])
+
+        mock_op.get_bind.assert_not_called()
+        mock_op.create_index.assert_called_once()
+
+
+def test_drop_index_concurrently(mock_op: MagicMock) -> None:
+    """Test the index is dropped concurrently outside a transaction."""
+    drop_index_concurrently("ix_users_id", "users")
+
+    mock_op.get_context.return_value.autocommit_block.assert_called_once()
+    mock_op.drop_index.assert_called_once_with(
+        "ix_users_id",
+        table_name="users",
+        postgresql_concurrently=True,
+        if_exists=True,
+    )
@@ -8,6 +8,7 @@ in the UserRepository class.
 import pytest
 from unittest.mock import AsyncMock
 from uuid import UUID
+from sqlalchemy.dialects import postgresql
 from sqlalchemy.exc import IntegrityError
 
 from app.models.user import User
@@ -58,6 +59,53 @@ class TestUserRepository:
 
         mock_db_session.add.assert_called_once_with(test_user)
 
+    @pytest.mark.asyncio
+    async def test_create_if_absent(
+        self,
+        user_repository: SQLAlchemyUserRepository,
+        test_user: User,
+        mock_db_session: AsyncMock,
+    ) -> None:
+        """Test creating a user with a single INSERT ... ON CONFLICT statement."""
+        # Setup mock
+        mock_result = AsyncMock()
+        mock_result.one_or_none.return_value = test_user
+        mock_db_session.execute.return_value = mock_result
+
+        # Create user
+        created_user = await user_repository.create_if_absent(test_user)
+
+        # Verify behavior
+        mock_db_session.execute.assert_called_once()
+        sql = str(mock_db_session.execute.call_args.args[0])
+        assert "ON CONFLICT (lower(email)) DO NOTHING" in sql
+        assert "RETURNING" in sql
+        assert "hashed_password" not in sql.split("RETURNING")[1]
+        mock_db_session.add.assert_not_called()
+        mock_db_session.refresh.assert_not_called()
+        mock_db_session.commit.assert_awaited_once()
+        assert created_user == test_user
+
+    @pytest.mark.asyncio
+    async def test_create_if_absent_email_taken(
+        self,
+        user_repository: SQLAlchemyUserRepository,
+        test_user: User,
+        mock_db_session: AsyncMock,
+    ) -> None:
+        """Test that a conflicting email returns None instead of a user."""
+        # Setup mock
+        mock_result = AsyncMock()
+        mock_result.one_or_none.return_value = None
+        mock_db_session.execute.return_value = mock_result
+
+        # Attempt to create user
+        created_user = await user_repository.create_if_absent(test_user)
+
+        # Verify behavior
+        mock_db_session.execute.assert_called_once()
+        assert created_user is None
+
     @pytest.mark.asyncio
     async def test_get_user_by_id(
         self,
@@ -98,6 +146,28 @@ class TestUserRepository:
         mock_db_session.execute.assert_called_once()
         assert user is None
 
+    @pytest.mark.asyncio
+    async def test_get_profile_by_id(
+        self,
+        user_repository: SQLAlchemyUserRepository,
+        test_user: User,
+        mock_db_session: AsyncMock,
+    ) -> None:
+        """Test retrieving a profile selects only profile columns."""
+        # Setup mock
+        mock_result = AsyncMock()
+        mock_result.one_or_none.return_value = test_user
+        mock_db_session.execute.return_value = mock_result
+
+        # Get profile
+        profile = await user_repository.get_profile_by_id(test_user.id)
+
+        # Verify behavior
+        sql = str(mock_db_session.execute.call_args.args[0])
+        assert "users.full_name" in sql
+        assert "hashed_password" not in sql
+        assert profile == test_user
+
     @pytest.mark.asyncio
     async def test_get_user_by_email(
         self,
@@ -118,6 +188,27 @@ class TestUserRepository:
         mock_db_session.execute.assert_called_once()
         assert retrieved_user == test_user
 
+    @pytest.mark.asyncio
+    async def test_get_user_by_email_ignores_case(
+        self,
+        user_repository: SQLAlchemyUserRepository,
+        test_user: User,
+        mock_db_session: AsyncMock,
+    ) -> None:
+        """Test email lookups compare lower(email) with the normalized email."""
+        # Setup mock
+        mock_result = AsyncMock()
+        mock_result.scalar_one_or_none.return_value = test_user
+        mock_db_session.execute.return_value = mock_result
+
+        # Get user by mixed-case email
+        await user_repository.get_by_email(" Test@Example.COM")
+
+        # Verify behavior
+        stmt = mock_db_session.execute.call_args.args[0]
+        assert "lower(users.email) = :lower_1" in str(stmt)
+        assert stmt.compile().params["lower_1"] == "test@example.com"
+
     @pytest.mark.asyncio
     async def test_get_user_by_email_not_found(
         self,
@@ -157,6 +248,60 @@ class TestUserRepository:
         await mock_db_session.refresh(test_user)
         assert updated_user == test_user
 
+    @pytest.mark.asyncio
+    async def test_update_by_id(
+        self,
+        user_repository: SQLAlchemyUserRepository,
+        test_user: User,
+        mock_db_session: AsyncMock,
+    ) -> None:
+        """Test updating changed columns with a single UPDATE ... RETURNING."""
+        # Setup mock
+        mock_result = AsyncMock()
+        mock_result.one_or_none.return_value = test_user
+        mock_db_session.execute.return_value = mock_result
+
+        # Update user
+        updated_user = await user_repository.update_by_id(
+            test_user.id, {"full_name": "New Name"}
+        )
+
+        # Verify behavior
+        mock_db_session.execute.assert_called_once()
+        sql = str(mock_db_session.execute.call_args.args[0])
+        assert "full_name=" in sql
+        assert "email=" not in sql
+        assert "RETURNING" in sql
+        assert "hashed_password" not in sql
+        mock_db_session.add.assert_not_called()
+        mock_db_session.refresh.assert_not_called()
+        mock_db_session.commit.assert_awaited_once()
+        assert updated_user == test_user
+
+    @pytest.mark.asyncio
+    async def test_update_by_id_unique_violation(
+        self,
+        user_repository: SQLAlchemyUserRepository,
+        test_user: User,
+        mock_db_session: AsyncMock,
+    ) -> None:
+        """Test a unique violation rolls back and propagates."""
+        # Setup mock to raise IntegrityError
+        mock_db_session.execute.side_effect = IntegrityError(
+            statement="",
+            params={},
+            orig=Exception("Duplicate key value violates unique constraint"),
+        )
+
+        # Verify it raises an integrity error
+        with pytest.raises(IntegrityError):
+            await user_repository.update_by_id(
+                test_user.id, {"email": "taken@example.com"}
+            )
+
+        mock_db_session.rollback.assert_awaited_once()
+        mock_db_session.commit.assert_not_awaited()
+
     @pytest.mark.asyncio
     async def test_delete_user(
         self,
@@ -238,3 +383,154 @@ class TestUserRepository:
         # Verify behavior
         mock_db_session.scalars.assert_called_once()
         assert len(users) == 0
+
+    @pytest.mark.asyncio
+    async def test_list_page(
+        self,
+        user_repository: SQLAlchemyUserRepository,
+        test_user: User,
+        mock_db_session: AsyncMock,
+    ) -> None:
+        """Test listing a page seeks past the previous page's last row."""
+        # Setup mock
+        mock_result = AsyncMock()
+        mock_result.all.return_value = []
+        mock_db_session.execute.return_value = mock_result
+
+        # List page after the test user
+        rows = await user_repository.list_page(10, (test_user.created_at, test_user.id))
+
+        # Verify behavior
+        sql = str(mock_db_session.execute.call_args.args[0])
+        assert "(users.created_at, users.id) >" in sql
+        assert "ORDER BY users.created_at, users.id" in sql
+        assert "hashed_password" not in sql
+        assert rows == []
+
+    @pytest.mark.asyncio
+    async def test_get_many_by_ids(
+        self,
+        user_repository: SQLAlchemyUserRepository,
+        test_user: User,
+        mock_db_session: AsyncMock,
+    ) -> None:
+        """Test IDs are resolved with one array-bound query."""
+        # Setup mock
+        mock_result = AsyncMock()
+        mock_result.all.return_value = [test_user]
+        mock_db_session.execute.return_value = mock_result
+
+        # Look up users
+        rows = await user_repository.get_many_by_ids([test_user.id, test_user.id])
+
+        # Verify behavior
+        stmt = mock_db_session.execute.call_args.args[0]
+        assert "users.id = ANY (:user_ids)" in str(stmt)
+        assert "hashed_password" not in str(stmt)
+        assert stmt.compile().params["user_ids"] == [test_user.id, test_user.id]
+        assert rows == [test_user]
+
+    @pytest.mark.asyncio
+    async def test_get_many_by_emails(
+        self,
+        user_repository: SQLAlchemyUserRepository,
+        mock_db_session: AsyncMock,
+    ) -> None:
+        """Test emails are resolved with one array-bound query."""
+        # Setup mock
+        mock_result = AsyncMock()
+        mock_result.all.return_value = []
+        mock_db_session.execute.return_value = mock_result
+
+        # Look up users
+        rows = await user_repository.get_many_by_emails(["A@Example.com"])
+
+        # Verify behavior
+        mock_db_session.execute.assert_awaited_once()
+        stmt = mock_db_session.execute.call_args.args[0]
+        assert "lower(users.email) = ANY (:emails)" in str(stmt)
+        assert stmt.compile().params["emails"] == ["a@example.com"]
+        assert rows == []
+
+    @pytest.mark.asyncio
+    async def test_search(
+        self,
+        user_repository: SQLAlchemyUserRepository,
+        test_user: User,
+        mock_db_session: AsyncMock,
+    ) -> None:
+        """Test search matches substrings of either column, ranked and limited."""
+        # Setup mock
+        mock_result = AsyncMock()
+        mock_result.all.return_value = [test_user]
+        mock_db_session.execute.return_value = mock_result
+
+        # Search with LIKE wildcards in the query
+        rows = await user_repository.search("50%_off", 10)
+
+        # Verify behavior
+        stmt = mock_db_session.execute.call_args.args[0]
+        sql = str(stmt.compile(dialect=postgresql.dialect()))
+        assert "users.full_name ILIKE" in sql
+        assert "users.email ILIKE" in sql
+        assert "word_similarity" in sql
+        assert "LIMIT" in sql
+        assert "hashed_password" not in sql
+        assert "50/%/_off" in stmt.compile().params.values()
+        assert "ESCAPE '/'" in sql
+        assert rows == [test_user]
+
+    @pytest.mark.asyncio
+    async def test_count(
+        self,
+        user_repository: SQLAlchemyUserRepository,
+        mock_db_session: AsyncMock,
+    ) -> None:
+        """Test the exact count sums the trigger-maintained counter slots."""
+        # Setup mock
+        mock_db_session.scalar.return_value = 42
+
+        # Count users
+        count = await user_repository.count()
+
+        # Verify behavior
+        mock_db_session.scalar.assert_awaited_once()
+        sql = str(mock_db_session.scalar.call_args.args[0])
+        assert "sum(row_counts.row_count)" in sql
+        assert "FROM row_counts" in sql
+        assert count == 42
+
+    @pytest.mark.asyncio
+    async def test_count_without_counter(
+        self,
+        user_repository: SQLAlchemyUserRepository,
+        mock_db_session: AsyncMock,
+    ) -> None:
+        """Test the exact count falls back to COUNT(*) without a counter row."""
+        # Setup mock: no counter row, then the COUNT(*) result
+        mock_db_session.scalar.side_effect = [None, 7]
+
+        # Count users
+        count = await user_repository.count()
+
+        # Verify behavior
+        sql = str(mock_db_session.scalar.call_args.args[0])
+        assert "count(*)" in sql
+        assert count == 7
+
+    @pytest.mark.asyncio
+    async def test_count_estimate(
+        self,
+        user_repository: SQLAlchemyUserRepository,
+        mock_db_session: AsyncMock,
+    ) -> None:
+        """Test the estimate comes from pg_class statistics."""
+        # Setup mock
+        mock_db_session.scalar.return_value = None
+
+        # Estimate count
+        estimate = await user_repository.count_estimate()
+
+        # Verify behavior
+        assert "reltuples" in str(mock_db_session.scalar.call_args.args[0])
+        assert estimate is None
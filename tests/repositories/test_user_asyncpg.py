@@ -0,0 +1,231 @@
+"""
+Parity tests for the asyncpg user repository.
+
+``SQLAlchemyUserRepository`` is the reference implementation: every read
+served by ``AsyncpgUserRepository`` must return the same user it does.
+These tests run against the test database inside a transaction that is
+rolled back, and are skipped when the database is not reachable.
+"""
+
+from typing import AsyncGenerator
+from uuid import UUID
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import insert, text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.core.config import Settings, get_settings
+from app.core.deadline import DeadlineExceededError
+from app.models.user import User
+from app.repositories.user import (
+    SELECT_USER_BY_ID,
+    AsyncpgUserRepository,
+    SQLAlchemyUserRepository,
+    UserRecord,
+    get_user_repository,
+)
+from app.schemas.user import UserResponse
+
+ACCOUNT_FIELDS = (
+    "id",
+    "email",
+    "hashed_password",
+    "full_name",
+    "created_at",
+    "updated_at",
+)
+
+SEEDED_EMAILS = ("parity-ada@example.com", "parity-grace@example.com")
+
+
+@pytest_asyncio.fixture
+async def db_session(test_settings: Settings) -> AsyncGenerator[AsyncSession, None]:
+    """Session on a rolled-back transaction, seeded with a few users."""
+    # Unpooled, so no connection outlives the test's event loop
+    engine = create_async_engine(
+        str(test_settings.SQLALCHEMY_DATABASE_URI), poolclass=NullPool
+    )
+    try:
+        connection = await engine.connect()
+    except OSError:
+        pytest.skip("Test database is not reachable")
+    transaction = await connection.begin()
+    session = AsyncSession(bind=connection, expire_on_commit=False)
+    try:
+        await session.execute(
+            insert(User),
+            [
+                {
+                    "email": email,
+                    "hashed_password": f"hash-of-{email}",
+                    "full_name": email.split("@")[0].title(),
+                }
+                for email in SEEDED_EMAILS
+            ],
+        )
+        yield session
+    finally:
+        await session.close()
+        await transaction.rollback()
+        await connection.close()
+        await engine.dispose()
+
+
+@pytest.fixture
+def reference(db_session: AsyncSession) -> SQLAlchemyUserRepository:
+    """Reference repository."""
+    return SQLAlchemyUserRepository(db_session)
+
+
+@pytest.fixture
+def fast(db_session: AsyncSession) -> AsyncpgUserRepository:
+    """asyncpg repository on the same session."""
+    return AsyncpgUserRepository(db_session)
+
+
+async def seeded_ids(session: AsyncSession) -> list[UUID]:
+    """IDs of the seeded users."""
+    result = await session.execute(
+        text("SELECT id FROM users WHERE email LIKE 'parity-%' ORDER BY email")
+    )
+    return list(result.scalars())
+
+
+def assert_same_user(expected: User | None, actual: UserRecord | None) -> None:
+    """Assert both implementations returned the same user (or none)."""
+    if expected is None:
+        assert actual is None
+        return
+    assert isinstance(actual, UserRecord)
+    for field in ACCOUNT_FIELDS:
+        assert getattr(actual, field) == getattr(expected, field), field
+    assert UserResponse.model_validate(actual) == UserResponse.model_validate(expected)
+
+
+class TestAsyncpgUserRepositoryParity:
+    """AsyncpgUserRepository reads match SQLAlchemyUserRepository reads."""
+
+    @pytest.mark.asyncio
+    async def test_get_by_id(
+        self,
+        db_session: AsyncSession,
+        reference: SQLAlchemyUserRepository,
+        fast: AsyncpgUserRepository,
+    ) -> None:
+        """Test lookups by ID return the same users."""
+        for user_id in await seeded_ids(db_session):
+            assert_same_user(
+                await reference.get_by_id(user_id), await fast.get_by_id(user_id)
+            )
+
+    @pytest.mark.asyncio
+    async def test_get_by_id_not_found(
+        self, reference: SQLAlchemyUserRepository, fast: AsyncpgUserRepository
+    ) -> None:
+        """Test both implementations return None for an unknown ID."""
+        user_id = UUID("00000000-0000-7000-8000-000000000000")
+
+        assert await reference.get_by_id(user_id) is None
+        assert await fast.get_by_id(user_id) is None
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "email",
+        [
+            "parity-ada@example.com",
+            "Parity-Grace@Example.com",
+            " parity-ada@example.com ",
+            "parity-nobody@example.com",
+        ],
+    )
+    async def test_get_by_email(
+        self,
+        email: str,
+        reference: SQLAlchemyUserRepository,
+        fast: AsyncpgUserRepository,
+    ) -> None:
+        """Test lookups by email, including case variants, agree."""
+        assert_same_user(
+            await reference.get_by_email(email), await fast.get_by_email(email)
+        )
+
+    @pytest.mark.asyncio
+    async def test_sees_session_writes(
+        self,
+        db_session: AsyncSession,
+        reference: SQLAlchemyUserRepository,
+        fast: AsyncpgUserRepository,
+    ) -> None:
+        """Test uncommitted writes of the session are visible to both."""
+        await db_session.execute(
+            text("UPDATE users SET full_name = 'Renamed' WHERE email = :email"),
+            {"email": SEEDED_EMAILS[0]},
+        )
+
+        expected = await reference.get_by_email(SEEDED_EMAILS[0])
+        actual = await fast.get_by_email(SEEDED_EMAILS[0])
+
+        assert actual is not None and actual.full_name == "Renamed"
+        assert_same_user(expected, actual)
+
+
+class TestAsyncpgUserRepository:
+    """Test cases specific to the asyncpg read path."""
+
+    @pytest.mark.asyncio
+    async def test_reuses_prepared_statement(
+        self, db_session: AsyncSession, fast: AsyncpgUserRepository
+    ) -> None:
+        """Test repeated lookups reuse one prepared statement."""
+        for user_id in await seeded_ids(db_session) * 2:
+            await fast.get_by_id(user_id)
+
+        prepared = await db_session.scalar(
+            text("SELECT count(*) FROM pg_prepared_statements WHERE statement = :sql"),
+            {"sql": SELECT_USER_BY_ID},
+        )
+        assert prepared == 1
+
+    @pytest.mark.asyncio
+    async def test_unknown_attribute(
+        self, db_session: AsyncSession, fast: AsyncpgUserRepository
+    ) -> None:
+        """Test records raise AttributeError for columns they do not have."""
+        record = await fast.get_by_email(SEEDED_EMAILS[0])
+
+        assert record is not None
+        assert getattr(record, "is_admin", None) is None
+        with pytest.raises(AttributeError):
+            record.is_admin
+
+    @pytest.mark.asyncio
+    async def test_deadline_exceeded(
+        self, db_session: AsyncSession, fast: AsyncpgUserRepository
+    ) -> None:
+        """Test reads fail fast once the request deadline has passed."""
+        db_session.info["deadline"] = 0.0
+
+        with pytest.raises(DeadlineExceededError):
+            await fast.get_by_email(SEEDED_EMAILS[0])
+
+
+class TestGetUserRepository:
+    """Test cases for repository selection."""
+
+    @pytest.mark.parametrize(
+        "fast_reads, expected",
+        [(False, SQLAlchemyUserRepository), (True, AsyncpgUserRepository)],
+    )
+    def test_selects_implementation(
+        self,
+        monkeypatch: pytest.MonkeyPatch,
+        fast_reads: bool,
+        expected: type,
+    ) -> None:
+        """Test ASYNCPG_FAST_READS selects the repository class."""
+        monkeypatch.setattr(get_settings(), "ASYNCPG_FAST_READS", fast_reads)
+        session = AsyncSession()
+
+        assert type(get_user_repository(session)) is expected
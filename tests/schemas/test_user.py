@@ -7,7 +7,14 @@ from datetime import datetime, timezone
 from pydantic import ValidationError
 from uuid import UUID
 
-from app.schemas.user import UserBase, UserCreate, UserUpdate, UserResponse
+from app.schemas.user import (
+    MAX_LOOKUP_KEYS,
+    UserBase,
+    UserCreate,
+    UserLookupRequest,
+    UserUpdate,
+    UserResponse,
+)
 
 
 def test_user_base_valid() -> None:
@@ -192,3 +199,25 @@ def test_user_response_invalid_timestamps() -> None:
     assert len(errors) == 2
     error_locs = {error["loc"][0] for error in errors}
     assert error_locs == {"created_at", "updated_at"}
+
+
+@pytest.mark.parametrize(
+    "ids,emails",
+    [
+        ([], []),  # No keys
+        ([UUID(int=i) for i in range(MAX_LOOKUP_KEYS)], ["a@example.com"]),
+    ],
+)
+def test_user_lookup_request_key_count(ids: list[UUID], emails: list[str]) -> None:
+    """Test UserLookupRequest requires between one and MAX_LOOKUP_KEYS keys."""
+    with pytest.raises(ValidationError):
+        UserLookupRequest(ids=ids, emails=emails)
+
+
+def test_user_lookup_request_valid() -> None:
+    """Test UserLookupRequest accepts a mix of IDs and emails."""
+    lookup = UserLookupRequest(
+        ids=["123e4567-e89b-12d3-a456-426614174000"], emails=["a@example.com"]
+    )
+    assert lookup.ids == [UUID("123e4567-e89b-12d3-a456-426614174000")]
+    assert lookup.emails == ["a@example.com"]
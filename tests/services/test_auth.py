@@ -112,6 +112,26 @@ class TestAuthService:
         )
         assert token == "mock_token"
 
+    @pytest.mark.asyncio
+    async def test_authenticate_user_mixed_case_email(
+        self,
+        mock_db: AsyncMock,
+        mock_user: User,
+        mocker: MockFixture,
+    ) -> None:
+        """Test the login email is normalized before the lookup."""
+        # Mock dependencies
+        mock_db.get_by_email.return_value = mock_user
+        mocker.patch("app.services.auth.verify_password", return_value=True)
+        mocker.patch("app.services.auth.create_access_token", return_value="token")
+
+        # Authenticate with a mixed-case email
+        service = AuthService(mock_db)
+        await service.authenticate_user(email="Test@Example.com", password="pw")
+
+        # Verify behavior
+        mock_db.get_by_email.assert_called_once_with("test@example.com")
+
     @pytest.mark.asyncio
     async def test_authenticate_user_not_found(
         self,
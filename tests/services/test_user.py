@@ -2,17 +2,24 @@
 Tests for user service.
 """
 
+import json
 import pytest
 from datetime import datetime
 from unittest.mock import AsyncMock, MagicMock
-from typing import Any
+from typing import Any, AsyncIterator, Sequence
 from uuid import UUID
 from pytest_mock import MockFixture
+from sqlalchemy.exc import IntegrityError
 
 from app.core.config import get_settings
 from app.models.user import User
-from app.schemas.user import UserCreate, UserUpdate
-from app.services.user import UserService
+from app.schemas.user import (
+    UserFileFormat,
+    UserCreate,
+    UserLookupRequest,
+    UserUpdate,
+)
+from app.services.user import UserService, decode_cursor, encode_cursor
 from app.repositories.user import UserRepository
 from app.services.exceptions import (
     EmailAlreadyExistsError,
@@ -48,9 +55,29 @@ class MockUserRepository(MagicMock):
         super().__init__(spec=UserRepository, *args, **kwargs)
         self.mock_user = mock_user
         self.get_by_id = AsyncMock()
+        self.get_profile_by_id = AsyncMock()
         self.get_by_email = AsyncMock()
+        self.get_many_by_ids = AsyncMock()
+        self.get_many_by_emails = AsyncMock()
         self.create = AsyncMock()
+        self.create_if_absent = AsyncMock()
         self.update = AsyncMock()
+        self.update_by_id = AsyncMock()
+        self.list_page = AsyncMock()
+        self.search = AsyncMock()
+        self.count = AsyncMock()
+        self.count_estimate = AsyncMock()
+        self.stream_profiles = MagicMock()
+
+
+def stream_batches(*batches: Sequence[Any]) -> AsyncIterator[Sequence[Any]]:
+    """Build an async iterator yielding the given row batches."""
+
+    async def iterate() -> AsyncIterator[Sequence[Any]]:
+        for batch in batches:
+            yield batch
+
+    return iterate()
 
 
 @pytest.fixture
@@ -71,8 +98,7 @@ class TestUserService:
     ) -> None:
         """Test successful user creation."""
         # Mock dependencies
-        mock_db.get_by_email.return_value = None
-        mock_db.create.return_value = mock_user
+        mock_db.create_if_absent.return_value = mock_user
         mock_hash = mocker.patch(
             "app.services.user.get_password_hash", return_value="hashed_password123"
         )
@@ -84,10 +110,13 @@ class TestUserService:
         )
         created_user = await service.create_user(user_data)
 
-        # Verify behavior
-        mock_db.get_by_email.assert_awaited_once_with("new@example.com")
+        # Verify behavior: a single insert, no separate existence check
         mock_hash.assert_called_once_with("password123")
-        mock_db.create.assert_awaited_once()
+        mock_db.create_if_absent.assert_awaited_once()
+        mock_db.get_by_email.assert_not_awaited()
+        inserted = mock_db.create_if_absent.await_args.args[0]
+        assert inserted.email == "new@example.com"
+        assert inserted.hashed_password == "hashed_password123"
         assert created_user.email == mock_user.email
         assert created_user.full_name == mock_user.full_name
 
@@ -95,11 +124,10 @@ class TestUserService:
     async def test_create_user_email_exists(
         self,
         mock_db: MockUserRepository,
-        mock_user: User,
     ) -> None:
         """Test user creation with existing email."""
-        # Mock email exists
-        mock_db.get_by_email.return_value = mock_user
+        # Mock the insert being skipped by the email conflict
+        mock_db.create_if_absent.return_value = None
 
         # Create service and attempt user creation
         service = UserService(mock_db)
@@ -110,9 +138,29 @@ class TestUserService:
             await service.create_user(user_data)
 
         # Verify behavior
-        mock_db.get_by_email.assert_awaited_once_with("test@example.com")
+        mock_db.create_if_absent.assert_awaited_once()
         mock_db.create.assert_not_awaited()
 
+    @pytest.mark.asyncio
+    async def test_create_user_normalizes_email(
+        self,
+        mock_db: MockUserRepository,
+        mock_user: User,
+        mocker: MockFixture,
+    ) -> None:
+        """Test the email is stored in normalized form."""
+        mock_db.create_if_absent.return_value = mock_user
+        mocker.patch("app.services.user.get_password_hash", return_value="hashed")
+
+        service = UserService(mock_db)
+        user_data = UserCreate(
+            email="New.User@Example.com", password="password123", full_name="New"
+        )
+        await service.create_user(user_data)
+
+        inserted = mock_db.create_if_absent.await_args.args[0]
+        assert inserted.email == "new.user@example.com"
+
     @pytest.mark.asyncio
     async def test_get_user_success(
         self,
@@ -121,14 +169,14 @@ class TestUserService:
     ) -> None:
         """Test successful user retrieval."""
         # Mock user exists
-        mock_db.get_by_id.return_value = mock_user
+        mock_db.get_profile_by_id.return_value = mock_user
 
         # Get user
         service = UserService(mock_db)
         user = await service.get_user(mock_user.id)
 
         # Verify behavior
-        mock_db.get_by_id.assert_awaited_once_with(mock_user.id)
+        mock_db.get_profile_by_id.assert_awaited_once_with(mock_user.id)
         assert user.id == mock_user.id
         assert user.email == mock_user.email
         assert user.full_name == mock_user.full_name
@@ -140,7 +188,7 @@ class TestUserService:
     ) -> None:
         """Test user retrieval when user doesn't exist."""
         # Mock user not found
-        mock_db.get_by_id.return_value = None
+        mock_db.get_profile_by_id.return_value = None
 
         # Attempt to get user
         service = UserService(mock_db)
@@ -149,7 +197,7 @@ class TestUserService:
             await service.get_user(user_id)
 
         # Verify behavior
-        mock_db.get_by_id.assert_awaited_once_with(user_id)
+        mock_db.get_profile_by_id.assert_awaited_once_with(user_id)
 
     @pytest.mark.asyncio
     async def test_update_user_success(
@@ -160,9 +208,7 @@ class TestUserService:
     ) -> None:
         """Test successful user update."""
         # Mock dependencies
-        mock_db.get_by_id.return_value = mock_user
-        mock_db.get_by_email.return_value = None
-        mock_db.update.return_value = mock_user
+        mock_db.update_by_id.return_value = mock_user
         mock_hash = mocker.patch(
             "app.services.user.get_password_hash", return_value="new_hashed_password"
         )
@@ -174,14 +220,40 @@ class TestUserService:
         )
         updated_user = await service.update_user(mock_user.id, update_data)
 
-        # Verify behavior
-        mock_db.get_by_id.assert_awaited_once_with(mock_user.id)
-        mock_db.get_by_email.assert_awaited_once_with("new@example.com")
+        # Verify behavior: one UPDATE with only the changed columns
         mock_hash.assert_called_once_with("newpassword123")
-        mock_db.update.assert_awaited_once()
+        mock_db.update_by_id.assert_awaited_once_with(
+            mock_user.id,
+            {
+                "email": "new@example.com",
+                "full_name": "Updated Name",
+                "hashed_password": "new_hashed_password",
+            },
+        )
+        mock_db.get_profile_by_id.assert_not_awaited()
+        mock_db.get_by_email.assert_not_awaited()
         assert updated_user.email == mock_user.email
         assert updated_user.full_name == mock_user.full_name
 
+    @pytest.mark.asyncio
+    async def test_update_user_partial(
+        self,
+        mock_db: MockUserRepository,
+        mock_user: User,
+    ) -> None:
+        """Test that unset fields are not written."""
+        # Mock dependencies
+        mock_db.update_by_id.return_value = mock_user
+
+        # Update user
+        service = UserService(mock_db)
+        await service.update_user(mock_user.id, UserUpdate(full_name="Updated Name"))
+
+        # Verify behavior
+        mock_db.update_by_id.assert_awaited_once_with(
+            mock_user.id, {"full_name": "Updated Name"}
+        )
+
     @pytest.mark.asyncio
     async def test_update_user_email_exists(
         self,
@@ -189,15 +261,11 @@ class TestUserService:
         mock_user: User,
     ) -> None:
         """Test user update with existing email."""
-        # Mock dependencies
-        mock_db.get_by_id.return_value = mock_user
-        mock_db.get_by_email.return_value = User(
-            id=UUID("00000000-0000-0000-0000-000000000000"),
-            email="existing@example.com",
-            hashed_password="hashed_password123",
-            full_name="Existing User",
-            created_at=datetime.utcnow(),
-            updated_at=datetime.utcnow(),
+        # Mock the unique constraint rejecting the new email
+        mock_db.update_by_id.side_effect = IntegrityError(
+            statement="",
+            params={},
+            orig=Exception("Duplicate key value violates unique constraint"),
         )
 
         # Attempt update
@@ -207,6 +275,228 @@ class TestUserService:
             await service.update_user(mock_user.id, update_data)
 
         # Verify behavior
-        mock_db.get_by_id.assert_awaited_once_with(mock_user.id)
-        mock_db.get_by_email.assert_awaited_once_with("existing@example.com")
-        mock_db.update.assert_not_awaited()
+        mock_db.update_by_id.assert_awaited_once_with(
+            mock_user.id, {"email": "existing@example.com"}
+        )
+        mock_db.get_by_email.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_update_user_not_found(
+        self,
+        mock_db: MockUserRepository,
+    ) -> None:
+        """Test user update when user doesn't exist."""
+        # Mock no row updated
+        mock_db.update_by_id.return_value = None
+
+        # Attempt update
+        service = UserService(mock_db)
+        user_id = UUID("00000000-0000-0000-0000-000000000000")
+        with pytest.raises(UserNotFoundError) as _:
+            await service.update_user(user_id, UserUpdate(full_name="Nobody"))
+
+    @pytest.mark.asyncio
+    async def test_update_user_no_changes(
+        self,
+        mock_db: MockUserRepository,
+        mock_user: User,
+    ) -> None:
+        """Test an empty update returns the current user without writing."""
+        # Mock user exists
+        mock_db.get_profile_by_id.return_value = mock_user
+
+        # Update with no fields
+        service = UserService(mock_db)
+        user = await service.update_user(mock_user.id, UserUpdate())
+
+        # Verify behavior
+        mock_db.update_by_id.assert_not_awaited()
+        assert user.id == mock_user.id
+
+    @pytest.mark.asyncio
+    async def test_lookup_users(
+        self,
+        mock_db: MockUserRepository,
+        mock_user: User,
+    ) -> None:
+        """Test IDs and emails are resolved in one query per key kind."""
+        # Mock the user being found by both ID and email
+        mock_db.get_many_by_ids.return_value = [mock_user]
+        mock_db.get_many_by_emails.return_value = [mock_user]
+        missing_id = UUID("87654321-4321-8765-4321-876543218765")
+        lookup = UserLookupRequest(
+            ids=[mock_user.id, missing_id],
+            emails=[mock_user.email, "missing@example.com"],
+        )
+
+        # Look up users
+        service = UserService(mock_db)
+        result = await service.lookup_users(lookup)
+
+        # Verify behavior
+        mock_db.get_many_by_ids.assert_awaited_once_with([mock_user.id, missing_id])
+        mock_db.get_many_by_emails.assert_awaited_once_with(
+            [mock_user.email, "missing@example.com"]
+        )
+        assert [item.id for item in result.items] == [mock_user.id]
+        assert result.not_found == [str(missing_id), "missing@example.com"]
+
+    @pytest.mark.asyncio
+    async def test_lookup_users_ids_only(
+        self,
+        mock_db: MockUserRepository,
+        mock_user: User,
+    ) -> None:
+        """Test no email query is issued when only IDs are requested."""
+        mock_db.get_many_by_ids.return_value = [mock_user]
+
+        service = UserService(mock_db)
+        result = await service.lookup_users(UserLookupRequest(ids=[mock_user.id]))
+
+        mock_db.get_many_by_emails.assert_not_awaited()
+        assert len(result.items) == 1
+        assert result.not_found == []
+
+    @pytest.mark.asyncio
+    async def test_count_users_estimate(self, mock_db: MockUserRepository) -> None:
+        """Test the default count is the statistics-based estimate."""
+        mock_db.count_estimate.return_value = 1000
+
+        service = UserService(mock_db)
+        result = await service.count_users()
+
+        mock_db.count.assert_not_awaited()
+        assert result.count == 1000
+        assert result.exact is False
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("exact,estimate", [(True, 1000), (False, None)])
+    async def test_count_users_exact(
+        self, mock_db: MockUserRepository, exact: bool, estimate: int | None
+    ) -> None:
+        """Test the exact count is used on request or without statistics."""
+        mock_db.count_estimate.return_value = estimate
+        mock_db.count.return_value = 998
+
+        service = UserService(mock_db)
+        result = await service.count_users(exact=exact)
+
+        assert result.count == 998
+        assert result.exact is True
+
+    @pytest.mark.asyncio
+    async def test_search_users(
+        self,
+        mock_db: MockUserRepository,
+        mock_user: User,
+    ) -> None:
+        """Test search trims the query and converts matching rows."""
+        mock_db.search.return_value = [mock_user]
+
+        service = UserService(mock_db)
+        users = await service.search_users("  test ", 5)
+
+        mock_db.search.assert_awaited_once_with("test", 5)
+        assert [user.id for user in users] == [mock_user.id]
+
+    @pytest.mark.asyncio
+    async def test_list_users_first_page(
+        self,
+        mock_db: MockUserRepository,
+        mock_user: User,
+    ) -> None:
+        """Test a full page returns a cursor for the next page."""
+        # Mock one more row than requested
+        mock_db.list_page.return_value = [mock_user, mock_user, mock_user]
+
+        # List users
+        service = UserService(mock_db)
+        page = await service.list_users(limit=2)
+
+        # Verify behavior
+        mock_db.list_page.assert_awaited_once_with(3, None)
+        assert len(page.items) == 2
+        assert page.next_cursor is not None
+        assert decode_cursor(page.next_cursor) == (mock_user.created_at, mock_user.id)
+
+    @pytest.mark.asyncio
+    async def test_list_users_last_page(
+        self,
+        mock_db: MockUserRepository,
+        mock_user: User,
+    ) -> None:
+        """Test the last page continues after the cursor and has no next cursor."""
+        # Mock fewer rows than requested
+        mock_db.list_page.return_value = [mock_user]
+        cursor = encode_cursor(mock_user.created_at, mock_user.id)
+
+        # List users
+        service = UserService(mock_db)
+        page = await service.list_users(limit=2, cursor=cursor)
+
+        # Verify behavior
+        mock_db.list_page.assert_awaited_once_with(
+            3, (mock_user.created_at, mock_user.id)
+        )
+        assert len(page.items) == 1
+        assert page.next_cursor is None
+
+    @pytest.mark.asyncio
+    async def test_list_users_invalid_cursor(
+        self,
+        mock_db: MockUserRepository,
+    ) -> None:
+        """Test a malformed cursor is rejected before querying."""
+        service = UserService(mock_db)
+        with pytest.raises(ValueError, match="Invalid pagination cursor"):
+            await service.list_users(limit=2, cursor="not-a-cursor")
+
+        mock_db.list_page.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_export_users_ndjson(
+        self,
+        mock_db: MockUserRepository,
+        mock_user: User,
+    ) -> None:
+        """Test NDJSON export emits one JSON document per user per batch."""
+        # Mock two batches of profile rows
+        row = MagicMock()
+        row._asdict.return_value = {"id": mock_user.id, "email": mock_user.email}
+        mock_db.stream_profiles.return_value = stream_batches([row, row], [row])
+
+        # Export users
+        service = UserService(mock_db)
+        chunks = [
+            chunk async for chunk in service.export_users(UserFileFormat.NDJSON, 2)
+        ]
+
+        # Verify behavior
+        mock_db.stream_profiles.assert_called_once_with(2)
+        assert len(chunks) == 2
+        lines = b"".join(chunks).decode().splitlines()
+        assert len(lines) == 3
+        assert json.loads(lines[0]) == {
+            "id": str(mock_user.id),
+            "email": mock_user.email,
+        }
+
+    @pytest.mark.asyncio
+    async def test_export_users_csv(
+        self,
+        mock_db: MockUserRepository,
+        mock_user: User,
+    ) -> None:
+        """Test CSV export sends the header before any rows are fetched."""
+        # Mock a single batch of profile rows
+        mock_db.stream_profiles.return_value = stream_batches([mock_user])
+
+        # Export users
+        service = UserService(mock_db)
+        chunks = service.export_users(UserFileFormat.CSV)
+        header = await anext(chunks)
+        body = b"".join([chunk async for chunk in chunks]).decode()
+
+        # Verify behavior
+        assert header == b"id,email,full_name,created_at,updated_at\r\n"
+        assert body.startswith(f"{mock_user.id},{mock_user.email},")
@@ -0,0 +1,232 @@
+"""
+Tests for bulk user import service.
+"""
+
+import pytest
+from typing import AsyncIterator
+from unittest.mock import AsyncMock, MagicMock
+from pytest_mock import MockFixture
+
+from app.schemas.user import UserFileFormat
+from app.services.exceptions import ImportRecordTooLargeError
+from app.services.user_import import (
+    MAX_RECORD_BYTES,
+    UserImportService,
+    iter_lines,
+)
+
+
+def upload(*chunks: bytes) -> AsyncIterator[bytes]:
+    """Build an async iterator yielding the given upload chunks."""
+
+    async def iterate() -> AsyncIterator[bytes]:
+        for chunk in chunks:
+            yield chunk
+
+    return iterate()
+
+
+@pytest.fixture
+def mock_repo() -> MagicMock:
+    """Fixture for a repository that inserts every staged email."""
+    repo = MagicMock()
+    repo.copy_import = AsyncMock(
+        side_effect=lambda rows: {email for _, email, _, _ in rows}
+    )
+    return repo
+
+
+@pytest.fixture(autouse=True)
+def fast_hash(mocker: MockFixture) -> MagicMock:
+    """Replace bcrypt with a cheap deterministic hash."""
+    return mocker.patch(
+        "app.services.user_import.get_password_hash",
+        side_effect=lambda password: f"hashed-{password}",
+    )
+
+
+class TestIterLines:
+    """Test cases for splitting upload chunks into lines."""
+
+    @pytest.mark.asyncio
+    async def test_lines_spanning_chunks(self) -> None:
+        """Test lines split across chunk boundaries are reassembled."""
+        lines = [line async for line in iter_lines(upload(b"ab\r\nc", b"d\nef"))]
+
+        assert lines == [b"ab", b"cd", b"ef"]
+
+    @pytest.mark.asyncio
+    async def test_long_line_rejected(self) -> None:
+        """Test a line over the limit is refused with its line number."""
+        chunks = upload(b"ok\n", b"x" * 6, b"x" * 6 + b"\n")
+
+        with pytest.raises(ImportRecordTooLargeError, match="line 2"):
+            [line async for line in iter_lines(chunks, max_line_bytes=10)]
+
+    @pytest.mark.asyncio
+    async def test_unterminated_line_not_buffered(self) -> None:
+        """Test a body without newlines is refused before it is all read."""
+        read = 0
+
+        async def endless() -> AsyncIterator[bytes]:
+            nonlocal read
+            while True:
+                read += 1
+                yield b"x" * 4
+                assert read < 100
+
+        with pytest.raises(ImportRecordTooLargeError, match="line 1"):
+            [line async for line in iter_lines(endless(), max_line_bytes=10)]
+        assert read == 3
+
+
+class TestUserImportService:
+    """Test cases for UserImportService."""
+
+    @pytest.mark.asyncio
+    async def test_import_ndjson(self, mock_repo: MagicMock) -> None:
+        """Test NDJSON rows are hashed and loaded in batches."""
+        service = UserImportService(mock_repo)
+        chunks = upload(
+            b'{"email": "a@example.com", "full_name": "A", "password": "password1"}\n',
+            b'{"email": "b@example.com", "full_name": "B", "password": "password2"}\n'
+            b'{"email": "c@example.com", "full_name": "C", "password": "password3"}\n',
+        )
+
+        result = await service.import_users(chunks, UserFileFormat.NDJSON, batch_size=2)
+
+        assert result.received == 3
+        assert result.inserted == 3
+        assert result.errors == []
+        assert mock_repo.copy_import.await_count == 2
+        first_batch = mock_repo.copy_import.await_args_list[0].args[0]
+        assert first_batch[0] == (1, "a@example.com", "hashed-password1", "A")
+
+    @pytest.mark.asyncio
+    async def test_import_csv(self, mock_repo: MagicMock) -> None:
+        """Test CSV rows are mapped through the header."""
+        service = UserImportService(mock_repo)
+        chunks = upload(
+            b"password,email,full_name\n",
+            b'password1,a@example.com,"Doe, Jane"\n',
+        )
+
+        result = await service.import_users(chunks, UserFileFormat.CSV)
+
+        assert result.inserted == 1
+        rows = mock_repo.copy_import.await_args.args[0]
+        assert rows == [(2, "a@example.com", "hashed-password1", "Doe, Jane")]
+
+    @pytest.mark.asyncio
+    async def test_csv_multi_line_quoted_field(self, mock_repo: MagicMock) -> None:
+        """Test a quoted field spanning lines and chunks stays one row."""
+        service = UserImportService(mock_repo)
+        chunks = upload(
+            b"email,full_name,password\r\n",
+            b'a@example.com,"Jane\r\nDoe, ',
+            b'Jr.",password1\r\n\r\n',
+            b'b@example.com,"Said ""hi""",password2\r\n',
+        )
+
+        result = await service.import_users(chunks, UserFileFormat.CSV)
+
+        assert result.received == 2
+        assert result.invalid == 0
+        rows = mock_repo.copy_import.await_args.args[0]
+        assert rows == [
+            (2, "a@example.com", "hashed-password1", "Jane\nDoe, Jr."),
+            (5, "b@example.com", "hashed-password2", 'Said "hi"'),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_csv_unterminated_quote_rejected(self, mock_repo: MagicMock) -> None:
+        """Test a quoted field never closed is refused once over the limit."""
+        service = UserImportService(mock_repo)
+        line = b"a" * 1000 + b"\n"
+        chunks = upload(
+            b"email,full_name,password\n",
+            b'a@example.com,"never closed\n',
+            *[line] * (MAX_RECORD_BYTES // len(line) + 1),
+        )
+
+        with pytest.raises(ImportRecordTooLargeError, match="line 2"):
+            await service.import_users(chunks, UserFileFormat.CSV)
+
+    @pytest.mark.asyncio
+    async def test_csv_missing_columns(self, mock_repo: MagicMock) -> None:
+        """Test a CSV header without required columns is rejected."""
+        service = UserImportService(mock_repo)
+
+        with pytest.raises(ValueError, match="password"):
+            await service.import_users(upload(b"email,full_name\n"), UserFileFormat.CSV)
+
+        mock_repo.copy_import.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_invalid_rows_reported(self, mock_repo: MagicMock) -> None:
+        """Test unparseable and invalid rows are skipped and reported."""
+        service = UserImportService(mock_repo)
+        chunks = upload(
+            b"not json\n",
+            b'{"email": "bad", "full_name": "A", "password": "password1"}\n',
+            b'{"email": "b@example.com", "full_name": "B", "password": "password2"}\n',
+        )
+
+        result = await service.import_users(chunks, UserFileFormat.NDJSON)
+
+        assert result.received == 3
+        assert result.invalid == 2
+        assert result.inserted == 1
+        assert [error.line for error in result.errors] == [1, 2]
+        assert result.errors[1].email == "bad"
+        assert result.errors[1].reason.startswith("email:")
+
+    @pytest.mark.asyncio
+    async def test_conflicts_reported(self, mock_repo: MagicMock) -> None:
+        """Test existing and repeated emails are reported as conflicts."""
+        mock_repo.copy_import.side_effect = None
+        mock_repo.copy_import.return_value = {"a@example.com"}
+        service = UserImportService(mock_repo)
+        chunks = upload(
+            b'{"email": "a@example.com", "full_name": "A", "password": "password1"}\n'
+            b'{"email": "a@example.com", "full_name": "A", "password": "password2"}\n'
+            b'{"email": "b@example.com", "full_name": "B", "password": "password3"}\n'
+        )
+
+        result = await service.import_users(chunks, UserFileFormat.NDJSON)
+
+        assert result.inserted == 1
+        assert result.conflicts == 2
+        assert [(error.line, error.email) for error in result.errors] == [
+            (2, "a@example.com"),
+            (3, "b@example.com"),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_errors_truncated(
+        self, mock_repo: MagicMock, mocker: MockFixture
+    ) -> None:
+        """Test the error list is capped while counts stay exact."""
+        mocker.patch("app.services.user_import.MAX_REPORTED_ERRORS", 2)
+        service = UserImportService(mock_repo)
+
+        result = await service.import_users(upload(b"x\n" * 5), UserFileFormat.NDJSON)
+
+        assert result.invalid == 5
+        assert len(result.errors) == 2
+        assert result.errors_truncated is True
+
+    @pytest.mark.asyncio
+    async def test_errors_in_line_order(self, mock_repo: MagicMock) -> None:
+        """Test conflicts and invalid rows are reported in line order."""
+        mock_repo.copy_import.side_effect = None
+        mock_repo.copy_import.return_value = set()
+        service = UserImportService(mock_repo)
+        chunks = upload(
+            b'{"email": "a@example.com", "full_name": "A", "password": "password1"}\n'
+            b"not json\n"
+        )
+
+        result = await service.import_users(chunks, UserFileFormat.NDJSON)
+
+        assert [error.line for error in result.errors] == [1, 2]